@@ -0,0 +1,80 @@
+# Run the benchmark suite from the repository root with `python -m benchmarks`, see README.md#benchmarks.
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import datetime_helpers
+
+from .cases import CASES
+from .cases import Case
+
+DEFAULT_THRESHOLD = 0.10  # flag a case when its ops/sec drops by more than 10% against the baseline
+DEFAULT_REPEAT = 5
+
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    timer = timeit.Timer(stmt=case.run)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number))
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_sec": number * case.ops / seconds, "peak_bytes_per_op": peak / case.ops}
+
+
+def run(cases: List[Case], repeat: int) -> Dict[str, Any]:
+    results = {}
+    for case in cases:
+        results[case.name] = measure(case=case, repeat=repeat)
+        print(f"{case.name:<45} {results[case.name]['ops_per_sec']:>16,.0f} ops/s {results[case.name]['peak_bytes_per_op']:>12,.1f} peak B/op", flush=True)
+    return {"python": platform.python_version(), "version": datetime_helpers.__version__, "results": results}
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    for name, result in report["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["ops_per_sec"]
+        change = result["ops_per_sec"] / before - 1
+        flag = "REGRESSION" if change < -threshold else ""
+        print(f"{name:<45} {before:>16,.0f} -> {result['ops_per_sec']:>16,.0f} ops/s {change:>+8.1%} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark every function exported from datetime_helpers.")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timing repeats per case, the fastest is kept")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="relative ops/sec drop flagged as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(cases=[case for case in CASES if args.filter in case.name], repeat=args.repeat)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"\ncompared with {args.compare} (datetime-helpers {baseline['version']}, python {baseline['python']}), threshold {args.threshold:.0%}")
+        if compare(report=report, baseline=baseline, threshold=args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
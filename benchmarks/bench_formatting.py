@@ -0,0 +1,25 @@
+# Compare datetime_to_string/date_to_string against plain strftime for the default formats.
+# Run from the repository root with `python -m benchmarks.bench_formatting`.
+import datetime
+import timeit
+
+import datetime_helpers
+
+NUMBER = 200_000
+DT = datetime.datetime(2016, 4, 17, 3, 12, 34, 567891)
+
+CASES = [
+    ("datetime_to_string", lambda: datetime_helpers.datetime_to_string(dt=DT), lambda: DT.strftime(datetime_helpers.JSON_DATE_FORMAT)),
+    ("date_to_string", lambda: datetime_helpers.date_to_string(dt=DT), lambda: DT.strftime(datetime_helpers.DATE_FORMAT)),
+]
+
+
+def main() -> None:
+    for name, fast, baseline in CASES:
+        fast_seconds = min(timeit.repeat(fast, number=NUMBER, repeat=5))
+        baseline_seconds = min(timeit.repeat(baseline, number=NUMBER, repeat=5))
+        print(f"{name}: {NUMBER / fast_seconds:,.0f} ops/s vs strftime {NUMBER / baseline_seconds:,.0f} ops/s ({baseline_seconds / fast_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
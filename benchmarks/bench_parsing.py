@@ -0,0 +1,28 @@
+# Compare datetime_from_string/date_from_string against plain strptime for the default formats.
+# Run from the repository root with `python -m benchmarks.bench_parsing`.
+import datetime
+import timeit
+
+import datetime_helpers
+
+NUMBER = 200_000
+
+CASES = [
+    (
+        "datetime_from_string",
+        lambda: datetime_helpers.datetime_from_string(text="2016-04-17T03:12:34.567891Z"),
+        lambda: datetime.datetime.strptime("2016-04-17T03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+    ),
+    ("date_from_string", lambda: datetime_helpers.date_from_string(text="2016-04-17"), lambda: datetime.datetime.strptime("2016-04-17", datetime_helpers.DATE_FORMAT).date()),
+]
+
+
+def main() -> None:
+    for name, fast, baseline in CASES:
+        fast_seconds = min(timeit.repeat(fast, number=NUMBER, repeat=5))
+        baseline_seconds = min(timeit.repeat(baseline, number=NUMBER, repeat=5))
+        print(f"{name}: {NUMBER / fast_seconds:,.0f} ops/s vs strptime {NUMBER / baseline_seconds:,.0f} ops/s ({baseline_seconds / fast_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
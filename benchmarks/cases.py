@@ -0,0 +1,256 @@
+# Scalar and batch workloads for every function exported from datetime_helpers.
+# Each case covers one exported name, batch cases convert BATCH_SIZE values per run.
+import asyncio
+import atexit
+import datetime
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import List
+from typing import NamedTuple
+
+import datetime_helpers
+
+BATCH_SIZE = 10_000
+
+DT = datetime.datetime(2016, 4, 17, 3, 12, 34, 567891)
+DATE = datetime.date(2021, 2, 6)
+TEXT = "2016-04-17T03:12:34.567891Z"
+DATE_TEXT = "2016-04-17"
+
+DATES = [datetime.date(2000, 1, 1) + datetime.timedelta(days=i) for i in range(BATCH_SIZE)]
+DATETIMES = [datetime.datetime(2000, 1, 1) + datetime.timedelta(seconds=i * 3607) for i in range(BATCH_SIZE)]
+TEXTS = [datetime_helpers.datetime_to_string(dt=dt) for dt in DATETIMES]
+SECONDS = [datetime_helpers.datetime_to_seconds(dt=dt) for dt in DATETIMES]
+DATE_TEXTS = [datetime_helpers.date_to_string(dt=dt) for dt in DATES]
+CSV = "\n".join(f"{i},{text}" for i, text in enumerate(TEXTS)).encode()
+YEAR_START = datetime.date(2021, 1, 1)
+YEAR_END = datetime.date(2022, 1, 1)
+HOLIDAYS = [datetime.date(year, 12, 25) for year in range(1970, 2100)] + [datetime.date(year, 1, 1) for year in range(1970, 2100)]
+BUSINESS_CALENDAR = datetime_helpers.BusinessCalendar(holidays=HOLIDAYS)
+DATE_ARRAY = datetime_helpers.DateArray(DATES)
+DATETIME_ARRAY = datetime_helpers.DateTimeArray(DATETIMES)
+MIXED_VALUES = [value for i, text in enumerate(TEXTS) for value in (text, DATE_TEXTS[i], 946684800000 + i * 3_607_000)][:BATCH_SIZE]
+# a quarter of the rows are invalid, e.g. the 31st of a 30 day month
+DATE_ROWS = [(dt.year, dt.month, dt.day + (i % 4 == 0) * (31 - dt.day)) for i, dt in enumerate(DATES)]
+BUSINESS_HOURS = datetime_helpers.BusinessHours(windows=[(datetime.time(8), datetime.time(12)), (datetime.time(13), datetime.time(17, 30))], calendar=BUSINESS_CALENDAR)
+FOUR_HOURS = datetime.timedelta(hours=4)
+# saved on import so the load cases only time the loading
+CALENDAR_DIRECTORY = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, CALENDAR_DIRECTORY, ignore_errors=True)
+CALENDAR_FILE = os.path.join(CALENDAR_DIRECTORY, "calendar.bin")
+BUSINESS_CALENDAR.save(path=CALENDAR_FILE)
+COMPILED_FORMAT = datetime_helpers.compile_format(fmt=datetime_helpers.JSON_DATE_FORMAT)
+
+
+class Case(NamedTuple):
+    name: str
+    function: str  # the exported name this case covers
+    run: Callable[[], Any]
+    ops: int = 1  # operations performed by one run
+
+
+def _batch(name: str, function: Callable[..., Any], values: List[Any], keyword: str) -> Case:
+    def run() -> None:
+        for value in values:
+            function(**{keyword: value})
+
+    return Case(name=f"{name}[batch]", function=name, run=run, ops=len(values))
+
+
+def _with_cache(run: Callable[[], Any]) -> Callable[[], Any]:
+    def cached_run() -> None:
+        datetime_helpers.enable_cache()
+        try:
+            run()
+        finally:
+            datetime_helpers.disable_cache()
+
+    return cached_run
+
+
+def _instrumented(run: Callable[[], Any]) -> Callable[[], Any]:
+    # compare with the uninstrumented [batch] case of the same function for the cost per call
+    def instrumented_run() -> None:
+        datetime_helpers.instrumentation.enable()
+        try:
+            run()
+        finally:
+            datetime_helpers.instrumentation.disable()
+            datetime_helpers.instrumentation.reset()
+
+    return instrumented_run
+
+
+def _is_weekday_lookups() -> None:
+    # looked up on every call so the instrumented function is picked up
+    for dt in DATES:
+        datetime_helpers.is_weekday(dt=dt)
+
+
+def _string_lookups() -> None:
+    for text in TEXTS:
+        datetime_helpers.datetime_from_string(text=text)
+
+
+def _collect(iterator: Callable[[], AsyncIterator[Any]]) -> Callable[[], Any]:
+    async def collect() -> List[Any]:
+        return [value async for value in iterator()]
+
+    return lambda: asyncio.run(collect())
+
+
+def _offloaded_strings() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        asyncio.run(_collect_offloaded(executor=executor))
+
+
+async def _collect_offloaded(executor: ThreadPoolExecutor) -> List[datetime.datetime]:
+    return [dt async for dt in datetime_helpers.aiter_datetimes_from_strings(texts=TEXTS, executor=executor, offload_threshold=0)]
+
+
+def _month_lookups() -> None:
+    for dt in DATES:
+        datetime_helpers.get_nth_business_day_of_month(n=5, dt=dt)
+
+
+CASES = [
+    Case(name="create_date", function="create_date", run=lambda: datetime_helpers.create_date(year=2021, month=2, day=6)),
+    Case(name="create_datetime", function="create_datetime", run=lambda: datetime_helpers.create_datetime(year=2021, month=2, day=6, hour=3)),
+    Case(name="try_create_date", function="try_create_date", run=lambda: datetime_helpers.try_create_date(year=2021, month=2, day=6)),
+    Case(name="try_create_date[invalid]", function="try_create_date", run=lambda: datetime_helpers.try_create_date(year=2021, month=2, day=30)),
+    Case(name="try_create_datetime", function="try_create_datetime", run=lambda: datetime_helpers.try_create_datetime(year=2021, month=2, day=6, hour=3)),
+    Case(name="validate_dates", function="validate_dates", run=lambda: datetime_helpers.validate_dates(rows=DATE_ROWS), ops=BATCH_SIZE),
+    Case(name="get_day_of_week", function="get_day_of_week", run=lambda: datetime_helpers.get_day_of_week(dt=DATE)),
+    _batch(name="get_day_of_week", function=datetime_helpers.get_day_of_week, values=DATES, keyword="dt"),
+    Case(name="get_weekday", function="get_weekday", run=lambda: datetime_helpers.get_weekday(dt=DATE)),
+    Case(name="is_weekend", function="is_weekend", run=lambda: datetime_helpers.is_weekend(dt=DATE)),
+    _batch(name="is_weekend", function=datetime_helpers.is_weekend, values=DATES, keyword="dt"),
+    Case(name="is_weekday", function="is_weekday", run=lambda: datetime_helpers.is_weekday(dt=DATE)),
+    _batch(name="is_weekday", function=datetime_helpers.is_weekday, values=DATES, keyword="dt"),
+    Case(name="is_weekday[batch,instrumented]", function="is_weekday", run=_instrumented(run=_is_weekday_lookups), ops=BATCH_SIZE),
+    Case(name="get_previous_business_day", function="get_previous_business_day", run=lambda: datetime_helpers.get_previous_business_day(dt=DATE)),
+    Case(name="get_next_business_day", function="get_next_business_day", run=lambda: datetime_helpers.get_next_business_day(dt=DATE)),
+    _batch(name="get_next_business_day", function=datetime_helpers.get_next_business_day, values=DATES, keyword="dt"),
+    Case(name="get_next_business_day[calendar]", function="get_next_business_day", run=lambda: datetime_helpers.get_next_business_day(dt=DATE, calendar=BUSINESS_CALENDAR)),
+    Case(name="get_first_business_day_of_month", function="get_first_business_day_of_month", run=lambda: datetime_helpers.get_first_business_day_of_month(dt=DATE)),
+    Case(name="get_last_business_day_of_month", function="get_last_business_day_of_month", run=lambda: datetime_helpers.get_last_business_day_of_month(dt=DATE)),
+    Case(name="last_business_day_of_month", function="last_business_day_of_month", run=lambda: datetime_helpers.last_business_day_of_month(year=2021, month=2)),
+    Case(name="last_business_day_of_month[calendar]", function="last_business_day_of_month", run=lambda: datetime_helpers.last_business_day_of_month(year=2021, month=2, calendar=BUSINESS_CALENDAR)),
+    Case(name="month_start", function="month_start", run=lambda: datetime_helpers.month_start(dt=DATE)),
+    Case(name="month_end", function="month_end", run=lambda: datetime_helpers.month_end(dt=DATE)),
+    _batch(name="month_end", function=datetime_helpers.month_end, values=DATES, keyword="dt"),
+    Case(name="quarter_start", function="quarter_start", run=lambda: datetime_helpers.quarter_start(dt=DATE)),
+    Case(name="quarter_end", function="quarter_end", run=lambda: datetime_helpers.quarter_end(dt=DATE)),
+    Case(name="add_months", function="add_months", run=lambda: datetime_helpers.add_months(dt=DATE, n=13)),
+    Case(name="add_months[end_of_month]", function="add_months", run=lambda: datetime_helpers.add_months(dt=datetime.date(2021, 2, 28), n=1, end_of_month=True)),
+    Case(name="set_month_table_range", function="set_month_table_range", run=lambda: datetime_helpers.set_month_table_range(start_year=1900, end_year=2199)),
+    Case(name="get_nth_business_day_of_month", function="get_nth_business_day_of_month", run=lambda: datetime_helpers.get_nth_business_day_of_month(n=15, dt=DATE)),
+    Case(name="get_nth_business_day_of_month[batch]", function="get_nth_business_day_of_month", run=_month_lookups, ops=BATCH_SIZE),
+    Case(name="add_business_days", function="add_business_days", run=lambda: datetime_helpers.add_business_days(dt=DATE, n=23)),
+    Case(name="business_days_between", function="business_days_between", run=lambda: datetime_helpers.business_days_between(start=DATE, end=DATES[-1])),
+    Case(name="nth_business_day_of_month", function="nth_business_day_of_month", run=lambda: datetime_helpers.nth_business_day_of_month(year=2021, month=2, n=15)),
+    Case(name="iter_business_days[year]", function="iter_business_days", run=lambda: list(datetime_helpers.iter_business_days(start=YEAR_START, end=YEAR_END)), ops=261),
+    Case(
+        name="iter_business_days[year,calendar]",
+        function="iter_business_days",
+        run=lambda: list(datetime_helpers.iter_business_days(start=YEAR_START, end=YEAR_END, calendar=BUSINESS_CALENDAR)),
+        ops=260,
+    ),
+    Case(name="business_days_in_month", function="business_days_in_month", run=lambda: datetime_helpers.business_days_in_month(year=2021, month=2)),
+    Case(name="business_days_in_month[calendar]", function="business_days_in_month", run=lambda: datetime_helpers.business_days_in_month(year=2021, month=2, calendar=BUSINESS_CALENDAR)),
+    Case(name="month_business_day_table", function="month_business_day_table", run=lambda: datetime_helpers.month_business_day_table(year=2021)),
+    Case(name="BusinessCalendar", function="BusinessCalendar", run=lambda: datetime_helpers.BusinessCalendar(holidays=HOLIDAYS)),
+    Case(name="BusinessCalendar.is_business_day", function="BusinessCalendar", run=lambda: BUSINESS_CALENDAR.is_business_day(dt=DATE)),
+    Case(name="BusinessCalendar.load", function="BusinessCalendar", run=lambda: datetime_helpers.BusinessCalendar.load(path=CALENDAR_FILE)),
+    Case(name="BusinessCalendar.load_or_build", function="BusinessCalendar", run=lambda: datetime_helpers.BusinessCalendar.load_or_build(path=CALENDAR_FILE, holidays=HOLIDAYS)),
+    Case(name="BusinessHours", function="BusinessHours", run=lambda: datetime_helpers.BusinessHours()),
+    Case(name="BusinessHours.is_business_time", function="BusinessHours", run=lambda: BUSINESS_HOURS.is_business_time(dt=DT)),
+    Case(name="add_business_time", function="add_business_time", run=lambda: datetime_helpers.add_business_time(dt=DT, delta=FOUR_HOURS)),
+    Case(name="add_business_time[calendar]", function="add_business_time", run=lambda: datetime_helpers.add_business_time(dt=DT, delta=FOUR_HOURS, business_hours=BUSINESS_HOURS)),
+    Case(name="business_time_between", function="business_time_between", run=lambda: datetime_helpers.business_time_between(start=DT, end=DATETIMES[-1])),
+    Case(name="add_business_time_many", function="add_business_time_many", run=lambda: datetime_helpers.add_business_time_many(dts=DATETIMES, delta=FOUR_HOURS), ops=BATCH_SIZE),
+    Case(
+        name="business_time_between_many",
+        function="business_time_between_many",
+        run=lambda: datetime_helpers.business_time_between_many(starts=DATETIMES, ends=DATETIMES[1:] + DATETIMES[:1]),
+        ops=BATCH_SIZE,
+    ),
+    Case(name="DateArray", function="DateArray", run=lambda: datetime_helpers.DateArray(DATES), ops=BATCH_SIZE),
+    Case(name="DateArray.is_weekday", function="DateArray", run=DATE_ARRAY.is_weekday, ops=BATCH_SIZE),
+    Case(name="DateArray.next_business_day", function="DateArray", run=DATE_ARRAY.next_business_day, ops=BATCH_SIZE),
+    Case(name="DateArray.next_business_day[calendar]", function="DateArray", run=lambda: DATE_ARRAY.next_business_day(calendar=BUSINESS_CALENDAR), ops=BATCH_SIZE),
+    Case(name="DateArray.to_millis", function="DateArray", run=DATE_ARRAY.to_millis, ops=BATCH_SIZE),
+    Case(name="DateTimeArray", function="DateTimeArray", run=lambda: datetime_helpers.DateTimeArray(DATETIMES), ops=BATCH_SIZE),
+    Case(name="DateTimeArray.is_weekday", function="DateTimeArray", run=DATETIME_ARRAY.is_weekday, ops=BATCH_SIZE),
+    Case(name="DateTimeArray.to_millis", function="DateTimeArray", run=DATETIME_ARRAY.to_millis, ops=BATCH_SIZE),
+    Case(name="datetime_to_string", function="datetime_to_string", run=lambda: datetime_helpers.datetime_to_string(dt=DT)),
+    _batch(name="datetime_to_string", function=datetime_helpers.datetime_to_string, values=DATETIMES, keyword="dt"),
+    Case(name="date_to_string", function="date_to_string", run=lambda: datetime_helpers.date_to_string(dt=DT)),
+    Case(name="datetime_from_string", function="datetime_from_string", run=lambda: datetime_helpers.datetime_from_string(text=TEXT)),
+    _batch(name="datetime_from_string", function=datetime_helpers.datetime_from_string, values=TEXTS, keyword="text"),
+    Case(name="datetime_from_string[batch,instrumented]", function="datetime_from_string", run=_instrumented(run=_string_lookups), ops=BATCH_SIZE),
+    Case(name="datetime_from_string[custom]", function="datetime_from_string", run=lambda: datetime_helpers.datetime_from_string(text="17-04-2016", datetime_format="%d-%m-%Y")),
+    Case(name="parse_any", function="parse_any", run=lambda: datetime_helpers.parse_any(value=TEXT)),
+    Case(name="parse_any[millis]", function="parse_any", run=lambda: datetime_helpers.parse_any(value=1460862754567)),
+    Case(name="FormatDetector.parse_many[mixed]", function="FormatDetector", run=lambda: datetime_helpers.FormatDetector().parse_many(values=MIXED_VALUES), ops=BATCH_SIZE),
+    Case(name="date_from_string", function="date_from_string", run=lambda: datetime_helpers.date_from_string(text=DATE_TEXT)),
+    Case(name="compile_format", function="compile_format", run=lambda: datetime_helpers.compile_format(fmt=datetime_helpers.JSON_DATE_FORMAT)),
+    Case(name="CompiledFormat.format", function="CompiledFormat", run=lambda: COMPILED_FORMAT.format(dt=DT)),
+    Case(name="datetime_from_windows_filetime", function="datetime_from_windows_filetime", run=lambda: datetime_helpers.datetime_from_windows_filetime(windows_filetime=128930364000001000)),
+    Case(name="datetime_from_seconds", function="datetime_from_seconds", run=lambda: datetime_helpers.datetime_from_seconds(seconds=1460851200)),
+    Case(name="datetime_from_millis", function="datetime_from_millis", run=lambda: datetime_helpers.datetime_from_millis(millis=1460851200000)),
+    Case(name="datetime_from_date", function="datetime_from_date", run=lambda: datetime_helpers.datetime_from_date(dt=DATE)),
+    Case(name="datetime_to_seconds", function="datetime_to_seconds", run=lambda: datetime_helpers.datetime_to_seconds(dt=DT)),
+    Case(name="datetime_to_millis", function="datetime_to_millis", run=lambda: datetime_helpers.datetime_to_millis(dt=DT)),
+    _batch(name="datetime_to_millis", function=datetime_helpers.datetime_to_millis, values=DATETIMES, keyword="dt"),
+    Case(name="datetime_to_micros", function="datetime_to_micros", run=lambda: datetime_helpers.datetime_to_micros(dt=DT)),
+    _batch(name="datetime_to_micros", function=datetime_helpers.datetime_to_micros, values=DATETIMES, keyword="dt"),
+    Case(name="datetime_from_micros", function="datetime_from_micros", run=lambda: datetime_helpers.datetime_from_micros(micros=1460862754567891)),
+    Case(name="datetime_to_nanos", function="datetime_to_nanos", run=lambda: datetime_helpers.datetime_to_nanos(dt=DT)),
+    Case(name="datetime_from_nanos", function="datetime_from_nanos", run=lambda: datetime_helpers.datetime_from_nanos(nanos=1460862754567891000)),
+    Case(name="datetime_to_windows_filetime", function="datetime_to_windows_filetime", run=lambda: datetime_helpers.datetime_to_windows_filetime(dt=DT)),
+    Case(name="get_zone", function="get_zone", run=lambda: datetime_helpers.get_zone(zone="Europe/London")),
+    Case(name="to_epoch", function="to_epoch", run=lambda: datetime_helpers.to_epoch(dt=DT, default_zone="Europe/London")),
+    Case(name="from_epoch", function="from_epoch", run=lambda: datetime_helpers.from_epoch(seconds=1460851200, zone="Europe/London")),
+    Case(name="convert_zone", function="convert_zone", run=lambda: datetime_helpers.convert_zone(dt=DT, zone="Asia/Tokyo")),
+    Case(name="to_epoch_many", function="to_epoch_many", run=lambda: datetime_helpers.to_epoch_many(dts=DATETIMES, default_zone="Europe/London"), ops=BATCH_SIZE),
+    Case(name="from_epoch_many", function="from_epoch_many", run=lambda: datetime_helpers.from_epoch_many(seconds=SECONDS, zone="Europe/London"), ops=BATCH_SIZE),
+    Case(name="convert_zone_many", function="convert_zone_many", run=lambda: datetime_helpers.convert_zone_many(dts=DATETIMES, zone="Asia/Tokyo"), ops=BATCH_SIZE),
+    Case(name="enable_cache", function="enable_cache", run=_with_cache(run=_month_lookups), ops=BATCH_SIZE),
+    Case(name="disable_cache", function="disable_cache", run=datetime_helpers.disable_cache),
+    Case(name="cache_info", function="cache_info", run=datetime_helpers.cache_info),
+    Case(name="cache_clear", function="cache_clear", run=datetime_helpers.cache_clear),
+    Case(name="read_column", function="read_column", run=lambda: list(datetime_helpers.read_column(source=CSV, delimiter=",", column=1)), ops=BATCH_SIZE),
+    Case(name="iter_datetimes_from_strings", function="iter_datetimes_from_strings", run=lambda: list(datetime_helpers.iter_datetimes_from_strings(texts=TEXTS)), ops=BATCH_SIZE),
+    Case(name="iter_dates_from_strings", function="iter_dates_from_strings", run=lambda: list(datetime_helpers.iter_dates_from_strings(texts=DATE_TEXTS)), ops=BATCH_SIZE),
+    Case(name="iter_strings_from_datetimes", function="iter_strings_from_datetimes", run=lambda: list(datetime_helpers.iter_strings_from_datetimes(dts=DATETIMES)), ops=BATCH_SIZE),
+    Case(name="parse_many", function="parse_many", run=lambda: datetime_helpers.parse_many(texts=TEXTS * 10, max_workers=2), ops=BATCH_SIZE * 10),
+    Case(name="parse_many_async", function="parse_many_async", run=lambda: asyncio.run(datetime_helpers.parse_many_async(texts=TEXTS * 10, max_workers=2)), ops=BATCH_SIZE * 10),
+    Case(name="iter_millis_from_datetimes", function="iter_millis_from_datetimes", run=lambda: list(datetime_helpers.iter_millis_from_datetimes(dts=DATETIMES)), ops=BATCH_SIZE),
+    Case(name="aiter_datetimes_from_strings", function="aiter_datetimes_from_strings", run=_collect(lambda: datetime_helpers.aiter_datetimes_from_strings(texts=TEXTS)), ops=BATCH_SIZE),
+    Case(name="aiter_datetimes_from_strings[offload]", function="aiter_datetimes_from_strings", run=_offloaded_strings, ops=BATCH_SIZE),
+    Case(name="aiter_dates_from_strings", function="aiter_dates_from_strings", run=_collect(lambda: datetime_helpers.aiter_dates_from_strings(texts=DATE_TEXTS)), ops=BATCH_SIZE),
+    Case(name="aiter_strings_from_datetimes", function="aiter_strings_from_datetimes", run=_collect(lambda: datetime_helpers.aiter_strings_from_datetimes(dts=DATETIMES)), ops=BATCH_SIZE),
+    Case(name="aiter_millis_from_datetimes", function="aiter_millis_from_datetimes", run=_collect(lambda: datetime_helpers.aiter_millis_from_datetimes(dts=DATETIMES)), ops=BATCH_SIZE),
+]
+
+try:
+    import numpy as np
+
+    from datetime_helpers import vectorized
+except ImportError:  # pragma: no cover
+    pass
+else:
+    DATETIME64 = np.array(DATETIMES, dtype="datetime64[us]")
+    MILLIS = vectorized.datetimes_to_millis(dts=DATETIME64)
+    CASES += [
+        Case(name="vectorized.datetimes_to_seconds", function="vectorized.datetimes_to_seconds", run=lambda: vectorized.datetimes_to_seconds(dts=DATETIME64), ops=BATCH_SIZE),
+        Case(name="vectorized.datetimes_to_millis", function="vectorized.datetimes_to_millis", run=lambda: vectorized.datetimes_to_millis(dts=DATETIME64), ops=BATCH_SIZE),
+        Case(name="vectorized.datetimes_from_seconds", function="vectorized.datetimes_from_seconds", run=lambda: vectorized.datetimes_from_seconds(seconds=MILLIS // 1000), ops=BATCH_SIZE),
+        Case(name="vectorized.datetimes_from_millis", function="vectorized.datetimes_from_millis", run=lambda: vectorized.datetimes_from_millis(millis=MILLIS), ops=BATCH_SIZE),
+    ]
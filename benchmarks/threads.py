@@ -0,0 +1,105 @@
+# Throughput of shared hot paths from 1 to N threads, checking every result against the single threaded one.
+# Run from the repository root with `python -m benchmarks.threads`. With the GIL the total ops/sec stays about flat as
+# threads are added, on a free-threaded build (e.g. python3.13t) it should grow with the cores unless shared state
+# serialises the threads.
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import datetime_helpers
+from datetime_helpers.caching import LRUCache
+
+DEFAULT_NUMBER = 20_000
+
+DATE = datetime.date(2021, 2, 6)
+TEXT = "2016-04-17T03:12:34.567891Z"
+MIXED_VALUES: List[Union[str, int]] = ["2016-04-17T03:12:34.567891Z", "2016-04-17", 1460862754567]
+CACHE = LRUCache(maxsize=64)
+
+
+class ThreadCase(NamedTuple):
+    name: str
+    run: Callable[[int], Any]  # called with the iteration number, must return the same value from every thread
+
+
+def _cached_month(i: int) -> Any:
+    month = i % 48
+    return CACHE.get_or_compute(key=month, compute=lambda: datetime_helpers.nth_business_day_of_month(year=2021 + month // 12, month=month % 12 + 1, n=3))
+
+
+CASES = [
+    ThreadCase(name="is_weekday", run=lambda i: datetime_helpers.is_weekday(dt=DATE)),
+    ThreadCase(name="get_nth_business_day_of_month", run=lambda i: datetime_helpers.get_nth_business_day_of_month(n=3, dt=DATE)),
+    ThreadCase(name="datetime_from_string", run=lambda i: datetime_helpers.datetime_from_string(text=TEXT)),
+    ThreadCase(name="parse_any", run=lambda i: datetime_helpers.parse_any(value=MIXED_VALUES[i % 3])),
+    ThreadCase(name="LRUCache.get_or_compute", run=_cached_month),
+]
+
+
+def default_thread_counts() -> List[int]:
+    # powers of two up to the number of cores
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def measure(case: ThreadCase, threads: int, number: int) -> Tuple[float, int]:
+    # (ops/sec of all the threads together, number of results that differ from the single threaded ones)
+    expected = [case.run(i) for i in range(number)]
+    mismatches = [0] * threads
+    barrier = threading.Barrier(parties=threads + 1)
+
+    def work(thread: int) -> None:
+        run = case.run
+        barrier.wait()
+        for i in range(number):
+            if run(i) != expected[i]:
+                mismatches[thread] += 1
+
+    workers = [threading.Thread(target=work, args=(thread,)) for thread in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * number / (time.perf_counter() - start), sum(mismatches)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.threads", description="Measure how the throughput of shared hot paths scales with threads.")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--threads", default=",".join(map(str, default_thread_counts())), help="comma separated thread counts")
+    parser.add_argument("--number", type=int, default=DEFAULT_NUMBER, help="calls per thread")
+    args = parser.parse_args(argv)
+
+    thread_counts = [int(count) for count in args.threads.split(",")]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} cores, {args.number:,} calls per thread")
+    failed = False
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        single = None
+        for threads in thread_counts:
+            ops_per_sec, mismatches = measure(case=case, threads=threads, number=args.number)
+            single = single or ops_per_sec
+            print(f"{case.name:<35} {threads:>3} threads {ops_per_sec:>14,.0f} ops/s {ops_per_sec / single:>6.2f}x {mismatches:>6} mismatches", flush=True)
+            failed = failed or mismatches > 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
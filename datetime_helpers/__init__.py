@@ -1,34 +1,221 @@
 # isort: skip_file
-# pylint: disable=wrong-import-position
-try:
-    from importlib.metadata import version
-    from importlib.metadata import PackageNotFoundError
-except ImportError:
-    from importlib_metadata import version  # type: ignore[no-redef]
-    from importlib_metadata import PackageNotFoundError  # type: ignore[no-redef,misc]
-
-try:
-    __version__: str = version(__name__)
-except PackageNotFoundError:
-    __version__ = "unknown"
-
-from .utils import DayOfWeek
-from .utils import create_date
-from .utils import create_datetime
-from .utils import get_day_of_week
-from .utils import is_weekend
-from .utils import is_weekday
-from .utils import get_previous_business_day
-from .utils import get_next_business_day
-from .utils import get_first_business_day_of_month
-from .utils import get_nth_business_day_of_month
-from .utils import datetime_to_string
-from .utils import date_to_string
-from .utils import datetime_from_string
-from .utils import date_from_string
-from .utils import datetime_from_windows_filetime
-from .utils import datetime_from_seconds
-from .utils import datetime_from_millis
-from .utils import datetime_from_date
-from .utils import datetime_to_seconds
-from .utils import datetime_to_millis
+# Attributes are imported lazily on first access (PEP 562) so `import datetime_helpers` stays cheap for
+# short-lived processes, e.g. __version__ only reads the installed package metadata when it is asked for.
+import importlib
+
+# typing.TYPE_CHECKING without importing typing, which alone costs more than the rest of this module
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+    from typing import List
+
+    from .utils import JSON_DATE_FORMAT
+    from .utils import DATE_FORMAT
+    from .utils import DayOfWeek
+    from .utils import Weekday
+    from .utils import create_date
+    from .utils import create_datetime
+    from .utils import try_create_date
+    from .utils import try_create_datetime
+    from .utils import DateError
+    from .utils import DateValidation
+    from .utils import validate_dates
+    from .utils import get_day_of_week
+    from .utils import get_weekday
+    from .utils import is_weekend
+    from .utils import is_weekday
+    from .utils import get_previous_business_day
+    from .utils import get_next_business_day
+    from .utils import get_first_business_day_of_month
+    from .utils import get_last_business_day_of_month
+    from .utils import last_business_day_of_month
+    from .utils import month_start
+    from .utils import month_end
+    from .utils import quarter_start
+    from .utils import quarter_end
+    from .utils import add_months
+    from .utils import set_month_table_range
+    from .utils import get_nth_business_day_of_month
+    from .utils import add_business_days
+    from .utils import business_days_between
+    from .utils import nth_business_day_of_month
+    from .utils import iter_business_days
+    from .utils import business_days_in_month
+    from .utils import month_business_day_table
+    from .utils import datetime_to_string
+    from .utils import date_to_string
+    from .utils import datetime_from_string
+    from .utils import date_from_string
+    from .utils import datetime_from_windows_filetime
+    from .utils import datetime_from_seconds
+    from .utils import datetime_from_millis
+    from .utils import datetime_from_date
+    from .utils import datetime_to_seconds
+    from .utils import datetime_to_millis
+    from .utils import datetime_to_micros
+    from .utils import datetime_from_micros
+    from .utils import datetime_to_nanos
+    from .utils import datetime_from_nanos
+    from .utils import datetime_to_windows_filetime
+    from .business_calendar import BusinessCalendar
+    from .business_hours import BusinessHours
+    from .business_hours import add_business_time
+    from .business_hours import business_time_between
+    from .business_hours import add_business_time_many
+    from .business_hours import business_time_between_many
+    from .arrays import DateArray
+    from .arrays import DateTimeArray
+    from .caching import CacheInfo
+    from .caching import enable_cache
+    from .caching import disable_cache
+    from .caching import cache_info
+    from .caching import cache_clear
+    from .timezones import get_zone
+    from .timezones import to_epoch
+    from .timezones import from_epoch
+    from .timezones import convert_zone
+    from .timezones import to_epoch_many
+    from .timezones import from_epoch_many
+    from .timezones import convert_zone_many
+    from .formatting import CompiledFormat
+    from .formatting import compile_format
+    from .parsing import EPOCH_MILLIS
+    from .parsing import WINDOWS_FILETIME
+    from .parsing import FormatDetector
+    from .parsing import parse_any
+    from .bulk import MalformedRow
+    from .bulk import read_column
+    from .bulk import iter_datetimes_from_strings
+    from .bulk import iter_dates_from_strings
+    from .bulk import iter_strings_from_datetimes
+    from .bulk import iter_millis_from_datetimes
+    from .bulk import parse_many
+    from .bulk import parse_many_async
+    from .bulk import aiter_datetimes_from_strings
+    from .bulk import aiter_dates_from_strings
+    from .bulk import aiter_strings_from_datetimes
+    from .bulk import aiter_millis_from_datetimes
+
+_EXPORTS = {
+    "JSON_DATE_FORMAT": "utils",
+    "DATE_FORMAT": "utils",
+    "DayOfWeek": "utils",
+    "Weekday": "utils",
+    "create_date": "utils",
+    "create_datetime": "utils",
+    "try_create_date": "utils",
+    "try_create_datetime": "utils",
+    "DateError": "utils",
+    "DateValidation": "utils",
+    "validate_dates": "utils",
+    "get_day_of_week": "utils",
+    "get_weekday": "utils",
+    "is_weekend": "utils",
+    "is_weekday": "utils",
+    "get_previous_business_day": "utils",
+    "get_next_business_day": "utils",
+    "get_first_business_day_of_month": "utils",
+    "get_last_business_day_of_month": "utils",
+    "last_business_day_of_month": "utils",
+    "month_start": "utils",
+    "month_end": "utils",
+    "quarter_start": "utils",
+    "quarter_end": "utils",
+    "add_months": "utils",
+    "set_month_table_range": "utils",
+    "get_nth_business_day_of_month": "utils",
+    "add_business_days": "utils",
+    "business_days_between": "utils",
+    "nth_business_day_of_month": "utils",
+    "iter_business_days": "utils",
+    "business_days_in_month": "utils",
+    "month_business_day_table": "utils",
+    "datetime_to_string": "utils",
+    "date_to_string": "utils",
+    "datetime_from_string": "utils",
+    "date_from_string": "utils",
+    "datetime_from_windows_filetime": "utils",
+    "datetime_from_seconds": "utils",
+    "datetime_from_millis": "utils",
+    "datetime_from_date": "utils",
+    "datetime_to_seconds": "utils",
+    "datetime_to_millis": "utils",
+    "datetime_to_micros": "utils",
+    "datetime_from_micros": "utils",
+    "datetime_to_nanos": "utils",
+    "datetime_from_nanos": "utils",
+    "datetime_to_windows_filetime": "utils",
+    "BusinessCalendar": "business_calendar",
+    "BusinessHours": "business_hours",
+    "add_business_time": "business_hours",
+    "business_time_between": "business_hours",
+    "add_business_time_many": "business_hours",
+    "business_time_between_many": "business_hours",
+    "DateArray": "arrays",
+    "DateTimeArray": "arrays",
+    "CacheInfo": "caching",
+    "enable_cache": "caching",
+    "disable_cache": "caching",
+    "cache_info": "caching",
+    "cache_clear": "caching",
+    "get_zone": "timezones",
+    "to_epoch": "timezones",
+    "from_epoch": "timezones",
+    "convert_zone": "timezones",
+    "to_epoch_many": "timezones",
+    "from_epoch_many": "timezones",
+    "convert_zone_many": "timezones",
+    "CompiledFormat": "formatting",
+    "compile_format": "formatting",
+    "EPOCH_MILLIS": "parsing",
+    "WINDOWS_FILETIME": "parsing",
+    "FormatDetector": "parsing",
+    "parse_any": "parsing",
+    "MalformedRow": "bulk",
+    "read_column": "bulk",
+    "iter_datetimes_from_strings": "bulk",
+    "iter_dates_from_strings": "bulk",
+    "iter_strings_from_datetimes": "bulk",
+    "iter_millis_from_datetimes": "bulk",
+    "parse_many": "bulk",
+    "parse_many_async": "bulk",
+    "aiter_datetimes_from_strings": "bulk",
+    "aiter_dates_from_strings": "bulk",
+    "aiter_strings_from_datetimes": "bulk",
+    "aiter_millis_from_datetimes": "bulk",
+}
+_SUBMODULES = ("arrays", "business_calendar", "business_hours", "bulk", "caching", "exceptions", "formatting", "instrumentation", "parsing", "timezones", "utils", "vectorized")
+
+__all__ = list(_EXPORTS)
+
+
+def _get_version() -> str:
+    try:
+        from importlib.metadata import version  # pylint: disable=import-outside-toplevel
+        from importlib.metadata import PackageNotFoundError  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        from importlib_metadata import version  # type: ignore[no-redef] # pylint: disable=import-outside-toplevel
+        from importlib_metadata import PackageNotFoundError  # type: ignore[no-redef,misc] # pylint: disable=import-outside-toplevel
+
+    try:
+        return version(__name__)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def __getattr__(name: str) -> "Any":
+    if name == "__version__":
+        value: "Any" = _get_version()
+    elif name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # cache on the module so __getattr__ only runs on first access
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> "List[str]":
+    return sorted(set(globals()) | set(_EXPORTS) | {"__version__"})
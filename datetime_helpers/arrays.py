@@ -0,0 +1,205 @@
+# Compact columns of dates and datetimes: DateArray keeps proleptic ordinals in an array('i') (4 bytes per date) and
+# DateTimeArray keeps microseconds since the epoch in an array('q') (8 bytes per datetime), where a list pays for a
+# pointer plus a 32 (date) or 48 (datetime) byte object per value. Values are only boxed into date/datetime objects
+# when they are read, the column methods mirror utils and work on the integers directly.
+import datetime
+from array import array
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+from typing import Union
+from typing import overload
+
+from .utils import _EPOCH_ORDINAL
+from .utils import _IS_WEEKEND
+from .utils import _add_business_days_to_ordinal
+from .utils import datetime_from_micros
+from .utils import datetime_to_micros
+
+if TYPE_CHECKING:
+    from .business_calendar import BusinessCalendar
+
+MICROS_PER_DAY = 86_400_000_000
+# weekday tables indexed by ordinal % 7 rather than (ordinal - 1) % 7, ordinal 1 (0001-01-01) is a Monday
+_WEEKDAY_BY_ORDINAL = tuple((remainder - 1) % 7 for remainder in range(7))
+_IS_WEEKEND_BY_ORDINAL = tuple(_IS_WEEKEND[weekday] for weekday in _WEEKDAY_BY_ORDINAL)
+_IS_WEEKDAY_BY_ORDINAL = tuple(not is_weekend for is_weekend in _IS_WEEKEND_BY_ORDINAL)
+
+ArrayT = TypeVar("ArrayT", bound="_IntegerArray[Any]")
+ValueT = TypeVar("ValueT")
+
+
+class _IntegerArray(Iterable[ValueT]):
+    # shared sequence behaviour, subclasses set the typecode and how a value is boxed from and unboxed to an integer
+    typecode = ""
+
+    def __init__(self, values: Iterable[ValueT] = ()) -> None:
+        self._values = array(self.typecode, [self._unbox(value) for value in values])
+
+    @classmethod
+    def _from_array(cls: Type[ArrayT], values: "array[int]") -> ArrayT:
+        instance = cls.__new__(cls)
+        instance._values = values  # pylint: disable=protected-access
+        return instance
+
+    @staticmethod
+    def _box(value: int) -> ValueT:
+        raise NotImplementedError
+
+    @staticmethod
+    def _unbox(value: ValueT) -> int:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @overload
+    def __getitem__(self, index: int) -> ValueT:
+        ...
+
+    @overload
+    def __getitem__(self: ArrayT, index: slice) -> ArrayT:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self._from_array(values=self._values[index])
+        return self._box(self._values[index])
+
+    def __iter__(self) -> Iterator[ValueT]:
+        return map(self._box, self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self._values == other._values
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # buffer protocol for Python >= 3.12 (PEP 688), use the ordinals/micros array directly before that
+        return memoryview(self._values)
+
+    def append(self, value: ValueT) -> None:
+        self._values.append(self._unbox(value))
+
+    def extend(self, values: Iterable[ValueT]) -> None:
+        self._values.extend(self._unbox(value) for value in values)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._values) * self._values.itemsize
+
+
+class DateArray(_IntegerArray[datetime.date]):
+    typecode = "i"
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> "DateArray":
+        return cls._from_array(values=array(cls.typecode, ordinals))
+
+    @staticmethod
+    def _box(value: int) -> datetime.date:
+        return datetime.date.fromordinal(value)
+
+    @staticmethod
+    def _unbox(value: datetime.date) -> int:
+        return value.toordinal()
+
+    @property
+    def ordinals(self) -> "array[int]":
+        # the backing array('i'), shared rather than copied
+        return self._values
+
+    def weekday(self) -> "array[int]":
+        # datetime.date.weekday() of every date
+        return array("b", [_WEEKDAY_BY_ORDINAL[ordinal % 7] for ordinal in self._values])
+
+    def is_weekend(self) -> "array[int]":
+        return array("B", [_IS_WEEKEND_BY_ORDINAL[ordinal % 7] for ordinal in self._values])
+
+    def is_weekday(self) -> "array[int]":
+        return array("B", [_IS_WEEKDAY_BY_ORDINAL[ordinal % 7] for ordinal in self._values])
+
+    def is_business_day(self, calendar: Optional["BusinessCalendar"] = None) -> "array[int]":
+        if calendar is None:
+            return self.is_weekday()
+        is_business_ordinal = calendar._is_business_ordinal  # pylint: disable=protected-access
+        return array("B", [is_business_ordinal(ordinal) for ordinal in self._values])
+
+    def add_business_days(self, n: int, calendar: Optional["BusinessCalendar"] = None) -> "DateArray":  # pylint: disable=invalid-name
+        add = _add_business_days_to_ordinal if calendar is None else calendar._add_business_days_to_ordinal  # pylint: disable=protected-access
+        return self._from_array(values=array(self.typecode, [add(ordinal, n) for ordinal in self._values]))
+
+    def next_business_day(self, calendar: Optional["BusinessCalendar"] = None) -> "DateArray":
+        return self.add_business_days(n=1, calendar=calendar)
+
+    def previous_business_day(self, calendar: Optional["BusinessCalendar"] = None) -> "DateArray":
+        return self.add_business_days(n=-1, calendar=calendar)
+
+    def to_millis(self) -> "array[int]":
+        return array("q", [(ordinal - _EPOCH_ORDINAL) * 86_400_000 for ordinal in self._values])
+
+    def to_micros(self) -> "array[int]":
+        return array("q", [(ordinal - _EPOCH_ORDINAL) * MICROS_PER_DAY for ordinal in self._values])
+
+
+class DateTimeArray(_IntegerArray[datetime.datetime]):
+    # naive datetimes are treated as UTC and aware ones are converted to it, values read back are naive UTC
+    typecode = "q"
+
+    @classmethod
+    def from_micros(cls, micros: Iterable[int]) -> "DateTimeArray":
+        return cls._from_array(values=array(cls.typecode, micros))
+
+    @staticmethod
+    def _box(value: int) -> datetime.datetime:
+        return datetime_from_micros(micros=value)
+
+    @staticmethod
+    def _unbox(value: datetime.datetime) -> int:
+        return datetime_to_micros(dt=value)
+
+    @property
+    def micros(self) -> "array[int]":
+        # the backing array('q'), shared rather than copied
+        return self._values
+
+    def dates(self) -> DateArray:
+        return DateArray.from_ordinals(micros // MICROS_PER_DAY + _EPOCH_ORDINAL for micros in self._values)
+
+    def weekday(self) -> "array[int]":
+        return array("b", [_WEEKDAY_BY_ORDINAL[(micros // MICROS_PER_DAY + _EPOCH_ORDINAL) % 7] for micros in self._values])
+
+    def is_weekend(self) -> "array[int]":
+        return array("B", [_IS_WEEKEND_BY_ORDINAL[(micros // MICROS_PER_DAY + _EPOCH_ORDINAL) % 7] for micros in self._values])
+
+    def is_weekday(self) -> "array[int]":
+        return array("B", [_IS_WEEKDAY_BY_ORDINAL[(micros // MICROS_PER_DAY + _EPOCH_ORDINAL) % 7] for micros in self._values])
+
+    def add_business_days(self, n: int, calendar: Optional["BusinessCalendar"] = None) -> "DateTimeArray":  # pylint: disable=invalid-name
+        # like utils.add_business_days the time of day is kept
+        add = _add_business_days_to_ordinal if calendar is None else calendar._add_business_days_to_ordinal  # pylint: disable=protected-access
+        values = array(self.typecode)
+        for micros in self._values:
+            ordinal = micros // MICROS_PER_DAY + _EPOCH_ORDINAL
+            values.append(micros + (add(ordinal, n) - ordinal) * MICROS_PER_DAY)
+        return self._from_array(values=values)
+
+    def next_business_day(self, calendar: Optional["BusinessCalendar"] = None) -> "DateTimeArray":
+        return self.add_business_days(n=1, calendar=calendar)
+
+    def previous_business_day(self, calendar: Optional["BusinessCalendar"] = None) -> "DateTimeArray":
+        return self.add_business_days(n=-1, calendar=calendar)
+
+    def to_millis(self) -> "array[int]":
+        # truncated towards zero like datetime_to_millis
+        return array("q", [micros // 1000 if micros >= 0 else -(-micros // 1000) for micros in self._values])
+
+    def to_seconds(self) -> "array[float]":
+        return array("d", [micros / 1_000_000 for micros in self._values])
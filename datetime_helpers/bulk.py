@@ -0,0 +1,378 @@
+import asyncio
+import collections
+import datetime
+import itertools
+import mmap
+import os
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
+from typing import Deque
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .exceptions import bad_request
+from .formatting import compile_format
+from .utils import DATE_FORMAT
+from .utils import JSON_DATE_FORMAT
+from .utils import _get_parser
+from .utils import datetime_to_millis
+
+DEFAULT_CHUNK_SIZE = 10_000
+# the async converters hand control back to the event loop after each chunk, so they default to smaller chunks
+DEFAULT_ASYNC_CHUNK_SIZE = 1_000
+DEFAULT_OFFLOAD_THRESHOLD = 100_000
+ERRORS = ("raise", "skip", "collect")
+# what a single malformed value makes the converters raise, anything else aborts the stream
+CONVERSION_ERRORS = (ValueError, TypeError, OverflowError, AttributeError)
+
+Source = Union[str, "os.PathLike[str]", Iterable[str], bytes, bytearray, mmap.mmap]
+AsyncSource = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+class MalformedRow(NamedTuple):
+    row: int
+    value: object
+    error: str
+
+
+def _iter_buffer_lines(buffer: Union[bytes, bytearray, mmap.mmap], encoding: str) -> Iterator[str]:
+    # slicing leaves the position of an mmap untouched and only copies one line at a time
+    start = 0
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+        yield buffer[start:end].decode(encoding)
+        start = end + 1
+
+
+def read_column(source: Source, delimiter: Optional[str] = None, column: int = 0, skip_rows: int = 0, encoding: str = "utf-8") -> Iterator[str]:
+    # Yield one field per line of a file path, text file object or bytes/mmap buffer.
+    # Without a delimiter the whole line is the field, lines missing the column yield "" so row indexes stay aligned.
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding, newline="") as file:
+            yield from read_column(source=file, delimiter=delimiter, column=column, skip_rows=skip_rows, encoding=encoding)
+        return
+    lines: Iterable[str] = _iter_buffer_lines(buffer=source, encoding=encoding) if isinstance(source, (bytes, bytearray, mmap.mmap)) else source
+    for line in itertools.islice(lines, skip_rows, None):
+        line = line.rstrip("\r\n")
+        if delimiter is None:
+            yield line
+            continue
+        fields = line.split(delimiter, column + 1)
+        yield fields[column] if column < len(fields) else ""
+
+
+# converters are named by kind so worker processes can rebuild them, lambdas and bound methods do not pickle
+def _get_converter(kind: str, fmt: str) -> Callable[[Any], Any]:
+    if kind == "datetime":
+        return _get_parser(datetime_format=fmt)
+    if kind == "date":
+        parser = _get_parser(datetime_format=fmt)
+        return lambda text: parser(text).date()
+    if kind == "millis":
+        return datetime_to_millis
+    return compile_format(fmt).format
+
+
+def _convert_chunk(convert: Callable[[Any], Any], chunk: List[Any], offset: int) -> Tuple[List[Any], List[MalformedRow]]:
+    try:
+        return [convert(value) for value in chunk], []
+    except CONVERSION_ERRORS:
+        pass
+    # redo the failing chunk one value at a time to locate the malformed rows
+    results = []
+    malformed_rows = []
+    for index, value in enumerate(chunk, start=offset):
+        try:
+            results.append(convert(value))
+        except CONVERSION_ERRORS as exception:
+            malformed_rows.append(MalformedRow(row=index, value=value, error=str(exception)))
+    return results, malformed_rows
+
+
+def _convert_chunk_in_worker(kind: str, fmt: str, chunk: List[Any], offset: int) -> Tuple[List[Any], List[MalformedRow]]:
+    return _convert_chunk(convert=_get_converter(kind=kind, fmt=fmt), chunk=chunk, offset=offset)
+
+
+def _iter_chunks(values: Iterable[Any], chunk_size: int) -> Iterator[Tuple[int, List[Any]]]:
+    iterator = iter(values)
+    offset = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
+async def _aiter_chunks(values: AsyncSource, chunk_size: int) -> AsyncIterator[Tuple[int, List[Any]]]:
+    if not isinstance(values, AsyncIterable):
+        for offset_and_chunk in _iter_chunks(values=values, chunk_size=chunk_size):
+            yield offset_and_chunk
+        return
+    offset = 0
+    chunk = []
+    async for value in values:
+        chunk.append(value)
+        if len(chunk) == chunk_size:
+            yield offset, chunk
+            offset += chunk_size
+            chunk = []
+    if chunk:
+        yield offset, chunk
+
+
+def _check_arguments(errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, max_workers: Optional[int]) -> None:
+    if errors not in ERRORS:
+        raise bad_request(message=f"errors must be one of {ERRORS}")
+    if errors == "collect" and malformed is None:
+        raise bad_request(message="malformed must be a list when errors='collect'")
+    if chunk_size < 1:
+        raise bad_request(message="chunk_size must be >= 1")
+    if max_workers is not None and max_workers < 1:
+        raise bad_request(message="max_workers must be >= 1")
+
+
+def _handle_malformed(malformed_rows: List[MalformedRow], errors: str, malformed: Optional[List[MalformedRow]]) -> None:
+    if not malformed_rows:
+        return
+    if errors == "raise":
+        raise bad_request(message=f"row {malformed_rows[0].row}: {malformed_rows[0].error}")
+    if malformed is not None:
+        malformed.extend(malformed_rows)
+
+
+def _iter_converted(values: Iterable[Any], kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, parallel: bool, max_workers: Optional[int]) -> Iterator[Any]:
+    # validate eagerly rather than on the first next() of the generator
+    _check_arguments(errors=errors, malformed=malformed, chunk_size=chunk_size, max_workers=max_workers)
+    if parallel:
+        return _iter_converted_in_processes(values=values, kind=kind, fmt=fmt, errors=errors, malformed=malformed, chunk_size=chunk_size, max_workers=max_workers)
+    return _iter_converted_in_process(values=values, kind=kind, fmt=fmt, errors=errors, malformed=malformed, chunk_size=chunk_size)
+
+
+def _iter_converted_in_process(values: Iterable[Any], kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int) -> Iterator[Any]:
+    convert = _get_converter(kind=kind, fmt=fmt)
+    for offset, chunk in _iter_chunks(values=values, chunk_size=chunk_size):
+        results, malformed_rows = _convert_chunk(convert=convert, chunk=chunk, offset=offset)
+        _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+        yield from results
+
+
+def _iter_converted_in_processes(values: Iterable[Any], kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, max_workers: Optional[int]) -> Iterator[Any]:
+    max_workers = max_workers or os.cpu_count() or 1
+    # keep a bounded number of chunks in flight so the input is streamed rather than read up front
+    pending: Deque["Future[Tuple[List[Any], List[MalformedRow]]]"] = collections.deque()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for offset, chunk in _iter_chunks(values=values, chunk_size=chunk_size):
+                pending.append(executor.submit(_convert_chunk_in_worker, kind, fmt, chunk, offset))
+                if len(pending) >= 2 * max_workers:
+                    results, malformed_rows = pending.popleft().result()
+                    _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+                    yield from results
+            while pending:
+                results, malformed_rows = pending.popleft().result()
+                _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _aiter_converted(
+    values: AsyncSource, kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, executor: Optional[Executor], offload_threshold: int
+) -> AsyncIterator[Any]:
+    # validate eagerly rather than on the first __anext__() of the generator
+    _check_arguments(errors=errors, malformed=malformed, chunk_size=chunk_size, max_workers=None)
+    if offload_threshold < 0:
+        raise bad_request(message="offload_threshold must be >= 0")
+    return _aiter_converted_chunks(values=values, kind=kind, fmt=fmt, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold)
+
+
+async def _aiter_converted_chunks(
+    values: AsyncSource, kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, executor: Optional[Executor], offload_threshold: int
+) -> AsyncIterator[Any]:
+    max_pending = 2 * (os.cpu_count() or 1)
+    async for results in _aiter_converted_chunk_results(
+        values=values, kind=kind, fmt=fmt, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold, max_pending=max_pending
+    ):
+        for result in results:
+            yield result
+
+
+async def _aiter_converted_chunk_results(
+    values: AsyncSource, kind: str, fmt: str, errors: str, malformed: Optional[List[MalformedRow]], chunk_size: int, executor: Optional[Executor], offload_threshold: int, max_pending: int
+) -> AsyncIterator[List[Any]]:
+    # Chunks up to offload_threshold values are converted on the event loop, which is yielded to after each of them.
+    # Past it (and only with an executor) chunks run on the executor, at most max_pending in flight so the input keeps
+    # streaming and errors="raise" stops soon after the first malformed row.
+    loop = asyncio.get_running_loop()
+    convert = _get_converter(kind=kind, fmt=fmt)
+    pending: Deque["asyncio.Future[Tuple[List[Any], List[MalformedRow]]]"] = collections.deque()
+    try:
+        async for offset, chunk in _aiter_chunks(values=values, chunk_size=chunk_size):
+            if executor is None or offset + len(chunk) <= offload_threshold:
+                results, malformed_rows = _convert_chunk(convert=convert, chunk=chunk, offset=offset)
+                _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+                yield results
+                await asyncio.sleep(0)
+                continue
+            pending.append(loop.run_in_executor(executor, _convert_chunk_in_worker, kind, fmt, chunk, offset))
+            if len(pending) >= max_pending:
+                results, malformed_rows = await pending.popleft()
+                _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+                yield results
+        while pending:
+            results, malformed_rows = await pending.popleft()
+            _handle_malformed(malformed_rows=malformed_rows, errors=errors, malformed=malformed)
+            yield results
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_datetimes_from_strings(
+    texts: Iterable[str],
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[datetime.datetime]:
+    # errors="raise" stops at the first malformed row, "skip" drops it and "collect" also appends it to malformed.
+    # parallel=True converts chunks in a process pool of max_workers (defaults to os.cpu_count()), results keep their order.
+    return _iter_converted(values=texts, kind="datetime", fmt=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, parallel=parallel, max_workers=max_workers)
+
+
+def iter_strings_from_datetimes(
+    dts: Iterable[datetime.date],
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[str]:
+    return _iter_converted(values=dts, kind="string", fmt=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, parallel=parallel, max_workers=max_workers)
+
+
+def iter_millis_from_datetimes(
+    dts: Iterable[datetime.date],
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[int]:
+    return _iter_converted(values=dts, kind="millis", fmt="", errors=errors, malformed=malformed, chunk_size=chunk_size, parallel=parallel, max_workers=max_workers)
+
+
+def iter_dates_from_strings(
+    texts: Iterable[str],
+    date_format: str = DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[datetime.date]:
+    return _iter_converted(values=texts, kind="date", fmt=date_format, errors=errors, malformed=malformed, chunk_size=chunk_size, parallel=parallel, max_workers=max_workers)
+
+
+def parse_many(
+    texts: Iterable[str],
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> List[datetime.datetime]:
+    return list(iter_datetimes_from_strings(texts=texts, datetime_format=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, parallel=True, max_workers=max_workers))
+
+
+async def parse_many_async(
+    texts: Iterable[str],
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[datetime.datetime]:
+    # parse_many without blocking the event loop, chunks run on executor (a new process pool of max_workers by default)
+    _check_arguments(errors=errors, malformed=malformed, chunk_size=chunk_size, max_workers=max_workers)
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=max_workers) if executor is None else executor
+    dts: List[datetime.datetime] = []
+    try:
+        async for results in _aiter_converted_chunk_results(
+            values=texts, kind="datetime", fmt=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=pool, offload_threshold=0, max_pending=2 * max_workers
+        ):
+            dts.extend(results)
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False)
+    return dts
+
+
+def aiter_datetimes_from_strings(
+    texts: AsyncSource,
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[datetime.datetime]:
+    # iter_datetimes_from_strings for asyncio, texts may be an async iterable (e.g. a streamed request body).
+    # Awaits asyncio.sleep(0) between chunks so other tasks run, with an executor (threads or processes) the values past
+    # the first offload_threshold are converted off the event loop. Results keep their order.
+    return _aiter_converted(values=texts, kind="datetime", fmt=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold)
+
+
+def aiter_strings_from_datetimes(
+    dts: AsyncSource,
+    datetime_format: str = JSON_DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[str]:
+    return _aiter_converted(values=dts, kind="string", fmt=datetime_format, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold)
+
+
+def aiter_dates_from_strings(
+    texts: AsyncSource,
+    date_format: str = DATE_FORMAT,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[datetime.date]:
+    return _aiter_converted(values=texts, kind="date", fmt=date_format, errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold)
+
+
+def aiter_millis_from_datetimes(
+    dts: AsyncSource,
+    errors: str = "raise",
+    malformed: Optional[List[MalformedRow]] = None,
+    chunk_size: int = DEFAULT_ASYNC_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[int]:
+    return _aiter_converted(values=dts, kind="millis", fmt="", errors=errors, malformed=malformed, chunk_size=chunk_size, executor=executor, offload_threshold=offload_threshold)
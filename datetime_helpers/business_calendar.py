@@ -0,0 +1,305 @@
+import datetime
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+from .exceptions import bad_request
+from .utils import DateT
+from .utils import _days_in_month
+from .utils import create_date
+
+# Files written by BusinessCalendar.save() are a _HEADER followed by the bitmap, the cumulative counts, the business
+# day ordinals and the holiday ordinals, each padded to 8 bytes and in the byte order of the machine that wrote them.
+# The checksum is the CRC-32 of the header fields before it followed by everything after the header. Bump
+# FORMAT_VERSION when the layout changes.
+FORMAT_VERSION = 2
+_MAGIC = b"DTHBCAL\0"
+# magic, version, byte order, weekend bitmask, start_year, end_year, days, business days, holidays, checksum
+_HEADER = struct.Struct("<8sHBBiiiiiI4x")
+_CHECKSUM_OFFSET = struct.calcsize("<8sHBBiiiii")
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+Path = Union[str, "os.PathLike[str]"]
+
+
+class _StaleCalendarFile(Exception):
+    pass
+
+
+def _padded(data: bytes) -> bytes:
+    return data + bytes(-len(data) % 8)
+
+
+# Business days for a range of years, honouring holidays and a custom weekend (weekday numbers, 0 is Monday).
+# The whole range is precomputed once into a bitmap (one bit per day), the cumulative number of business days
+# before each day and the ordinals of every business day, so every query is an index lookup.
+class BusinessCalendar:
+    def __init__(self, holidays: Iterable[datetime.date] = (), weekend: Iterable[int] = (5, 6), start_year: int = 1970, end_year: int = 2099) -> None:
+        holidays = frozenset(holidays)
+        weekend = frozenset(weekend)
+        if not weekend <= set(range(7)) or len(weekend) == 7:
+            raise bad_request(message="weekend must be a subset of weekday numbers 0-6 leaving at least one business day")
+        if start_year > end_year:
+            raise bad_request(message="start_year must be <= end_year")
+        first_ordinal = create_date(year=start_year, month=1, day=1).toordinal()
+        size = create_date(year=end_year, month=12, day=31).toordinal() + 1 - first_ordinal
+
+        is_weekend = tuple(weekday in weekend for weekday in range(7))
+        holiday_ordinals = {holiday.toordinal() for holiday in holidays}
+        bitmap = bytearray((size + 7) // 8)
+        cumulative = array("I", [0])  # cumulative[i] == # of business days before day i of the range
+        business_ordinals = array("i")
+        weekday = (first_ordinal - 1) % 7  # ordinal 1 (0001-01-01) is a Monday
+        for index in range(size):
+            ordinal = first_ordinal + index
+            if not is_weekend[weekday] and ordinal not in holiday_ordinals:
+                bitmap[index >> 3] |= 1 << (index & 7)
+                business_ordinals.append(ordinal)
+            cumulative.append(len(business_ordinals))
+            weekday = weekday + 1 if weekday < 6 else 0
+        self._set_tables(holidays=holidays, weekend=weekend, start_year=start_year, end_year=end_year, bitmap=bytes(bitmap), cumulative=cumulative, business_ordinals=business_ordinals)
+        self._mapping: Optional[mmap.mmap] = None
+
+    def _set_tables(
+        self,
+        holidays: FrozenSet[datetime.date],
+        weekend: FrozenSet[int],
+        start_year: int,
+        end_year: int,
+        bitmap: Union[bytes, memoryview],
+        cumulative: Union["array[int]", memoryview],
+        business_ordinals: Union["array[int]", memoryview],
+    ) -> None:
+        # the tables are bytes and arrays when built, read-only memoryviews of the mapped file when loaded, and never modified
+        # either way, so a calendar can be shared between threads without locking
+        self.holidays = holidays
+        self.weekend = weekend
+        self.start_year = start_year
+        self.end_year = end_year
+        self._first_ordinal = datetime.date(start_year, 1, 1).toordinal()
+        self._size = len(cumulative) - 1
+        self._bitmap = bitmap
+        self._cumulative = cumulative
+        self._business_ordinals = business_ordinals
+
+    def _unmap(self) -> None:
+        # release the views of a loaded calendar and close the mapping so its file can be replaced (Windows refuses to
+        # replace a mapped file), the calendar can't be used afterwards
+        if self._mapping is not None:
+            for table in (self._bitmap, self._cumulative, self._business_ordinals):
+                if isinstance(table, memoryview):
+                    table.release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(holidays=<{len(self.holidays)} dates>, weekend={sorted(self.weekend)}, start_year={self.start_year}, end_year={self.end_year})"
+
+    def _index(self, dt: datetime.date, allow_end: bool = False) -> int:
+        index = dt.toordinal() - self._first_ordinal
+        if not 0 <= index < self._size + allow_end:
+            raise bad_request(message=f"{dt} is outside of the calendar range {self.start_year}-{self.end_year}")
+        return index
+
+    def _ordinal_index(self, ordinal: int) -> int:
+        index = ordinal - self._first_ordinal
+        if not 0 <= index < self._size:
+            raise bad_request(message=f"{datetime.date.fromordinal(ordinal)} is outside of the calendar range {self.start_year}-{self.end_year}")
+        return index
+
+    def _is_business_ordinal(self, ordinal: int) -> bool:
+        index = self._ordinal_index(ordinal=ordinal)
+        return bool(self._bitmap[index >> 3] & (1 << (index & 7)))
+
+    def _add_business_days_to_ordinal(self, ordinal: int, n: int) -> int:  # pylint: disable=invalid-name
+        # n > 0 steps forward, n < 0 steps backward, n == 0 returns ordinal unchanged
+        index = self._ordinal_index(ordinal=ordinal)
+        if n == 0:
+            return ordinal
+        position = self._cumulative[index + 1] + n - 1 if n > 0 else self._cumulative[index] + n
+        if not 0 <= position < len(self._business_ordinals):
+            raise bad_request(message=f"business day is outside of the calendar range {self.start_year}-{self.end_year}")
+        return self._business_ordinals[position]
+
+    def _business_days_before_ordinal(self, ordinal: int) -> int:
+        # number of business days of the range before ordinal
+        return self._cumulative[self._ordinal_index(ordinal=ordinal)]
+
+    def _business_ordinal(self, position: int) -> int:
+        # ordinal of the business day with position business days of the range before it
+        if not 0 <= position < len(self._business_ordinals):
+            raise bad_request(message=f"business day is outside of the calendar range {self.start_year}-{self.end_year}")
+        return self._business_ordinals[position]
+
+    def is_business_day(self, dt: datetime.date) -> bool:
+        index = self._index(dt=dt)
+        return bool(self._bitmap[index >> 3] & (1 << (index & 7)))
+
+    def add_business_days(self, dt: DateT, n: int) -> DateT:  # pylint: disable=invalid-name
+        # n > 0 steps forward, n < 0 steps backward, n == 0 returns dt unchanged
+        ordinal = dt.toordinal()
+        # shift dt rather than building a date from the ordinal so datetimes keep their type and time
+        return dt + datetime.timedelta(days=self._add_business_days_to_ordinal(ordinal=ordinal, n=n) - ordinal)
+
+    def next_business_day(self, dt: DateT) -> DateT:
+        return self.add_business_days(dt=dt, n=1)
+
+    def previous_business_day(self, dt: DateT) -> DateT:
+        return self.add_business_days(dt=dt, n=-1)
+
+    def business_days_between(self, start: datetime.date, end: datetime.date) -> int:
+        # number of business days in [start, end), negative if end is before start
+        return self._cumulative[self._index(dt=end, allow_end=True)] - self._cumulative[self._index(dt=start, allow_end=True)]
+
+    def business_day_ordinals(self, start: datetime.date, end: datetime.date) -> "array[int]":
+        # proleptic ordinals of the business days in [start, end), an empty array if end is before start
+        first = self._cumulative[self._index(dt=start, allow_end=True)]
+        last = self._cumulative[self._index(dt=end, allow_end=True)]
+        ordinals = array("i")
+        if first < last:
+            # one copy for both kinds of table, frombytes only takes a byte view of a memoryview
+            ordinals.frombytes(memoryview(self._business_ordinals)[first:last].cast("B"))
+        return ordinals
+
+    def iter_business_days(self, start: datetime.date, end: datetime.date) -> Iterator[datetime.date]:
+        # business days in [start, end) in order, each date is only built when the iterator reaches it
+        return map(datetime.date.fromordinal, self.business_day_ordinals(start=start, end=end))
+
+    def business_days_in_month(self, year: int, month: int) -> "array[int]":
+        # days of the month (1-31) that are business days
+        index = self._index(dt=create_date(year=year, month=month, day=1))
+        first = self._cumulative[index]
+        last = self._cumulative[index + _days_in_month(year=year, month=month)]
+        day_zero = self._first_ordinal + index - 1
+        return array("H", [ordinal - day_zero for ordinal in self._business_ordinals[first:last]])
+
+    def nth_business_day_of_month(self, year: int, month: int, n: int) -> datetime.date:  # pylint: disable=invalid-name
+        index = self._index(dt=create_date(year=year, month=month, day=1))
+        if n < 1:
+            raise bad_request(message="n must be >= 1")
+        position = self._cumulative[index] + n - 1
+        if position >= self._cumulative[index + _days_in_month(year=year, month=month)]:
+            raise bad_request(message="n > # of business days in month")
+        return datetime.date.fromordinal(self._business_ordinals[position])
+
+    def last_business_day_of_month(self, year: int, month: int) -> datetime.date:
+        index = self._index(dt=create_date(year=year, month=month, day=1))
+        end = self._cumulative[index + _days_in_month(year=year, month=month)]
+        if end == self._cumulative[index]:
+            raise bad_request(message="no business days in month")
+        return datetime.date.fromordinal(self._business_ordinals[end - 1])
+
+    def save(self, path: Path) -> None:
+        # Write the precomputed tables to path for load(). The file is written next to path and renamed over it, so
+        # processes and threads loading it concurrently see either the old or the new file, never a partial one.
+        holiday_ordinals = array("i", sorted(holiday.toordinal() for holiday in self.holidays))
+        payload = b"".join(_padded(bytes(table)) for table in (self._bitmap, self._cumulative, self._business_ordinals, holiday_ordinals))
+        weekend_mask = sum(1 << weekday for weekday in self.weekend)
+        fields = (_MAGIC, FORMAT_VERSION, _BYTE_ORDER, weekend_mask, self.start_year, self.end_year, self._size, len(self._business_ordinals), len(holiday_ordinals))
+        checksummed_header = _HEADER.pack(*fields, 0)[:_CHECKSUM_OFFSET]
+        header = _HEADER.pack(*fields, zlib.crc32(payload, zlib.crc32(checksummed_header)))
+        # one temporary file per thread, concurrent saves would otherwise interleave their writes and rename each other's file
+        temporary_path = f"{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                file.write(header)
+                file.write(payload)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def _load(cls, path: Path) -> "BusinessCalendar":
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise _StaleCalendarFile("truncated header")
+            # the mapping stays valid once the file is closed, all the processes mapping it share its page cache
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapping)
+        try:
+            cls._check(buffer=buffer)
+        except _StaleCalendarFile:
+            buffer.release()
+            mapping.close()
+            raise
+        _, _, _, weekend_mask, start_year, end_year, size, business_days, holidays, _ = _HEADER.unpack_from(buffer)
+        tables = []
+        offset = _HEADER.size
+        for length in ((size + 7) // 8, 4 * (size + 1), 4 * business_days, 4 * holidays):
+            end = offset + length
+            tables.append(buffer[offset:end])
+            offset = end + -length % 8
+        bitmap, cumulative, business_ordinals, holiday_ordinals = tables
+        calendar = cls.__new__(cls)
+        calendar._set_tables(  # pylint: disable=protected-access
+            holidays=frozenset(map(datetime.date.fromordinal, holiday_ordinals.cast("i"))),
+            weekend=frozenset(weekday for weekday in range(7) if weekend_mask >> weekday & 1),
+            start_year=start_year,
+            end_year=end_year,
+            bitmap=bitmap,
+            cumulative=cumulative.cast("I"),
+            business_ordinals=business_ordinals.cast("i"),
+        )
+        calendar._mapping = mapping  # pylint: disable=protected-access
+        return calendar
+
+    @staticmethod
+    def _check(buffer: memoryview) -> None:
+        magic, version, byte_order, _, start_year, end_year, size, business_days, holidays, checksum = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise _StaleCalendarFile("not a business calendar file")
+        if version != FORMAT_VERSION:
+            raise _StaleCalendarFile(f"format version {version}, expected {FORMAT_VERSION}")
+        if byte_order != _BYTE_ORDER:
+            raise _StaleCalendarFile("written on a machine of the other byte order")
+        if not 1 <= start_year <= end_year <= datetime.MAXYEAR or size != datetime.date(end_year, 12, 31).toordinal() + 1 - datetime.date(start_year, 1, 1).toordinal():
+            raise _StaleCalendarFile("days do not match the years in the header")
+        lengths = ((size + 7) // 8, 4 * (size + 1), 4 * business_days, 4 * holidays)
+        offset = _HEADER.size
+        if offset + sum(length + -length % 8 for length in lengths) != len(buffer):
+            raise _StaleCalendarFile("truncated tables")
+        if zlib.crc32(buffer[offset:], zlib.crc32(buffer[:_CHECKSUM_OFFSET])) != checksum:
+            raise _StaleCalendarFile("checksum mismatch")
+
+    @classmethod
+    def load(cls, path: Path) -> "BusinessCalendar":
+        # memory-map a file written by save(), nothing is parsed or copied beyond the header and the holidays
+        try:
+            return cls._load(path=path)
+        except _StaleCalendarFile as exception:
+            raise bad_request(message=f"{os.fspath(path)}: {exception}") from None
+
+    @classmethod
+    def load_or_build(cls, path: Path, holidays: Iterable[datetime.date] = (), weekend: Iterable[int] = (5, 6), start_year: int = 1970, end_year: int = 2099) -> "BusinessCalendar":
+        # load path if it holds this calendar, otherwise (missing, stale, corrupt or built differently) build it, save it to path and load that
+        holidays = frozenset(holidays)
+        weekend = frozenset(weekend)
+        calendar = cls._load_if_built_with(path=path, holidays=holidays, weekend=weekend, start_year=start_year, end_year=end_year)
+        if calendar is None:
+            built = cls(holidays=holidays, weekend=weekend, start_year=start_year, end_year=end_year)
+            built.save(path=path)
+            # another thread or process may have replaced the file with a different calendar since, keep this one in memory then
+            calendar = cls._load_if_built_with(path=path, holidays=holidays, weekend=weekend, start_year=start_year, end_year=end_year) or built
+        return calendar
+
+    @classmethod
+    def _load_if_built_with(cls, path: Path, holidays: FrozenSet[datetime.date], weekend: FrozenSet[int], start_year: int, end_year: int) -> Optional["BusinessCalendar"]:
+        try:
+            calendar = cls._load(path=path)
+        except (FileNotFoundError, _StaleCalendarFile):
+            return None
+        if (calendar.holidays, calendar.weekend, calendar.start_year, calendar.end_year) == (holidays, weekend, start_year, end_year):
+            return calendar
+        calendar._unmap()  # pylint: disable=protected-access
+        return None
@@ -0,0 +1,159 @@
+# Business time: durations counted only inside daily trading windows of business days, e.g. SLA deadlines like
+# "4 business hours after this timestamp". Every datetime maps to its position, the business microseconds since a fixed
+# origin (business days before its day times the length of a business day, plus the business time elapsed that day).
+# Adding business time and measuring it between two datetimes are then integer arithmetic on positions, however
+# many days, weekends or holidays lie in between.
+import bisect
+import datetime
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .business_calendar import BusinessCalendar
+from .exceptions import bad_request
+from .utils import _IS_WEEKEND
+from .utils import _business_days_before
+from .utils import _business_ordinal
+
+Window = Tuple[datetime.time, datetime.time]
+
+DEFAULT_WINDOWS: Sequence[Window] = ((datetime.time(9), datetime.time(17)),)
+
+_MICROS_PER_DAY = 86_400_000_000
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+def _time_to_micros(time: Union[datetime.time, datetime.datetime]) -> int:
+    # the time of day of a time or a datetime
+    return ((time.hour * 60 + time.minute) * 60 + time.second) * 1_000_000 + time.microsecond
+
+
+def _timedelta_to_micros(delta: datetime.timedelta) -> int:
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class BusinessHours:
+    # Trading windows (start, end) of every business day, in order and not overlapping, as wall-clock times of the
+    # datetimes they are applied to. An end of time(0) is midnight at the end of the day. Business days are
+    # Monday-Friday, or those of calendar. Nothing changes after __init__, so instances can be shared between threads.
+    def __init__(self, windows: Iterable[Window] = DEFAULT_WINDOWS, calendar: Optional[BusinessCalendar] = None) -> None:
+        self.windows: Tuple[Window, ...] = tuple(windows)
+        self.calendar = calendar
+        if not self.windows:
+            raise bad_request(message="windows must not be empty")
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in self.windows:
+            if start.tzinfo is not None or end.tzinfo is not None:
+                raise bad_request(message="windows must be naive times")
+            start_micros = _time_to_micros(time=start)
+            end_micros = _time_to_micros(time=end) or _MICROS_PER_DAY
+            if start_micros >= end_micros or ends and start_micros < ends[-1]:
+                raise bad_request(message="windows must be in order, not overlapping and each start before its end")
+            starts.append(start_micros)
+            ends.append(end_micros)
+        self._starts = tuple(starts)
+        self._ends = tuple(ends)
+        # before[i] == business time of a day before window i, before[-1] is the length of a business day
+        before = [0]
+        for start_micros, end_micros in zip(starts, ends):
+            before.append(before[-1] + end_micros - start_micros)
+        self._before = tuple(before)
+        self._day_length = before[-1]
+
+    def __repr__(self) -> str:
+        windows = [f"{start.isoformat()}-{end.isoformat()}" for start, end in self.windows]
+        return f"{type(self).__name__}(windows={windows}, calendar={self.calendar!r})"
+
+    def _day(self, ordinal: int) -> Tuple[int, bool]:
+        # (number of business days before the day, whether it is a business day)
+        if self.calendar is None:
+            return _business_days_before(ordinal), not _IS_WEEKEND[(ordinal - 1) % 7]  # ordinal 1 (0001-01-01) is a Monday
+        # pylint: disable=protected-access
+        return self.calendar._business_days_before_ordinal(ordinal=ordinal), self.calendar._is_business_ordinal(ordinal=ordinal)
+
+    def _business_ordinal(self, position: int) -> int:
+        # ordinal of the business day with position business days before it
+        if self.calendar is not None:
+            return self.calendar._business_ordinal(position=position)  # pylint: disable=protected-access
+        ordinal = _business_ordinal(position=position)
+        if not 1 <= ordinal <= _MAX_ORDINAL:
+            raise bad_request(message="business time is outside of the supported dates")
+        return ordinal
+
+    def _position(self, dt: datetime.date) -> int:
+        business_days_before, is_business_day = self._day(ordinal=dt.toordinal())
+        position = business_days_before * self._day_length
+        if is_business_day and isinstance(dt, datetime.datetime):
+            micros = _time_to_micros(time=dt)
+            window = bisect.bisect_right(self._starts, micros) - 1
+            if window >= 0:
+                start = self._starts[window]
+                position += self._before[window] + min(micros, self._ends[window]) - start
+        return position
+
+    def _datetime(self, position: int, forward: bool, tzinfo: Optional[datetime.tzinfo]) -> datetime.datetime:
+        # the earliest datetime at position when moving forward, the latest when moving backward, so a deadline landing
+        # on the end of a window stays on that end rather than on the start of the next window
+        days, micros = divmod(position, self._day_length)
+        if forward:
+            if micros == 0:
+                days -= 1
+                micros = self._day_length
+            window = bisect.bisect_left(self._before, micros) - 1
+        else:
+            window = bisect.bisect_right(self._before, micros) - 1
+        micros_of_day = self._starts[window] + micros - self._before[window]
+        dt = datetime.datetime.fromordinal(self._business_ordinal(position=days)) + datetime.timedelta(microseconds=micros_of_day)
+        return dt if tzinfo is None else dt.replace(tzinfo=tzinfo)
+
+    def is_business_time(self, dt: datetime.datetime) -> bool:
+        if not self._day(ordinal=dt.toordinal())[1]:
+            return False
+        micros = _time_to_micros(time=dt)
+        window = bisect.bisect_right(self._starts, micros) - 1
+        return window >= 0 and micros < self._ends[window]
+
+    def add_business_time(self, dt: datetime.date, delta: datetime.timedelta) -> datetime.datetime:
+        # delta > 0 steps forward, delta < 0 steps backward, a date is taken as its midnight. With delta == 0 dt is
+        # returned as a datetime even outside of business hours. Aware datetimes keep their tzinfo.
+        micros = _timedelta_to_micros(delta=delta)
+        dt = dt if isinstance(dt, datetime.datetime) else datetime.datetime(dt.year, dt.month, dt.day)
+        if micros == 0:
+            return dt
+        return self._datetime(position=self._position(dt=dt) + micros, forward=micros > 0, tzinfo=dt.tzinfo)
+
+    def business_time_between(self, start: datetime.date, end: datetime.date) -> datetime.timedelta:
+        # business time in [start, end), negative if end is before start
+        return datetime.timedelta(microseconds=self._position(dt=end) - self._position(dt=start))
+
+    def add_business_time_many(self, dts: Iterable[datetime.date], delta: datetime.timedelta) -> List[datetime.datetime]:
+        add_business_time = self.add_business_time
+        return [add_business_time(dt, delta) for dt in dts]
+
+    def business_time_between_many(self, starts: Iterable[datetime.date], ends: Iterable[datetime.date]) -> List[datetime.timedelta]:
+        position = self._position
+        return [datetime.timedelta(microseconds=position(end) - position(start)) for start, end in zip(starts, ends)]
+
+
+_DEFAULT_BUSINESS_HOURS = BusinessHours()
+
+
+def add_business_time(dt: datetime.date, delta: datetime.timedelta, business_hours: Optional[BusinessHours] = None) -> datetime.datetime:
+    # business_hours defaults to 09:00-17:00, Monday-Friday
+    return (business_hours or _DEFAULT_BUSINESS_HOURS).add_business_time(dt=dt, delta=delta)
+
+
+def business_time_between(start: datetime.date, end: datetime.date, business_hours: Optional[BusinessHours] = None) -> datetime.timedelta:
+    return (business_hours or _DEFAULT_BUSINESS_HOURS).business_time_between(start=start, end=end)
+
+
+def add_business_time_many(dts: Iterable[datetime.date], delta: datetime.timedelta, business_hours: Optional[BusinessHours] = None) -> List[datetime.datetime]:
+    return (business_hours or _DEFAULT_BUSINESS_HOURS).add_business_time_many(dts=dts, delta=delta)
+
+
+def business_time_between_many(starts: Iterable[datetime.date], ends: Iterable[datetime.date], business_hours: Optional[BusinessHours] = None) -> List[datetime.timedelta]:
+    return (business_hours or _DEFAULT_BUSINESS_HOURS).business_time_between_many(starts=starts, ends=ends)
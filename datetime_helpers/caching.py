@@ -0,0 +1,162 @@
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from .exceptions import bad_request
+
+DEFAULT_MAXSIZE = 1024
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ShardedCounters:
+    # Counters that threads add to without taking a lock: each thread adds to a shard of its own and totals() sums the
+    # shards, so hot paths shared by many threads do not contend on the counts (with or without the GIL).
+    # Shards of finished threads are folded into the totals when a new thread starts counting.
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, List[int]]] = []
+        self._folded = [0] * size
+
+    def shard(self) -> List[int]:
+        # the counts of the calling thread, only ever written by it
+        try:
+            counts: List[int] = self._local.counts
+        except AttributeError:
+            return self._register()
+        return counts
+
+    def _register(self) -> List[int]:
+        counts = [0] * self.size
+        with self._lock:
+            shards = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    shards.append((thread, shard))
+                else:
+                    self._folded = [folded + count for folded, count in zip(self._folded, shard)]
+            shards.append((threading.current_thread(), counts))
+            self._shards = shards
+            self._local.counts = counts
+        return counts
+
+    def add(self, index: int, amount: int = 1) -> None:
+        self.shard()[index] += amount
+
+    def totals(self) -> List[int]:
+        with self._lock:
+            totals = list(self._folded)
+            for _, counts in self._shards:
+                totals = [total + count for total, count in zip(totals, counts)]
+        return totals
+
+    def reset(self) -> None:
+        # counts added while resetting may be lost
+        with self._lock:
+            self._local = threading.local()
+            self._shards = []
+            self._folded = [0] * self.size
+
+
+class _Entry:
+    __slots__ = ("value", "referenced")
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.referenced = False
+
+
+_HITS = 0
+_MISSES = 1
+_EVICTIONS = 2
+
+
+class LRUCache:
+    # Least recently used cache with hit/miss/eviction counters, safe to share between threads.
+    # Hits take no lock, they only mark the entry as referenced. Inserting into a full cache gives the referenced entries
+    # at the front a second chance at the back before evicting, which approximates LRU order (the CLOCK algorithm).
+    # The value is computed outside of the lock, so two threads missing on the same key may both compute it.
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise bad_request(message="maxsize must be >= 1")
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, _Entry] = {}  # only changed under the lock, in insertion order
+        self._lock = threading.Lock()
+        self._counters = ShardedCounters(size=3)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            entry.referenced = True
+            self._counters.add(index=_HITS)
+            return entry.value
+        self._counters.add(index=_MISSES)
+        value = compute()
+        with self._lock:
+            data = self._data
+            # make room before inserting, so the sweep never evicts the value that was just computed
+            if key not in data and len(data) >= self.maxsize:
+                self._evict()
+            data[key] = _Entry(value=value)
+        return value
+
+    def _evict(self) -> None:
+        data = self._data
+        for _ in range(len(data)):
+            key = next(iter(data))
+            if not data[key].referenced:
+                break
+            entry = data.pop(key)
+            entry.referenced = False
+            data[key] = entry
+        # the oldest unreferenced entry, or the oldest one if hits kept marking them all while going round
+        del data[next(iter(data))]
+        self._counters.add(index=_EVICTIONS)
+
+    def info(self) -> CacheInfo:
+        hits, misses, evictions = self._counters.totals()
+        return CacheInfo(hits=hits, misses=misses, evictions=evictions, maxsize=self.maxsize, currsize=len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._counters.reset()
+
+
+# month-level business-day results (first/nth business day of month), None while caching is disabled
+month_cache: Optional[LRUCache] = None
+
+
+def enable_cache(maxsize: int = DEFAULT_MAXSIZE) -> None:
+    global month_cache  # pylint: disable=global-statement,invalid-name
+    month_cache = LRUCache(maxsize=maxsize)
+
+
+def disable_cache() -> None:
+    global month_cache  # pylint: disable=global-statement,invalid-name
+    month_cache = None
+
+
+def cache_info() -> CacheInfo:
+    if month_cache is None:
+        return CacheInfo(hits=0, misses=0, evictions=0, maxsize=0, currsize=0)
+    return month_cache.info()
+
+
+def cache_clear() -> None:
+    if month_cache is not None:
+        month_cache.clear()
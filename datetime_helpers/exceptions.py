@@ -0,0 +1,11 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http_exceptions.client_exceptions import BadRequestException
+
+
+def bad_request(message: str) -> "BadRequestException":
+    # http_exceptions is only imported once an error is actually raised, it is slow to import
+    from http_exceptions.client_exceptions import BadRequestException  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    return BadRequestException(message=message)
@@ -0,0 +1,79 @@
+import datetime
+import functools
+import operator
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# directive -> (attribute, %-style conversion) for the directives that map directly onto a zero padded integer
+_DIRECTIVES = {
+    "Y": ("year", "%04d"),
+    "m": ("month", "%02d"),
+    "d": ("day", "%02d"),
+    "H": ("hour", "%02d"),
+    "M": ("minute", "%02d"),
+    "S": ("second", "%02d"),
+    "f": ("microsecond", "%06d"),
+}
+_TIME_ATTRIBUTES = frozenset(("hour", "minute", "second", "microsecond"))
+
+COMPILED_FORMAT_CACHE_SIZE = 128
+
+
+def _compile(fmt: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    # translate fmt into a %-style template and the attributes feeding it, None if it needs strftime
+    template: List[str] = []
+    attributes: List[str] = []
+    index = 0
+    while index < len(fmt):
+        char = fmt[index]
+        if char != "%":
+            template.append(char)
+            index += 1
+            continue
+        directive = fmt[index + 1] if index + 1 < len(fmt) else ""
+        if directive == "%":
+            template.append("%%")
+        elif directive in _DIRECTIVES:
+            attribute, conversion = _DIRECTIVES[directive]
+            template.append(conversion)
+            attributes.append(attribute)
+        else:
+            return None
+        index += 2
+    return "".join(template), tuple(attributes)
+
+
+class CompiledFormat:
+    # A strftime format compiled into a %-style template filled straight from the date attributes.
+    # Formats using any directive other than %Y %m %d %H %M %S %f %% always go through strftime.
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self._template: Optional[str] = None
+        self._getter: Callable[[datetime.date], Tuple[int, ...]] = lambda dt: ()
+        self._uses_year = False
+        self._uses_time = False
+        compiled = _compile(fmt=fmt)
+        if compiled is not None:
+            self._template, attributes = compiled
+            # for a single attribute attrgetter returns the bare value, which % accepts just like a 1-tuple
+            if attributes:
+                self._getter = operator.attrgetter(*attributes)
+            self._uses_year = "year" in attributes
+            self._uses_time = not _TIME_ATTRIBUTES.isdisjoint(attributes)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.fmt!r})"
+
+    def format(self, dt: datetime.date) -> str:
+        # strftime does not zero pad years before 1000 on every platform, so leave those to it
+        template = self._template
+        if template is None or (self._uses_year and dt.year < 1000) or (self._uses_time and not isinstance(dt, datetime.datetime)):
+            return dt.strftime(self.fmt)
+        return template % self._getter(dt)
+
+
+@functools.lru_cache(maxsize=COMPILED_FORMAT_CACHE_SIZE)
+def compile_format(fmt: str) -> CompiledFormat:
+    return CompiledFormat(fmt=fmt)
@@ -0,0 +1,171 @@
+# Opt-in call counters and duration histograms for the functions exported from datetime_helpers.
+# enable() swaps each function for a timing wrapper in its module (and in the package namespace), disable() puts the
+# originals back, so there is no overhead at all while disabled. Only lookups made after enable() see the wrappers,
+# e.g. a `from datetime_helpers import is_weekday` done earlier keeps calling the original. Calls the helpers make to
+# each other are counted too, and functions returning lazy results (generators, iterators) are timed until they return.
+import functools
+import importlib
+import inspect
+import itertools
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from .caching import ShardedCounters
+from .exceptions import bad_request
+
+# upper bounds of the duration histogram buckets in seconds, powers of two from 128ns to ~1s, the last bucket (+Inf) is implied.
+# A duration of n nanoseconds goes in the bucket of n.bit_length(), which is much cheaper than a bisect.
+_FIRST_BIT_LENGTH = 7
+_LAST_BIT_LENGTH = 30
+BUCKETS = tuple(2**bit_length / 1e9 for bit_length in range(_FIRST_BIT_LENGTH, _LAST_BIT_LENGTH + 1))
+_BUCKET_OF_BIT_LENGTH = tuple(min(max(bit_length - _FIRST_BIT_LENGTH, 0), len(BUCKETS)) for bit_length in range(65))
+PROMETHEUS_PREFIX = "datetime_helpers"
+
+
+# the counters of a function are the calls that raised, the total duration and the calls per bucket (not cumulative)
+_ERRORS = 0
+_TOTAL_NS = 1
+_FIRST_BUCKET = 2
+_SLOT_OF_BIT_LENGTH = tuple(_FIRST_BUCKET + bucket for bucket in _BUCKET_OF_BIT_LENGTH)
+
+_lock = threading.Lock()  # guards _stats and _originals, the counters are sharded per thread and take no lock
+_stats: Dict[str, ShardedCounters] = {}
+_originals: Dict[str, Tuple[Any, Callable[..., Any]]] = {}  # exported name -> (module, original function)
+
+
+def _record(stats: ShardedCounters, elapsed_ns: int, failed: bool) -> None:
+    counts = stats.shard()
+    counts[_ERRORS] += failed
+    counts[_TOTAL_NS] += elapsed_ns
+    counts[_SLOT_OF_BIT_LENGTH[elapsed_ns.bit_length()]] += 1
+
+
+def _wrap(name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    stats = _stats.setdefault(name, ShardedCounters(size=_FIRST_BUCKET + len(BUCKETS) + 1))
+    perf_counter_ns = time.perf_counter_ns
+    slot_of_bit_length = _SLOT_OF_BIT_LENGTH
+    shard = stats.shard
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                result = await function(*args, **kwargs)
+            except BaseException:
+                _record(stats=stats, elapsed_ns=perf_counter_ns() - start, failed=True)
+                raise
+            _record(stats=stats, elapsed_ns=perf_counter_ns() - start, failed=False)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            _record(stats=stats, elapsed_ns=perf_counter_ns() - start, failed=True)
+            raise
+        # _record inlined, this is the path every successful call takes
+        elapsed_ns = perf_counter_ns() - start
+        counts = shard()
+        counts[_TOTAL_NS] += elapsed_ns
+        counts[slot_of_bit_length[elapsed_ns.bit_length()]] += 1
+        return result
+
+    return wrapper
+
+
+def _exported_functions() -> Dict[str, str]:
+    package = importlib.import_module(__package__)
+    return {name: module_name for name, module_name in package._EXPORTS.items() if inspect.isfunction(getattr(package, name))}  # pylint: disable=protected-access
+
+
+def enable(functions: Optional[Iterable[str]] = None) -> None:
+    # instrument the exported functions, or only the ones named in functions, calling it again adds to the instrumented ones
+    package = importlib.import_module(__package__)
+    exported = _exported_functions()
+    names = list(exported) if functions is None else list(functions)
+    unknown = sorted(set(names) - set(exported))
+    if unknown:
+        raise bad_request(message=f"not exported functions of datetime_helpers: {unknown}")
+    with _lock:
+        for name in names:
+            if name in _originals:
+                continue
+            module = importlib.import_module(f"{__package__}.{exported[name]}")
+            original = getattr(module, name)
+            wrapper = _wrap(name=name, function=original)
+            _originals[name] = (module, original)
+            setattr(module, name, wrapper)
+            setattr(package, name, wrapper)
+
+
+def disable() -> None:
+    # put the original functions back, the collected data is kept until reset()
+    package = importlib.import_module(__package__)
+    with _lock:
+        for name, (module, original) in _originals.items():
+            setattr(module, name, original)
+            setattr(package, name, original)
+        _originals.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def reset() -> None:
+    with _lock:
+        for stats in _stats.values():
+            stats.reset()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    # per called function: calls, errors (calls that raised), total_seconds and the cumulative bucket counts keyed by upper bound
+    with _lock:
+        data = {name: stats.totals() for name, stats in _stats.items()}
+    result = {}
+    for name, counts in sorted(data.items()):
+        errors, total_ns = counts[_ERRORS], counts[_TOTAL_NS]
+        cumulative = list(itertools.accumulate(counts[_FIRST_BUCKET:]))
+        if not cumulative[-1]:
+            continue
+        result[name] = {
+            "calls": cumulative[-1],
+            "errors": errors,
+            "total_seconds": total_ns / 1e9,
+            "buckets": dict(zip(BUCKETS + (float("inf"),), cumulative)),
+        }
+    return result
+
+
+def prometheus_text() -> str:
+    # snapshot() in the Prometheus text exposition format
+    data = snapshot()
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}_calls_total Calls of datetime_helpers functions.",
+        f"# TYPE {PROMETHEUS_PREFIX}_calls_total counter",
+    ]
+    lines.extend(f'{PROMETHEUS_PREFIX}_calls_total{{function="{name}"}} {stats["calls"]}' for name, stats in data.items())
+    lines.append(f"# HELP {PROMETHEUS_PREFIX}_errors_total Calls of datetime_helpers functions that raised.")
+    lines.append(f"# TYPE {PROMETHEUS_PREFIX}_errors_total counter")
+    lines.extend(f'{PROMETHEUS_PREFIX}_errors_total{{function="{name}"}} {stats["errors"]}' for name, stats in data.items())
+    lines.append(f"# HELP {PROMETHEUS_PREFIX}_call_duration_seconds Duration of datetime_helpers function calls.")
+    lines.append(f"# TYPE {PROMETHEUS_PREFIX}_call_duration_seconds histogram")
+    for name, stats in data.items():
+        for bound, count in stats["buckets"].items():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{PROMETHEUS_PREFIX}_call_duration_seconds_bucket{{function="{name}",le="{le}"}} {count}')
+        lines.append(f'{PROMETHEUS_PREFIX}_call_duration_seconds_sum{{function="{name}"}} {stats["total_seconds"]!r}')
+        lines.append(f'{PROMETHEUS_PREFIX}_call_duration_seconds_count{{function="{name}"}} {stats["calls"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,206 @@
+# Parsing values whose format is not known up front, e.g. a column mixing JSON dates, plain dates, epoch millis and
+# Windows FILETIMEs. Cheap structural checks (type, length, digits and separators) route a value straight to the
+# parser it can match, anything they cannot place goes through the formats ordered by how often each has matched.
+import datetime
+import functools
+import threading
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .caching import ShardedCounters
+from .exceptions import bad_request
+from .utils import DATE_FORMAT
+from .utils import JSON_DATE_FORMAT
+from .utils import _get_parser
+from .utils import datetime_from_micros
+from .utils import datetime_from_windows_filetime
+
+# pseudo formats for integers (or strings of digits)
+EPOCH_MILLIS = "epoch_millis"
+WINDOWS_FILETIME = "windows_filetime"
+DEFAULT_FORMATS = (JSON_DATE_FORMAT, DATE_FORMAT, EPOCH_MILLIS, WINDOWS_FILETIME)
+
+# epoch millis of 12-13 digits cover 1973-03-03 to 2286-11-20 and FILETIMEs of 17-18 digits 1601-01-12 to 4769-11-18
+_EPOCH_MILLIS_DIGITS = (12, 13)
+_WINDOWS_FILETIME_DIGITS = (17, 18)
+# what a value that does not match a format makes its parser raise
+_MISMATCH_ERRORS = (ValueError, TypeError, OverflowError)
+
+Value = Union[str, int]
+
+
+def _to_integer(value: Value) -> int:
+    # ints and strings of digits, bools and floats are not numbers in this sense
+    if type(value) is int:  # pylint: disable=unidiomatic-typecheck
+        return value
+    if isinstance(value, str) and value.isdigit() and value.isascii():
+        return int(value)
+    raise ValueError(f"{value!r} is not an integer")
+
+
+def _parse_epoch_millis(value: Value) -> datetime.datetime:
+    return datetime_from_micros(micros=_to_integer(value=value) * 1000)
+
+
+def _parse_windows_filetime(value: Value) -> datetime.datetime:
+    return datetime_from_windows_filetime(windows_filetime=_to_integer(value=value))
+
+
+def _required_characters(fmt: str) -> FrozenSet[str]:
+    # literal characters any text matching fmt contains, strptime skips any run of whitespace for a space
+    characters = set()
+    index = 0
+    while index < len(fmt):
+        if fmt[index] == "%":
+            if fmt.startswith("%%", index):
+                characters.add("%")
+            index += 2
+            continue
+        if not fmt[index].isspace():
+            characters.add(fmt[index])
+        index += 1
+    return frozenset(characters)
+
+
+def _get_value_parser(fmt: str) -> Callable[[Value], datetime.datetime]:
+    if fmt == EPOCH_MILLIS:
+        return _parse_epoch_millis
+    if fmt == WINDOWS_FILETIME:
+        return _parse_windows_filetime
+    return _get_parser(datetime_format=fmt)  # type: ignore[return-value]
+
+
+def _guard(fmt: str, parser: Callable[[Value], datetime.datetime]) -> Callable[[Value], datetime.datetime]:
+    # reject a value missing one of the literals of fmt without calling strptime, which matches them case-insensitively
+    required = tuple((char.lower(), char.upper()) for char in _required_characters(fmt=fmt))
+    if fmt in (EPOCH_MILLIS, WINDOWS_FILETIME) or not required:
+        return parser
+
+    def parse(value: Value) -> datetime.datetime:
+        if isinstance(value, str):
+            for lower, upper in required:
+                if lower not in value and upper not in value:
+                    raise ValueError(f"time data {value!r} does not match format {fmt!r}")
+        return parser(value)
+
+    return parse
+
+
+def _sniff(value: Value) -> Optional[str]:
+    # the format a value is laid out for, None when its structure alone does not tell
+    if isinstance(value, str):
+        length = len(value)
+        if length == 27 and value[4] == "-" and value[10] == "T" and value[26] == "Z":
+            return JSON_DATE_FORMAT
+        if length == 10 and value[4] == "-" and value[7] == "-":
+            return DATE_FORMAT
+        if not value.isdigit():
+            return None
+        digits = length
+    elif type(value) is int:  # pylint: disable=unidiomatic-typecheck
+        digits = len(str(abs(value)))
+    else:
+        return None
+    if digits in _EPOCH_MILLIS_DIGITS:
+        return EPOCH_MILLIS
+    if digits in _WINDOWS_FILETIME_DIGITS:
+        return WINDOWS_FILETIME
+    return None
+
+
+class FormatDetector:
+    # Parses values in any of formats (strptime formats, EPOCH_MILLIS or WINDOWS_FILETIME) into naive UTC datetimes.
+    # A value is first routed by _sniff, otherwise the formats are tried most matched first. As the order adapts,
+    # formats that can parse the same text differently (e.g. %d/%m/%Y and %m/%d/%Y) should not be mixed.
+    def __init__(self, formats: Sequence[str] = DEFAULT_FORMATS) -> None:
+        if not formats:
+            raise bad_request(message="formats must not be empty")
+        self._parsers = {fmt: _get_value_parser(fmt=fmt) for fmt in formats}
+        # a sniffed value has the layout of its format, the others first check the literals of each format
+        self._guarded_parsers = {fmt: _guard(fmt=fmt, parser=parser) for fmt, parser in self._parsers.items()}
+        # replaced rather than mutated so concurrent parses always see a complete order without taking the lock
+        self._order: Tuple[str, ...] = tuple(self._parsers)
+        self._indexes = {fmt: index for index, fmt in enumerate(self._parsers)}
+        self._counters = ShardedCounters(size=len(self._parsers) + 1)  # hits of each format, then the misses
+        self._lock = threading.Lock()  # taken to change the order
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(formats={list(self._order)!r})"
+
+    @property
+    def formats(self) -> List[str]:
+        # the formats in the order they are currently tried
+        return list(self._order)
+
+    @property
+    def hits(self) -> Dict[str, int]:
+        # number of values each format has parsed
+        return dict(zip(self._parsers, self._counters.totals()))
+
+    @property
+    def misses(self) -> int:
+        # number of values no format could parse
+        return self._counters.totals()[-1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._order = tuple(self._parsers)
+            self._counters.reset()
+
+    def _record_hit(self, fmt: str, order: Optional[Tuple[str, ...]] = None, position: int = 0) -> None:
+        counts = self._counters.shard()
+        index = self._indexes[fmt]
+        counts[index] += 1
+        # Move up one place once it has matched more often than the format before it, unless the order has changed since.
+        # The calling thread's counts tell whether that is likely without taking the lock, the totals decide under it.
+        if position and order is self._order and counts[index] > counts[self._indexes[order[position - 1]]]:
+            with self._lock:
+                hits = self.hits
+                if order is self._order and hits[fmt] > hits[order[position - 1]]:
+                    swapped = list(order)
+                    swapped[position - 1], swapped[position] = fmt, order[position - 1]
+                    self._order = tuple(swapped)
+
+    def parse(self, value: Value) -> datetime.datetime:
+        sniffed = _sniff(value=value)
+        if sniffed in self._parsers:
+            try:
+                dt = self._parsers[sniffed](value)
+            except _MISMATCH_ERRORS:
+                pass
+            else:
+                self._record_hit(fmt=sniffed)
+                return dt
+        order = self._order
+        for position, fmt in enumerate(order):
+            if fmt == sniffed:
+                continue
+            try:
+                dt = self._guarded_parsers[fmt](value)
+            except _MISMATCH_ERRORS:
+                continue
+            self._record_hit(fmt=fmt, order=order, position=position)
+            return dt
+        self._counters.add(index=-1)
+        raise ValueError(f"{value!r} does not match any of the formats {list(self._parsers)}")
+
+    def parse_many(self, values: Iterable[Value]) -> List[datetime.datetime]:
+        parse = self.parse
+        return [parse(value) for value in values]
+
+
+@functools.lru_cache(maxsize=32)
+def _get_detector(formats: Tuple[str, ...]) -> FormatDetector:
+    return FormatDetector(formats=formats)
+
+
+def parse_any(value: Value, formats: Sequence[str] = DEFAULT_FORMATS) -> datetime.datetime:
+    # one FormatDetector is shared per formats, use your own to read its hit counters
+    return _get_detector(formats=tuple(formats)).parse(value=value)
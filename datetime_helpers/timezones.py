@@ -0,0 +1,80 @@
+# Timezone-aware epoch conversions built on zoneinfo (backports.zoneinfo before Python 3.9, which is not a dependency of
+# the base package: without it only UTC and tzinfo objects can be used).
+# Naive inputs are interpreted in an explicit default zone (UTC unless told otherwise) instead of being silently assumed UTC.
+# ZoneInfo keeps the UTC-offset transition table of its zone in C, so zones are resolved once per name and reused
+# rather than rebuilding or re-querying those tables, and the batch variants resolve them once per batch.
+import datetime
+import functools
+from typing import Iterable
+from typing import List
+from typing import Union
+
+from .exceptions import bad_request
+
+UTC = datetime.timezone.utc
+EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=UTC)
+
+Zone = Union[str, datetime.tzinfo]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_zone_by_name(name: str) -> datetime.tzinfo:
+    if name == "UTC":
+        return UTC
+    try:
+        import zoneinfo  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        try:
+            from backports import zoneinfo  # type: ignore[no-redef] # pylint: disable=import-outside-toplevel
+        except ImportError as exception:
+            raise ImportError("zone names require zoneinfo, on Python < 3.9 install it with `pip install backports.zoneinfo`") from exception
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (ValueError, zoneinfo.ZoneInfoNotFoundError) as exception:
+        raise bad_request(message=f"unknown timezone {name!r}: {exception}") from None
+
+
+def get_zone(zone: Zone) -> datetime.tzinfo:
+    if isinstance(zone, datetime.tzinfo):
+        return zone
+    return _get_zone_by_name(zone)
+
+
+def _as_aware(dt: datetime.date, default_zone: datetime.tzinfo) -> datetime.datetime:
+    if not isinstance(dt, datetime.datetime):
+        dt = datetime.datetime.combine(dt, datetime.time.min)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=default_zone)
+    return dt
+
+
+def to_epoch(dt: datetime.date, default_zone: Zone = UTC) -> float:
+    # seconds since the epoch, naive datetimes and dates are interpreted in default_zone
+    return (_as_aware(dt=dt, default_zone=get_zone(zone=default_zone)) - EPOCH_UTC).total_seconds()
+
+
+def from_epoch(seconds: float, zone: Zone = UTC) -> datetime.datetime:
+    # aware datetime in zone for seconds since the epoch
+    return datetime.datetime.fromtimestamp(seconds, tz=get_zone(zone=zone))
+
+
+def convert_zone(dt: datetime.date, zone: Zone, default_zone: Zone = UTC) -> datetime.datetime:
+    # the same instant as an aware datetime in zone, naive datetimes and dates are interpreted in default_zone
+    return _as_aware(dt=dt, default_zone=get_zone(zone=default_zone)).astimezone(get_zone(zone=zone))
+
+
+def to_epoch_many(dts: Iterable[datetime.date], default_zone: Zone = UTC) -> List[float]:
+    tzinfo = get_zone(zone=default_zone)
+    return [(_as_aware(dt=dt, default_zone=tzinfo) - EPOCH_UTC).total_seconds() for dt in dts]
+
+
+def from_epoch_many(seconds: Iterable[float], zone: Zone = UTC) -> List[datetime.datetime]:
+    tzinfo = get_zone(zone=zone)
+    fromtimestamp = datetime.datetime.fromtimestamp
+    return [fromtimestamp(value, tz=tzinfo) for value in seconds]
+
+
+def convert_zone_many(dts: Iterable[datetime.date], zone: Zone, default_zone: Zone = UTC) -> List[datetime.datetime]:
+    tzinfo = get_zone(zone=zone)
+    default_tzinfo = get_zone(zone=default_zone)
+    return [_as_aware(dt=dt, default_zone=default_tzinfo).astimezone(tzinfo) for dt in dts]
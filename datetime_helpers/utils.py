@@ -1,12 +1,36 @@
-import calendar
 import datetime
+import operator
+from array import array
+from enum import IntEnum
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
 from typing import cast
 
-from http_exceptions.client_exceptions import BadRequestException
+from . import caching
+from .exceptions import bad_request
+from .formatting import compile_format
+
+if TYPE_CHECKING:
+    from .business_calendar import BusinessCalendar
 
 JSON_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
-EPOCH = datetime.datetime.utcfromtimestamp(0)  # 00:00:00 UTC on 1 January 1970
+DATE_FORMAT = "%Y-%m-%d"
+EPOCH = datetime.datetime(1970, 1, 1)  # 00:00:00 UTC on 1 January 1970
+_EPOCH_UTC = EPOCH.replace(tzinfo=datetime.timezone.utc)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+WINDOWS_EPOCH = datetime.datetime(1601, 1, 1)  # windows FILETIME counts 100ns ticks from here
+_WINDOWS_EPOCH_MICROS = -11_644_473_600_000_000  # WINDOWS_EPOCH in microseconds since EPOCH
+
+DateT = TypeVar("DateT", bound=datetime.date)
 
 
 class DayOfWeek:
@@ -19,116 +43,507 @@ class DayOfWeek:
     SUNDAY = "Sunday"
 
 
+class Weekday(IntEnum):
+    # integer counterpart of DayOfWeek, numbered like datetime.date.weekday()
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+
+class DateError(IntEnum):
+    # why validate_dates rejected a row
+    VALID = 0
+    INVALID_TYPE = 1
+    YEAR_OUT_OF_RANGE = 2
+    MONTH_OUT_OF_RANGE = 3
+    DAY_OUT_OF_RANGE = 4
+
+
+class DateValidation(NamedTuple):
+    ordinals: "array[int]"  # proleptic ordinal of every row, 0 where the row is invalid
+    errors: bytearray  # bit i (errors[i >> 3] & 1 << (i & 7)) is set when row i is invalid
+    reasons: "array[int]"  # DateError of every row
+
+    def dates(self) -> List[Optional[datetime.date]]:
+        fromordinal = datetime.date.fromordinal
+        return [fromordinal(ordinal) if ordinal else None for ordinal in self.ordinals]
+
+    def invalid_rows(self) -> List[int]:
+        return [row for row, reason in enumerate(self.reasons) if reason]
+
+
+# lookup tables indexed by datetime.date.weekday(), the names are English whatever the process locale
+_DAY_NAMES = (DayOfWeek.MONDAY, DayOfWeek.TUESDAY, DayOfWeek.WEDNESDAY, DayOfWeek.THURSDAY, DayOfWeek.FRIDAY, DayOfWeek.SATURDAY, DayOfWeek.SUNDAY)
+_WEEKDAYS = tuple(Weekday)
+_IS_WEEKEND = (False, False, False, False, False, True, True)
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# years covered by the month table unless set_month_table_range() changes them
+MONTH_TABLE_START_YEAR = 1900
+MONTH_TABLE_END_YEAR = 2199
+
+
 def create_date(year: int, month: int, day: int) -> datetime.date:
     try:
         return datetime.date(year=year, month=month, day=day)
     except (ValueError, TypeError) as exception:
-        raise BadRequestException(message=str(exception)) from None
+        raise bad_request(message=str(exception)) from None
 
 
 def create_datetime(year: int, month: int, day: int, hour: Optional[int] = None, minute: Optional[int] = None, second: Optional[int] = None, microsecond: Optional[int] = None) -> datetime.datetime:
     try:
         return datetime.datetime(year=year, month=month, day=day, hour=hour or 0, minute=minute or 0, second=second or 0, microsecond=microsecond or 0)
     except (ValueError, TypeError) as exception:
-        raise BadRequestException(message=str(exception)) from None
+        raise bad_request(message=str(exception)) from None
+
+
+def _date_error(year: int, month: int, day: int) -> DateError:
+    # the DateError create_date would fail with, checked with plain comparisons so a bad row costs no exception
+    if type(year) is not int or type(month) is not int or type(day) is not int:  # pylint: disable=unidiomatic-typecheck
+        try:
+            year, month, day = operator.index(year), operator.index(month), operator.index(day)
+        except TypeError:
+            return DateError.INVALID_TYPE
+    if not 1 <= year <= 9999:
+        return DateError.YEAR_OUT_OF_RANGE
+    if not 1 <= month <= 12:
+        return DateError.MONTH_OUT_OF_RANGE
+    if day < 1 or day > 28 and day > _month_length(year=year, month=month):
+        return DateError.DAY_OUT_OF_RANGE
+    return DateError.VALID
+
+
+def try_create_date(year: int, month: int, day: int) -> Optional[datetime.date]:
+    # create_date returning None rather than raising for an invalid date
+    if _date_error(year=year, month=month, day=day):
+        return None
+    return datetime.date(year, month, day)
+
+
+def try_create_datetime(
+    year: int, month: int, day: int, hour: Optional[int] = None, minute: Optional[int] = None, second: Optional[int] = None, microsecond: Optional[int] = None
+) -> Optional[datetime.datetime]:
+    # create_datetime returning None rather than raising for an invalid datetime
+    if _date_error(year=year, month=month, day=day):
+        return None
+    time_fields: Tuple[int, ...] = (hour or 0, minute or 0, second or 0, microsecond or 0)
+    if any(type(field) is not int for field in time_fields):  # pylint: disable=unidiomatic-typecheck
+        try:
+            time_fields = tuple(operator.index(field) for field in time_fields)
+        except TypeError:
+            return None
+    hour, minute, second, microsecond = time_fields
+    if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59 and 0 <= microsecond <= 999999):
+        return None
+    return datetime.datetime(year, month, day, hour, minute, second, microsecond)
+
+
+def validate_dates(rows: Iterable[Sequence[int]]) -> DateValidation:
+    # validate (year, month, day) rows in bulk without raising, see DateValidation for the result
+    ordinals = array("i")
+    reasons = array("B")
+    errors = bytearray()
+    date = datetime.date
+    for row, fields in enumerate(rows):
+        if row & 7 == 0:
+            errors.append(0)
+        try:
+            year, month, day = fields
+        except (TypeError, ValueError):
+            reason = DateError.INVALID_TYPE
+        else:
+            reason = _date_error(year=year, month=month, day=day)
+        if reason:
+            ordinals.append(0)
+            errors[row >> 3] |= 1 << (row & 7)
+        else:
+            ordinals.append(date(year, month, day).toordinal())
+        reasons.append(reason)
+    return DateValidation(ordinals=ordinals, errors=errors, reasons=reasons)
+
+
+def _month_length(year: int, month: int) -> int:
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+class _MonthTable(NamedTuple):
+    # month i of the range, i == (year - start_year) * 12 + month - 1, starts on the proleptic ordinal first_ordinals[i]
+    start_year: int
+    end_year: int
+    first_ordinals: "array[int]"
+    first_weekdays: "array[int]"
+    lengths: "array[int]"
+
+
+def _build_month_table(start_year: int, end_year: int) -> _MonthTable:
+    first_ordinals = array("i")
+    first_weekdays = array("B")
+    lengths = array("B")
+    ordinal = create_date(year=start_year, month=1, day=1).toordinal()
+    for year in range(start_year, end_year + 1):
+        for month in range(1, 13):
+            length = _month_length(year=year, month=month)
+            first_ordinals.append(ordinal)
+            first_weekdays.append((ordinal - 1) % 7)  # ordinal 1 (0001-01-01) is a Monday
+            lengths.append(length)
+            ordinal += length
+    return _MonthTable(start_year=start_year, end_year=end_year, first_ordinals=first_ordinals, first_weekdays=first_weekdays, lengths=lengths)
+
+
+# never mutated, set_month_table_range() swaps in a new table and readers take it once per call, so threads need no lock
+_month_table = _build_month_table(start_year=MONTH_TABLE_START_YEAR, end_year=MONTH_TABLE_END_YEAR)
+
+
+def set_month_table_range(start_year: int, end_year: int) -> None:
+    # months outside of the range still work, they are just computed on every call
+    global _month_table  # pylint: disable=global-statement,invalid-name
+    if start_year > end_year:
+        raise bad_request(message="start_year must be <= end_year")
+    create_date(year=end_year, month=12, day=31)
+    _month_table = _build_month_table(start_year=start_year, end_year=end_year)
+
+
+def _month_info(year: int, month: int) -> Tuple[int, int, int]:
+    # (ordinal of the 1st, weekday of the 1st, number of days) of a month, raises for an invalid year or month
+    start_year, _, first_ordinals, first_weekdays, lengths = _month_table  # unpacked, attribute access is slower
+    index = (year - start_year) * 12 + month - 1
+    if 0 < month < 13 and 0 <= index < len(lengths):
+        return first_ordinals[index], first_weekdays[index], lengths[index]
+    ordinal = create_date(year=year, month=month, day=1).toordinal()
+    return ordinal, (ordinal - 1) % 7, _month_length(year=year, month=month)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    return _month_info(year=year, month=month)[2]
 
 
 def get_day_of_week(dt: datetime.date) -> str:
-    day_of_week_int = dt.weekday()
-    return calendar.day_name[day_of_week_int]
+    return _DAY_NAMES[dt.weekday()]
+
+
+def get_weekday(dt: datetime.date) -> Weekday:
+    return _WEEKDAYS[dt.weekday()]
 
 
 def is_weekend(dt: datetime.date) -> bool:
-    return get_day_of_week(dt=dt) in [DayOfWeek.SATURDAY, DayOfWeek.SUNDAY]
+    return _IS_WEEKEND[dt.weekday()]
 
 
 def is_weekday(dt: datetime.date) -> bool:
-    return not is_weekend(dt=dt)
+    return not _IS_WEEKEND[dt.weekday()]
+
+
+def _business_days_before(ordinal: int) -> int:
+    # number of Monday-Friday days with a proleptic ordinal < ordinal (ordinal 1 is a Monday)
+    weeks, remainder = divmod(ordinal - 1, 7)
+    return weeks * 5 + min(remainder, 5)
+
+
+def _add_business_days_to_ordinal(ordinal: int, n: int) -> int:  # pylint: disable=invalid-name
+    # add_business_days on a proleptic ordinal, through the index of the target among all Monday-Friday days
+    if n == 0:
+        return ordinal
+    position = _business_days_before(ordinal + 1) + n - 1 if n > 0 else _business_days_before(ordinal) + n
+    return _business_ordinal(position=position)
+
+
+def _business_ordinal(position: int) -> int:
+    # proleptic ordinal of the Monday-Friday day with position Monday-Friday days before it, the inverse of _business_days_before
+    weeks, remainder = divmod(position, 5)
+    return weeks * 7 + remainder + 1
+
+
+def add_business_days(dt: DateT, n: int, calendar: Optional["BusinessCalendar"] = None) -> DateT:  # pylint: disable=invalid-name
+    # n > 0 steps forward, n < 0 steps backward, n == 0 returns dt unchanged
+    if calendar is not None:
+        return calendar.add_business_days(dt=dt, n=n)
+    if n == 0:
+        return dt
+    weekday = dt.weekday()
+    if n > 0:
+        if _IS_WEEKEND[weekday]:
+            # stepping forward from a weekend is the same as stepping forward from the friday before it
+            dt = dt - datetime.timedelta(days=weekday - Weekday.FRIDAY)
+            weekday = Weekday.FRIDAY
+        weeks, remainder = divmod(n, 5)
+        days = weeks * 7 + remainder
+        if weekday + remainder > Weekday.FRIDAY:
+            days += 2
+        return dt + datetime.timedelta(days=days)
+    if _IS_WEEKEND[weekday]:
+        # stepping backward from a weekend is the same as stepping backward from the monday after it
+        dt = dt + datetime.timedelta(days=7 - weekday)
+        weekday = Weekday.MONDAY
+    weeks, remainder = divmod(-n, 5)
+    days = weeks * 7 + remainder
+    if weekday - remainder < Weekday.MONDAY:
+        days += 2
+    return dt - datetime.timedelta(days=days)
+
+
+def business_days_between(start: datetime.date, end: datetime.date, calendar: Optional["BusinessCalendar"] = None) -> int:
+    # number of business days in [start, end), negative if end is before start
+    if calendar is not None:
+        return calendar.business_days_between(start=start, end=end)
+    return _business_days_before(end.toordinal()) - _business_days_before(start.toordinal())
+
+
+def nth_business_day_of_month(year: int, month: int, n: int, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:  # pylint: disable=invalid-name
+    month_cache = caching.month_cache
+    if month_cache is not None:
+        return cast(datetime.date, month_cache.get_or_compute(key=(year, month, n, calendar), compute=lambda: _nth_business_day_of_month(year=year, month=month, n=n, calendar=calendar)))
+    return _nth_business_day_of_month(year=year, month=month, n=n, calendar=calendar)
+
+
+def _nth_business_day_of_month(year: int, month: int, n: int, calendar: Optional["BusinessCalendar"]) -> datetime.date:  # pylint: disable=invalid-name
+    if calendar is not None:
+        return calendar.nth_business_day_of_month(year=year, month=month, n=n)
+    first_ordinal, weekday, length = _month_info(year=year, month=month)
+    day = 0  # of the month, counted from 0
+    if _IS_WEEKEND[weekday]:
+        day = 7 - weekday
+        weekday = Weekday.MONDAY
+    # every 5 business days on from a weekday skip a weekend
+    day += n - 1 + 2 * ((weekday + n - 1) // 5)
+    if not 0 <= day < length:
+        raise bad_request(message="n > # of business days in month")
+    return datetime.date.fromordinal(first_ordinal + day)
+
+
+def last_business_day_of_month(year: int, month: int, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:
+    if calendar is not None:
+        return calendar.last_business_day_of_month(year=year, month=month)
+    first_ordinal, weekday, length = _month_info(year=year, month=month)
+    last_weekday = (weekday + length - 1) % 7
+    # a month ending on a weekend ends on a saturday or a sunday after its last friday
+    return datetime.date.fromordinal(first_ordinal + length - 1 - max(last_weekday - Weekday.FRIDAY, 0))
+
+
+def iter_business_days(start: datetime.date, end: datetime.date, calendar: Optional["BusinessCalendar"] = None) -> Iterator[datetime.date]:
+    # business days in [start, end) in order, each date is only built when the generator reaches it
+    if calendar is not None:
+        return calendar.iter_business_days(start=start, end=end)
+    return _iter_business_days(start_ordinal=start.toordinal(), end_ordinal=end.toordinal())
+
+
+def _iter_business_days(start_ordinal: int, end_ordinal: int) -> Iterator[datetime.date]:
+    fromordinal = datetime.date.fromordinal
+    ordinal = start_ordinal
+    weekday = (ordinal - 1) % 7  # ordinal 1 (0001-01-01) is a Monday
+    if _IS_WEEKEND[weekday]:
+        ordinal += 7 - weekday
+        weekday = Weekday.MONDAY
+    while ordinal < end_ordinal:
+        yield fromordinal(ordinal)
+        if weekday == Weekday.FRIDAY:
+            ordinal += 3
+            weekday = Weekday.MONDAY
+        else:
+            ordinal += 1
+            weekday += 1
+
+
+# days of the month that are business days, by the weekday of the 1st and the length - 28 of the month
+_BUSINESS_DAYS_IN_MONTH = tuple(tuple(array("H", [day for day in range(1, length + 1) if not _IS_WEEKEND[(weekday + day - 1) % 7]]) for length in range(28, 32)) for weekday in range(7))
+
+
+def business_days_in_month(year: int, month: int, calendar: Optional["BusinessCalendar"] = None) -> "array[int]":
+    # days of the month (1-31) that are business days, e.g. array('H', [1, 2, 3, 4, 5, 8, ...])
+    if calendar is not None:
+        return calendar.business_days_in_month(year=year, month=month)
+    _, weekday, length = _month_info(year=year, month=month)
+    # copied so callers are free to modify the array
+    return array("H", _BUSINESS_DAYS_IN_MONTH[weekday][length - 28])
+
+
+def month_business_day_table(year: int, calendar: Optional["BusinessCalendar"] = None) -> List["array[int]"]:
+    # business_days_in_month for every month of the year, table[0] is January
+    return [business_days_in_month(year=year, month=month, calendar=calendar) for month in range(1, 13)]
+
+
+def get_previous_business_day(dt: Optional[datetime.date] = None, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:
+    dt = dt or datetime.date.today()
+    return add_business_days(dt=dt, n=-1, calendar=calendar)
+
+
+def get_next_business_day(dt: Optional[datetime.date] = None, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:
+    dt = dt or datetime.date.today()
+    return add_business_days(dt=dt, n=1, calendar=calendar)
+
+
+def get_first_business_day_of_month(dt: Optional[datetime.date] = None, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:
+    dt = dt or datetime.date.today()
+    return nth_business_day_of_month(year=dt.year, month=dt.month, n=1, calendar=calendar)
 
 
-def get_previous_business_day(dt: Optional[datetime.date] = None) -> datetime.date:
+def get_nth_business_day_of_month(n: int, dt: Optional[datetime.date] = None, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:  # pylint: disable=invalid-name
     dt = dt or datetime.date.today()
-    if get_day_of_week(dt=dt) == DayOfWeek.SUNDAY:
-        previous_business_day_of_month = dt - datetime.timedelta(days=2)
-    elif get_day_of_week(dt=dt) == DayOfWeek.MONDAY:
-        previous_business_day_of_month = dt - datetime.timedelta(days=3)
-    else:
-        previous_business_day_of_month = dt - datetime.timedelta(days=1)
-    return previous_business_day_of_month
+    # n < 1 has always resolved to the first business day of the month
+    return nth_business_day_of_month(year=dt.year, month=dt.month, n=max(n, 1), calendar=calendar)
 
 
-def get_next_business_day(dt: Optional[datetime.date] = None) -> datetime.date:
+def get_last_business_day_of_month(dt: Optional[datetime.date] = None, calendar: Optional["BusinessCalendar"] = None) -> datetime.date:
     dt = dt or datetime.date.today()
-    if get_day_of_week(dt=dt) == DayOfWeek.FRIDAY:
-        next_business_day_of_month = dt + datetime.timedelta(days=3)
-    elif get_day_of_week(dt=dt) == DayOfWeek.SATURDAY:
-        next_business_day_of_month = dt + datetime.timedelta(days=2)
-    else:
-        next_business_day_of_month = dt + datetime.timedelta(days=1)
-    return next_business_day_of_month
+    return last_business_day_of_month(year=dt.year, month=dt.month, calendar=calendar)
 
 
-def get_first_business_day_of_month(dt: Optional[datetime.date] = None) -> datetime.date:
+def month_start(dt: Optional[datetime.date] = None) -> datetime.date:
     dt = dt or datetime.date.today()
-    first_day_of_month = datetime.date(dt.year, dt.month, 1)
-    if is_weekday(dt=first_day_of_month):
-        first_business_day_of_month = first_day_of_month
-    else:
-        first_business_day_of_month = get_next_business_day(dt=first_day_of_month)
-    return first_business_day_of_month
+    return datetime.date(dt.year, dt.month, 1)
 
 
-def get_nth_business_day_of_month(n: int, dt: Optional[datetime.date] = None) -> datetime.date:  # pylint: disable=invalid-name
+def month_end(dt: Optional[datetime.date] = None) -> datetime.date:
     dt = dt or datetime.date.today()
-    nth_business_day_of_month = get_first_business_day_of_month(dt=dt)
-    for _ in range(n - 1):
-        nth_business_day_of_month = get_next_business_day(dt=nth_business_day_of_month)
-    if nth_business_day_of_month.month != dt.month:
-        raise BadRequestException(message="n > # of business days in month")
-    return nth_business_day_of_month
+    return datetime.date(dt.year, dt.month, _month_info(year=dt.year, month=dt.month)[2])
+
+
+def quarter_start(dt: Optional[datetime.date] = None) -> datetime.date:
+    dt = dt or datetime.date.today()
+    return datetime.date(dt.year, dt.month - (dt.month - 1) % 3, 1)
+
+
+def quarter_end(dt: Optional[datetime.date] = None) -> datetime.date:
+    dt = dt or datetime.date.today()
+    month = dt.month + 2 - (dt.month - 1) % 3
+    return datetime.date(dt.year, month, _month_info(year=dt.year, month=month)[2])
+
+
+def add_months(dt: DateT, n: int, end_of_month: bool = False) -> DateT:  # pylint: disable=invalid-name
+    # The day is clamped to the length of the target month (2017-01-31 + 1 month is 2017-02-28), with end_of_month=True
+    # the last day of a month also rolls to the last day of the target month (2017-02-28 + 1 month is 2017-03-31).
+    # datetimes keep their time and tzinfo, n < 0 steps backward.
+    year, month = divmod(dt.year * 12 + dt.month - 1 + n, 12)
+    month += 1
+    length = _month_info(year=year, month=month)[2]
+    day = dt.day
+    if day > length or end_of_month and day >= 28 and day == _month_info(year=dt.year, month=dt.month)[2]:
+        day = length
+    return dt.replace(year=year, month=month, day=day)
 
 
 def datetime_to_string(dt: datetime.datetime, datetime_format: str = JSON_DATE_FORMAT) -> str:
-    return dt.strftime(datetime_format)
+    return compile_format(datetime_format).format(dt)
 
 
-def date_to_string(dt: datetime.date, date_format: str = "%Y-%m-%d") -> str:
-    return dt.strftime(date_format)
+def date_to_string(dt: datetime.date, date_format: str = DATE_FORMAT) -> str:
+    return compile_format(date_format).format(dt)
+
+
+def _parse_json_datetime(text: str) -> Optional[datetime.datetime]:
+    # e.g. 2016-04-17T03:12:34.567891Z, fromisoformat only sees input laid out exactly as JSON_DATE_FORMAT. It takes ASCII
+    # digits only in the other fields, but would read a fraction like 567+08 as a UTC offset where strptime raises, and
+    # hour 24 as the next day on newer Pythons
+    if not isinstance(text, str) or len(text) != 27 or text[4] != "-" or text[7] != "-" or text[10] != "T" or text[13] != ":" or text[16] != ":" or text[19] != "." or text[26] != "Z":
+        return None
+    if not text.isascii() or not text[20:26].isdigit() or text[11:13] >= "24":
+        return None
+    try:
+        return datetime.datetime.fromisoformat(text[:26])
+    except ValueError:
+        return None
+
+
+def _parse_date(text: str) -> Optional[datetime.datetime]:
+    # e.g. 2016-04-17, fromisoformat only sees input laid out exactly as DATE_FORMAT
+    if not isinstance(text, str) or len(text) != 10 or text[4] != "-" or text[7] != "-" or not text.isascii():
+        return None
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+# fast parsers for the default formats, they return None whenever strptime has to decide (including every error)
+_FAST_PARSERS: Dict[str, Callable[[str], Optional[datetime.datetime]]] = {
+    JSON_DATE_FORMAT: _parse_json_datetime,
+    DATE_FORMAT: _parse_date,
+}
 
 
 def datetime_from_string(text: str, datetime_format: str = JSON_DATE_FORMAT) -> datetime.datetime:
+    fast_parser = _FAST_PARSERS.get(datetime_format)
+    if fast_parser is not None:
+        dt = fast_parser(text)
+        if dt is not None:
+            return dt
     return datetime.datetime.strptime(text, datetime_format)
 
 
-def date_from_string(text: str, date_format: str = "%Y-%m-%d") -> datetime.date:
+def _get_parser(datetime_format: str) -> Callable[[str], datetime.datetime]:
+    # datetime_from_string with the format resolved up front, for converting many values with the same format
+    fast_parser = _FAST_PARSERS.get(datetime_format)
+    strptime = datetime.datetime.strptime
+    if fast_parser is None:
+        return lambda text: strptime(text, datetime_format)
+    return lambda text: fast_parser(text) or strptime(text, datetime_format)
+
+
+def date_from_string(text: str, date_format: str = DATE_FORMAT) -> datetime.date:
     return datetime_from_string(text=text, datetime_format=date_format).date()
 
 
 def datetime_from_windows_filetime(windows_filetime: int) -> datetime.datetime:
-    windows_epoch = datetime.datetime(1601, 1, 1)
-    return windows_epoch + datetime.timedelta(microseconds=windows_filetime / 10)
+    # round the 100ns ticks to the nearest microsecond (half to even) without going through a float
+    micros, remainder = divmod(windows_filetime, 10)
+    if remainder > 5 or (remainder == 5 and micros % 2):
+        micros += 1
+    return WINDOWS_EPOCH + datetime.timedelta(0, 0, micros)
+
+
+def datetime_to_windows_filetime(dt: datetime.date) -> int:
+    return (datetime_to_micros(dt=dt) - _WINDOWS_EPOCH_MICROS) * 10
 
 
 def datetime_to_seconds(dt: datetime.date) -> float:
     if type(dt) == datetime.date:  # pylint: disable=unidiomatic-typecheck
         dt = datetime_from_date(dt=dt)
-    epoch = datetime.datetime.utcfromtimestamp(0)
+    # naive datetimes are treated as UTC, see datetime_helpers.timezones for other zones
+    epoch = EPOCH if cast(datetime.datetime, dt).tzinfo is None else _EPOCH_UTC
     delta = cast(datetime.timedelta, dt - epoch)
     return delta.total_seconds()
 
 
 def datetime_from_seconds(seconds: float) -> datetime.datetime:
-    return datetime.datetime.utcfromtimestamp(seconds)
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc).replace(tzinfo=None)
 
 
 def datetime_to_millis(dt: datetime.date) -> int:
-    return int(datetime_to_seconds(dt=dt) * 1000.0)
+    micros = datetime_to_micros(dt=dt)
+    # truncate towards zero, as int() of the float seconds always has
+    return micros // 1000 if micros >= 0 else -(-micros // 1000)
 
 
 def datetime_from_millis(millis: float) -> datetime.datetime:
     return datetime_from_seconds(seconds=millis / 1000.0)
 
 
+def datetime_to_micros(dt: datetime.date) -> int:
+    # exact integer microseconds since the epoch, naive datetimes are treated as UTC
+    if type(dt) is datetime.date:  # pylint: disable=unidiomatic-typecheck
+        return (dt.toordinal() - _EPOCH_ORDINAL) * 86_400_000_000
+    epoch = EPOCH if cast(datetime.datetime, dt).tzinfo is None else _EPOCH_UTC
+    delta = cast(datetime.timedelta, dt - epoch)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def datetime_from_micros(micros: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(0, 0, micros)
+
+
+def datetime_to_nanos(dt: datetime.date) -> int:
+    return datetime_to_micros(dt=dt) * 1_000
+
+
+def datetime_from_nanos(nanos: int) -> datetime.datetime:
+    # datetimes only hold microseconds, anything finer is floored away
+    return EPOCH + datetime.timedelta(0, 0, nanos // 1_000)
+
+
 def datetime_from_date(dt: datetime.date) -> datetime.datetime:
     if isinstance(dt, datetime.datetime):
         return dt
@@ -0,0 +1,60 @@
+# Column-at-a-time counterparts of the epoch conversions in utils, e.g. datetime_to_millis -> datetimes_to_millis.
+# Naive values are treated as UTC, as in utils. Requires numpy, which is not a dependency of the base package.
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError as exception:  # pragma: no cover
+    raise ImportError("datetime_helpers.vectorized requires numpy, install it with `pip install numpy`") from exception
+
+MICROS_PER_SECOND = 1_000_000
+MICROS_PER_MILLI = 1_000
+
+
+def _to_micros(dts: Any) -> "np.ndarray[Any, np.dtype[np.int64]]":
+    # accepts datetime64 arrays of any unit as well as sequences of date/datetime objects
+    return np.asarray(dts, dtype="datetime64[us]").view(np.int64)
+
+
+def _from_micros(micros: "np.ndarray[Any, np.dtype[np.int64]]") -> "np.ndarray[Any, np.dtype[np.datetime64]]":
+    return micros.astype(np.int64, copy=False).view("datetime64[us]")
+
+
+def datetimes_to_seconds(dts: Any) -> "np.ndarray[Any, np.dtype[np.float64]]":
+    # matches timedelta.total_seconds(): one division is correctly rounded while the microseconds are exact as a float64
+    # (up to 2**53, about 285 years from the epoch), beyond that add the fraction to the whole seconds instead
+    micros = _to_micros(dts=dts)
+    seconds, remainder = np.divmod(micros, MICROS_PER_SECOND)
+    return np.where(np.abs(micros) <= 2**53, micros / MICROS_PER_SECOND, seconds + remainder / MICROS_PER_SECOND)
+
+
+def datetimes_to_millis(dts: Any) -> "np.ndarray[Any, np.dtype[np.int64]]":
+    micros = _to_micros(dts=dts)
+    millis = micros // MICROS_PER_MILLI
+    # truncate towards zero like int() in datetime_to_millis rather than flooring
+    millis += (micros < 0) & (micros % MICROS_PER_MILLI != 0)
+    return millis
+
+
+def _float_seconds_to_micros(seconds: "np.ndarray[Any, np.dtype[np.float64]]") -> "np.ndarray[Any, np.dtype[np.int64]]":
+    # as datetime.fromtimestamp: split off the whole seconds and round the fraction's microseconds half to even, rounding
+    # seconds * 1e6 instead would round an already rounded product
+    fraction, whole = np.modf(seconds)
+    micros: "np.ndarray[Any, np.dtype[np.int64]]" = whole.astype(np.int64) * MICROS_PER_SECOND + np.round(fraction * MICROS_PER_SECOND).astype(np.int64)
+    return micros
+
+
+def datetimes_from_seconds(seconds: Any) -> "np.ndarray[Any, np.dtype[np.datetime64]]":
+    seconds = np.asarray(seconds)
+    if seconds.dtype.kind in "iu":
+        return _from_micros(micros=seconds.astype(np.int64) * MICROS_PER_SECOND)
+    return _from_micros(micros=_float_seconds_to_micros(seconds=seconds.astype(np.float64)))
+
+
+def datetimes_from_millis(millis: Any) -> "np.ndarray[Any, np.dtype[np.datetime64]]":
+    # integers are converted exactly, datetime_from_millis divides them into float seconds first and so loses
+    # microseconds far from the epoch (beyond about 2**53 microseconds)
+    millis = np.asarray(millis)
+    if millis.dtype.kind in "iu":
+        return _from_micros(micros=millis.astype(np.int64) * MICROS_PER_MILLI)
+    return _from_micros(micros=_float_seconds_to_micros(seconds=millis.astype(np.float64) / 1000.0))
@@ -0,0 +1,121 @@
+# pylint: disable=no-self-use
+import datetime
+import sys
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+DATES = [datetime.date(2021, 1, 25) + datetime.timedelta(days=i) for i in range(21)] + [datetime.date(1, 1, 1), datetime.date(1969, 12, 31), datetime.date(9999, 12, 30)]
+DATETIMES = [
+    datetime.datetime(1, 1, 1),
+    datetime.datetime(1969, 12, 31, 23, 59, 59, 999500),
+    datetime.datetime(1970, 1, 1),
+    datetime.datetime(2021, 2, 5, 13, 30),
+    datetime.datetime(2021, 2, 6, 0, 0, 0, 1),
+    datetime.datetime(9999, 12, 30, 23, 59, 59, 999999),
+]
+
+
+class ArraysTestCase:
+    pass
+
+
+class TestDateArray(ArraysTestCase):
+    # check the sequence behaviour
+    def test_sequence(self) -> None:
+        date_array = datetime_helpers.DateArray(DATES)
+        assert len(date_array) == len(DATES)
+        assert list(date_array) == DATES
+        assert date_array[3] == DATES[3]
+        assert date_array[-1] == DATES[-1]
+        assert isinstance(date_array[2:8:2], datetime_helpers.DateArray)
+        assert list(date_array[2:8:2]) == DATES[2:8:2]
+        assert date_array == datetime_helpers.DateArray(DATES)
+        assert date_array != datetime_helpers.DateArray(DATES[1:])
+        assert date_array != DATES
+        assert repr(date_array[:1]) == "DateArray([datetime.date(2021, 1, 25)])"
+        with pytest.raises(IndexError):
+            date_array[len(DATES)]  # pylint: disable=pointless-statement
+
+    # check that datetimes are stored as their date and that values can be added
+    def test_append_and_extend(self) -> None:
+        date_array = datetime_helpers.DateArray()
+        date_array.append(datetime.datetime(2021, 2, 5, 13, 30))
+        date_array.extend(DATES[:2])
+        assert list(date_array) == [datetime.date(2021, 2, 5)] + DATES[:2]
+
+    # check the ordinals and the buffer they export
+    def test_ordinals(self) -> None:
+        date_array = datetime_helpers.DateArray.from_ordinals(dt.toordinal() for dt in DATES)
+        assert list(date_array) == DATES
+        assert date_array.ordinals.typecode == "i"
+        assert date_array.nbytes == 4 * len(DATES)
+        assert memoryview(date_array.ordinals).tolist() == [dt.toordinal() for dt in DATES]
+        assert date_array.__buffer__(0).tolist() == [dt.toordinal() for dt in DATES]  # pylint: disable=unnecessary-dunder-call
+
+    # check that the buffer protocol is picked up from Python 3.12
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason="PEP 688")
+    def test_memoryview(self) -> None:  # pragma: no cover
+        assert memoryview(datetime_helpers.DateArray(DATES)).tolist() == [dt.toordinal() for dt in DATES]  # type: ignore[arg-type]
+
+    # check the column methods against the scalar functions
+    def test_column_methods(self) -> None:
+        date_array = datetime_helpers.DateArray(DATES)
+        assert list(date_array.weekday()) == [dt.weekday() for dt in DATES]
+        assert [bool(value) for value in date_array.is_weekend()] == [datetime_helpers.is_weekend(dt=dt) for dt in DATES]
+        assert [bool(value) for value in date_array.is_weekday()] == [datetime_helpers.is_weekday(dt=dt) for dt in DATES]
+        assert list(date_array.is_business_day()) == list(date_array.is_weekday())
+        assert list(date_array.to_millis()) == [datetime_helpers.datetime_to_millis(dt=dt) for dt in DATES]
+        assert list(date_array.to_micros()) == [datetime_helpers.datetime_to_micros(dt=dt) for dt in DATES]
+        assert list(date_array[:-1].next_business_day()) == [datetime_helpers.get_next_business_day(dt=dt) for dt in DATES[:-1]]
+        assert list(date_array[:21].previous_business_day()) == [datetime_helpers.get_previous_business_day(dt=dt) for dt in DATES[:21]]
+        for n in (-6, -5, 0, 3, 5, 11):  # pylint: disable=invalid-name
+            assert list(date_array[:21].add_business_days(n=n)) == [datetime_helpers.add_business_days(dt=dt, n=n) for dt in DATES[:21]]
+
+    # check the column methods with a calendar
+    def test_column_methods_with_calendar(self) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(holidays=[datetime.date(2021, 2, 1)], start_year=2021, end_year=2021)
+        date_array = datetime_helpers.DateArray(DATES[:21])
+        assert [bool(value) for value in date_array.is_business_day(calendar=business_calendar)] == [business_calendar.is_business_day(dt=dt) for dt in DATES[:21]]
+        assert list(date_array.next_business_day(calendar=business_calendar)) == [business_calendar.next_business_day(dt=dt) for dt in DATES[:21]]
+        assert list(date_array.previous_business_day(calendar=business_calendar)) == [business_calendar.previous_business_day(dt=dt) for dt in DATES[:21]]
+        with pytest.raises(BadRequestException):
+            datetime_helpers.DateArray(DATES).next_business_day(calendar=business_calendar)
+
+
+class TestDateTimeArray(ArraysTestCase):
+    # check the sequence behaviour, values are stored as microseconds since the epoch
+    def test_sequence(self) -> None:
+        datetime_array = datetime_helpers.DateTimeArray(DATETIMES)
+        assert list(datetime_array) == DATETIMES
+        assert datetime_array[3] == DATETIMES[3]
+        assert list(datetime_array[::-2]) == DATETIMES[::-2]
+        assert list(datetime_array.micros) == [datetime_helpers.datetime_to_micros(dt=dt) for dt in DATETIMES]
+        assert datetime_helpers.DateTimeArray.from_micros(datetime_array.micros) == datetime_array
+        assert datetime_array.nbytes == 8 * len(DATETIMES)
+        assert memoryview(datetime_array.micros).format == "q"
+
+    # check that aware datetimes are stored in UTC
+    def test_aware(self) -> None:
+        dt = datetime.datetime(2021, 2, 5, 13, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5)))
+        assert list(datetime_helpers.DateTimeArray([dt])) == [datetime.datetime(2021, 2, 5, 18, 30)]
+
+    # check the column methods against the scalar functions
+    def test_column_methods(self) -> None:
+        datetime_array = datetime_helpers.DateTimeArray(DATETIMES)
+        assert list(datetime_array.dates()) == [dt.date() for dt in DATETIMES]
+        assert list(datetime_array.weekday()) == [dt.weekday() for dt in DATETIMES]
+        assert [bool(value) for value in datetime_array.is_weekend()] == [datetime_helpers.is_weekend(dt=dt) for dt in DATETIMES]
+        assert [bool(value) for value in datetime_array.is_weekday()] == [datetime_helpers.is_weekday(dt=dt) for dt in DATETIMES]
+        assert list(datetime_array.to_millis()) == [datetime_helpers.datetime_to_millis(dt=dt) for dt in DATETIMES]
+        assert list(datetime_array.to_seconds()) == [datetime_helpers.datetime_to_seconds(dt=dt) for dt in DATETIMES]
+        assert list(datetime_array[:-1].next_business_day()) == [datetime_helpers.get_next_business_day(dt=dt) for dt in DATETIMES[:-1]]
+        assert list(datetime_array[1:].previous_business_day()) == [datetime_helpers.get_previous_business_day(dt=dt) for dt in DATETIMES[1:]]
+
+    # check the column methods with a calendar
+    def test_column_methods_with_calendar(self) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(holidays=[datetime.date(2021, 2, 8)], start_year=2021, end_year=2021)
+        datetime_array = datetime_helpers.DateTimeArray(DATETIMES[3:5])
+        assert list(datetime_array.next_business_day(calendar=business_calendar)) == [datetime.datetime(2021, 2, 9, 13, 30), datetime.datetime(2021, 2, 9, 0, 0, 0, 1)]
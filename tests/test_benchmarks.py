@@ -0,0 +1,53 @@
+# pylint: disable=no-self-use
+import inspect
+import json
+import pathlib
+
+import pytest
+
+import datetime_helpers
+from benchmarks import threads
+from benchmarks.__main__ import main
+from benchmarks.cases import CASES
+
+
+class BenchmarksTestCase:
+    pass
+
+
+class TestCases(BenchmarksTestCase):
+    # check that every function and class with behaviour exported from datetime_helpers has a benchmark
+    def test_every_export_is_benchmarked(self) -> None:
+        data_types = {"DayOfWeek", "Weekday", "DateError", "DateValidation", "CacheInfo", "MalformedRow"}
+        exported = {name for name in datetime_helpers.__all__ if (inspect.isfunction(getattr(datetime_helpers, name)) or inspect.isclass(getattr(datetime_helpers, name))) and name not in data_types}
+        assert exported <= {case.function for case in CASES}
+
+    # check that case names are unique, they key the saved baselines
+    def test_case_names_are_unique(self) -> None:
+        assert len({case.name for case in CASES}) == len(CASES)
+
+
+class TestRunner(BenchmarksTestCase):
+    # check saving a baseline and comparing against it
+    def test_save_and_compare(self, tmp_path: pathlib.Path) -> None:
+        baseline_path = tmp_path / "baseline.json"
+        assert main(["-k", "cache_clear", "--repeat", "1", "--save", str(baseline_path)]) == 0
+        baseline = json.loads(baseline_path.read_text())
+        assert set(baseline["results"]) == {"cache_clear"}
+        assert main(["-k", "cache_clear", "--repeat", "1", "--compare", str(baseline_path), "--threshold", "0.9"]) == 0
+
+    # check that a slower run is flagged as a regression
+    def test_regression(self, tmp_path: pathlib.Path) -> None:
+        baseline_path = tmp_path / "baseline.json"
+        baseline_path.write_text(json.dumps({"python": "3", "version": "0", "results": {"cache_clear": {"ops_per_sec": 1e15, "peak_bytes_per_op": 0}, "removed": {"ops_per_sec": 1}}}))
+        assert main(["-k", "cache_clear", "--repeat", "1", "--compare", str(baseline_path)]) == 1
+
+
+class TestThreads(BenchmarksTestCase):
+    # check that the thread scaling harness runs every case and finds no mismatches
+    def test_threads(self, capsys: pytest.CaptureFixture[str]) -> None:
+        assert threads.main(["--threads", "1,3", "--number", "200"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("python ")
+        assert len(lines) == 1 + 2 * len(threads.CASES)
+        assert all(line.endswith(" 0 mismatches") for line in lines[1:])
@@ -0,0 +1,259 @@
+# pylint: disable=no-self-use
+import asyncio
+import datetime
+import mmap
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import AsyncIterator
+from typing import Iterable
+from typing import List
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+TEXTS = ["2016-04-17T03:12:34.567891Z", "not a date", "2016-04-18T00:00:00.000000Z", "2016-02-30T00:00:00.000000Z", "2016-04-19T00:00:00.000000Z"]
+DATETIMES = [datetime.datetime(2016, 4, 17, 3, 12, 34, 567891), datetime.datetime(2016, 4, 18), datetime.datetime(2016, 4, 19)]
+MILLIS = [1460862754567, 1460937600000, 1461024000000]
+CSV = "id,timestamp\n1,2016-04-17T03:12:34.567891Z\r\n2,2016-04-18T00:00:00.000000Z\n3\n"
+
+
+class BulkTestCase:
+    pass
+
+
+async def _stream(values: Iterable[Any]) -> AsyncIterator[Any]:
+    for value in values:
+        await asyncio.sleep(0)
+        yield value
+
+
+async def _collect(values: AsyncIterator[Any]) -> List[Any]:
+    return [value async for value in values]
+
+
+class TestIterDatetimesFromStrings(BulkTestCase):
+    # check that the results match datetime_from_string
+    @pytest.mark.parametrize(argnames="chunk_size", argvalues=[1, 2, 10_000])
+    def test_iter_datetimes_from_strings(self, chunk_size: int) -> None:
+        texts = [TEXTS[0], TEXTS[2], TEXTS[4]]
+        assert list(datetime_helpers.iter_datetimes_from_strings(texts=iter(texts), chunk_size=chunk_size)) == DATETIMES
+
+    # check a custom format
+    def test_custom_format(self) -> None:
+        assert list(datetime_helpers.iter_datetimes_from_strings(texts=["17-04-2016"], datetime_format="%d-%m-%Y")) == [datetime.datetime(2016, 4, 17)]
+
+    # check that the first malformed row raises with its index
+    def test_errors_raise(self) -> None:
+        with pytest.raises(BadRequestException, match="row 1: time data 'not a date'"):
+            list(datetime_helpers.iter_datetimes_from_strings(texts=TEXTS, chunk_size=2))
+
+    # check that malformed rows can be skipped
+    @pytest.mark.parametrize(argnames="chunk_size", argvalues=[1, 2, 10_000])
+    def test_errors_skip(self, chunk_size: int) -> None:
+        assert list(datetime_helpers.iter_datetimes_from_strings(texts=TEXTS, errors="skip", chunk_size=chunk_size)) == DATETIMES
+
+    # check that malformed rows can be collected
+    @pytest.mark.parametrize(argnames="chunk_size", argvalues=[1, 2, 10_000])
+    def test_errors_collect(self, chunk_size: int) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        assert list(datetime_helpers.iter_datetimes_from_strings(texts=TEXTS, errors="collect", malformed=malformed, chunk_size=chunk_size)) == DATETIMES
+        assert [(row.row, row.value) for row in malformed] == [(1, "not a date"), (3, "2016-02-30T00:00:00.000000Z")]
+        assert malformed[1].error == "day is out of range for month"
+
+    # check that invalid arguments are rejected straight away
+    @pytest.mark.parametrize(argnames="kwargs", argvalues=[{"errors": "ignore"}, {"errors": "collect"}, {"chunk_size": 0}, {"max_workers": 0}])
+    def test_invalid_arguments(self, kwargs: dict) -> None:  # type: ignore[type-arg]
+        with pytest.raises(BadRequestException):
+            datetime_helpers.iter_datetimes_from_strings(texts=TEXTS, **kwargs)
+
+
+class TestIterDatesFromStrings(BulkTestCase):
+    # check iter_dates_from_strings
+    def test_iter_dates_from_strings(self) -> None:
+        assert list(datetime_helpers.iter_dates_from_strings(texts=["2016-04-17", "17-04-2016"], errors="skip")) == [datetime.date(2016, 4, 17)]
+
+
+class TestIterStringsFromDatetimes(BulkTestCase):
+    # check that the results match datetime_to_string
+    def test_iter_strings_from_datetimes(self) -> None:
+        assert list(datetime_helpers.iter_strings_from_datetimes(dts=DATETIMES)) == [datetime_helpers.datetime_to_string(dt=dt) for dt in DATETIMES]
+
+    # check a custom format and malformed values
+    def test_custom_format_and_errors(self) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        strings = datetime_helpers.iter_strings_from_datetimes(dts=[datetime.date(2016, 4, 17), None], datetime_format="%d/%m/%Y", errors="collect", malformed=malformed)  # type: ignore[list-item]
+        assert list(strings) == ["17/04/2016"]
+        assert malformed[0].row == 1
+
+
+class TestIterMillisFromDatetimes(BulkTestCase):
+    # check that the results match datetime_to_millis, dates included
+    def test_iter_millis_from_datetimes(self) -> None:
+        assert list(datetime_helpers.iter_millis_from_datetimes(dts=DATETIMES + [datetime.date(1969, 12, 31)], chunk_size=2)) == MILLIS + [-86400000]
+
+
+class TestReadColumn(BulkTestCase):
+    # check reading a column from a path, a text file object, bytes and an mmap
+    def test_read_column(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "timestamps.csv"
+        path.write_bytes(CSV.encode())
+        expected = ["2016-04-17T03:12:34.567891Z", "2016-04-18T00:00:00.000000Z", ""]
+        assert list(datetime_helpers.read_column(source=path, delimiter=",", column=1, skip_rows=1)) == expected
+        assert list(datetime_helpers.read_column(source=str(path), delimiter=",", column=1, skip_rows=1)) == expected
+        with open(path, encoding="utf-8", newline="") as file:
+            assert list(datetime_helpers.read_column(source=file, delimiter=",", column=1, skip_rows=1)) == expected
+        assert list(datetime_helpers.read_column(source=CSV.encode(), delimiter=",", column=1, skip_rows=1)) == expected
+        with open(path, "rb") as binary_file, mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert list(datetime_helpers.read_column(source=buffer, delimiter=",", column=1, skip_rows=1)) == expected
+
+    # check reading whole lines without a delimiter
+    def test_read_whole_lines(self) -> None:
+        assert list(datetime_helpers.read_column(source=b"2016-04-17\n2016-04-18")) == ["2016-04-17", "2016-04-18"]
+
+    # check streaming a file straight into the parser
+    def test_read_and_parse(self) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        column = datetime_helpers.read_column(source=CSV.encode(), delimiter=",", column=1, skip_rows=1)
+        assert list(datetime_helpers.iter_datetimes_from_strings(texts=column, errors="collect", malformed=malformed)) == DATETIMES[:2]
+        assert malformed[0].row == 2
+
+
+class TestParallel(BulkTestCase):
+    # check that parallel conversion keeps the order and reports malformed rows by their original index
+    def test_parallel_collect(self) -> None:
+        texts = TEXTS * 20
+        malformed: List[datetime_helpers.MalformedRow] = []
+        dts = datetime_helpers.iter_datetimes_from_strings(texts=iter(texts), errors="collect", malformed=malformed, chunk_size=3, parallel=True, max_workers=2)
+        assert list(dts) == DATETIMES * 20
+        assert [row.row for row in malformed] == [index for index in range(len(texts)) if index % 5 in (1, 3)]
+
+    # check that the first malformed row raises with its original index
+    def test_parallel_raise(self) -> None:
+        with pytest.raises(BadRequestException, match="row 7: time data 'not a date'"):
+            datetime_helpers.parse_many(texts=[TEXTS[0]] * 6 + TEXTS, chunk_size=2, max_workers=2)
+
+    # check parallel parsing of dates and formatting
+    def test_parallel_dates_and_strings(self) -> None:
+        assert list(datetime_helpers.iter_dates_from_strings(texts=["2016-04-17"] * 5, chunk_size=2, parallel=True, max_workers=2)) == [datetime.date(2016, 4, 17)] * 5
+        strings = datetime_helpers.iter_strings_from_datetimes(dts=DATETIMES, chunk_size=1, parallel=True, max_workers=1)
+        assert list(strings) == [datetime_helpers.datetime_to_string(dt=dt) for dt in DATETIMES]
+
+    # check that closing the stream early does not hang
+    def test_parallel_close_early(self) -> None:
+        dts = datetime_helpers.iter_datetimes_from_strings(texts=[TEXTS[0]] * 1000, chunk_size=10, parallel=True, max_workers=1)
+        assert next(dts) == DATETIMES[0]
+        dts.close()  # type: ignore[attr-defined]
+
+
+class TestParseManyAsync(BulkTestCase):
+    # check parse_many_async with the default process pool
+    def test_parse_many_async(self) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        dts = asyncio.run(datetime_helpers.parse_many_async(texts=TEXTS, errors="collect", malformed=malformed, chunk_size=2, max_workers=2))
+        assert dts == DATETIMES
+        assert [row.row for row in malformed] == [1, 3]
+
+    # check parse_many_async with a caller supplied executor
+    def test_parse_many_async_executor(self) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(BadRequestException, match="row 1"):
+                asyncio.run(datetime_helpers.parse_many_async(texts=TEXTS, chunk_size=1, executor=executor))
+
+    # check that only a bounded number of chunks is read ahead, so a malformed row stops the input being consumed
+    def test_parse_many_async_bounded(self) -> None:
+        consumed = []
+
+        def texts() -> Iterable[str]:
+            for i in range(10_000):
+                consumed.append(i)
+                yield TEXTS[1] if i == 0 else TEXTS[0]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(BadRequestException, match="row 0"):
+                asyncio.run(datetime_helpers.parse_many_async(texts=texts(), chunk_size=10, max_workers=1, executor=executor))
+            assert len(consumed) <= 30
+            assert asyncio.run(datetime_helpers.parse_many_async(texts=[TEXTS[0]] * 1000, chunk_size=7, max_workers=1, executor=executor)) == [DATETIMES[0]] * 1000
+
+
+class TestAsyncIterators(BulkTestCase):
+    # check the results against the synchronous iterators, from plain and async iterables
+    @pytest.mark.parametrize(argnames="chunk_size", argvalues=[1, 2, 10_000])
+    @pytest.mark.parametrize(argnames="stream", argvalues=[False, True])
+    def test_results(self, chunk_size: int, stream: bool) -> None:
+        def source(values: List[Any]) -> Any:
+            return _stream(values=values) if stream else values
+
+        texts = [TEXTS[0], TEXTS[2], TEXTS[4]]
+        assert asyncio.run(_collect(datetime_helpers.aiter_datetimes_from_strings(texts=source(texts), chunk_size=chunk_size))) == DATETIMES
+        assert asyncio.run(_collect(datetime_helpers.aiter_dates_from_strings(texts=source(["2016-04-17"]), chunk_size=chunk_size))) == [datetime.date(2016, 4, 17)]
+        strings = datetime_helpers.aiter_strings_from_datetimes(dts=source(DATETIMES), datetime_format="%Y-%m-%d", chunk_size=chunk_size)
+        assert asyncio.run(_collect(strings)) == ["2016-04-17", "2016-04-18", "2016-04-19"]
+        assert asyncio.run(_collect(datetime_helpers.aiter_millis_from_datetimes(dts=source(DATETIMES), chunk_size=chunk_size))) == MILLIS
+
+    # check that malformed rows are handled like the synchronous iterators
+    def test_errors(self) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        dts = datetime_helpers.aiter_datetimes_from_strings(texts=_stream(values=TEXTS), errors="collect", malformed=malformed, chunk_size=2)
+        assert asyncio.run(_collect(dts)) == DATETIMES
+        assert [row.row for row in malformed] == [1, 3]
+        with pytest.raises(BadRequestException, match="row 1: time data 'not a date'"):
+            asyncio.run(_collect(datetime_helpers.aiter_datetimes_from_strings(texts=TEXTS, chunk_size=2)))
+
+    # check that other tasks run between the chunks
+    def test_yields_to_event_loop(self) -> None:
+        ticks: List[int] = []
+
+        async def tick() -> None:
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def convert() -> List[datetime.datetime]:
+            task = asyncio.ensure_future(tick())
+            try:
+                return await _collect(datetime_helpers.aiter_datetimes_from_strings(texts=[TEXTS[0]] * 100, chunk_size=10))
+            finally:
+                task.cancel()
+
+        assert asyncio.run(convert()) == [DATETIMES[0]] * 100
+        assert len(ticks) >= 9
+
+    # check that the values past offload_threshold are converted on the executor, in order
+    @pytest.mark.parametrize(argnames="offload_threshold", argvalues=[0, 3, 100])
+    def test_offload(self, offload_threshold: int) -> None:
+        malformed: List[datetime_helpers.MalformedRow] = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            texts = _stream(values=TEXTS * 20)
+            dts = datetime_helpers.aiter_datetimes_from_strings(texts=texts, errors="collect", malformed=malformed, chunk_size=2, executor=executor, offload_threshold=offload_threshold)
+            assert asyncio.run(_collect(dts)) == DATETIMES * 20
+        assert [row.row for row in malformed] == [row for row in range(100) if row % 5 in (1, 3)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(BadRequestException, match="row 7: time data 'not a date'"):
+                asyncio.run(_collect(datetime_helpers.aiter_datetimes_from_strings(texts=[TEXTS[0]] * 6 + TEXTS, chunk_size=1, executor=executor, offload_threshold=offload_threshold)))
+
+    # check offloading to a process pool
+    def test_offload_to_processes(self) -> None:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            millis = datetime_helpers.aiter_millis_from_datetimes(dts=DATETIMES * 10, chunk_size=4, executor=executor, offload_threshold=8)
+            assert asyncio.run(_collect(millis)) == MILLIS * 10
+
+    # check that closing the stream early cancels the chunks in flight
+    def test_close_early(self) -> None:
+        async def first() -> datetime.datetime:
+            dts = datetime_helpers.aiter_datetimes_from_strings(texts=[TEXTS[0]] * 1000, chunk_size=1, executor=executor, offload_threshold=0)
+            dt = await dts.__anext__()
+            await dts.aclose()  # type: ignore[attr-defined]
+            return dt
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert asyncio.run(first()) == DATETIMES[0]
+
+    # check that invalid arguments raise before the iterator is consumed
+    @pytest.mark.parametrize(argnames="kwargs", argvalues=[{"errors": "ignore"}, {"errors": "collect"}, {"chunk_size": 0}, {"offload_threshold": -1}])
+    def test_invalid_arguments(self, kwargs: dict) -> None:  # type: ignore[type-arg]
+        with pytest.raises(BadRequestException):
+            datetime_helpers.aiter_datetimes_from_strings(texts=TEXTS, **kwargs)
@@ -0,0 +1,322 @@
+# pylint: disable=no-self-use
+import datetime
+import pathlib
+import struct
+import threading
+from typing import List
+from typing import Tuple
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+# see https://www.timeanddate.com/holidays/uk/2021
+UK_HOLIDAYS_2021 = [
+    datetime.date(2021, 1, 1),
+    datetime.date(2021, 4, 2),
+    datetime.date(2021, 4, 5),
+    datetime.date(2021, 5, 3),
+    datetime.date(2021, 5, 31),
+    datetime.date(2021, 8, 30),
+    datetime.date(2021, 12, 27),
+    datetime.date(2021, 12, 28),
+]
+
+
+@pytest.fixture(name="business_calendar", scope="module")
+def fixture_business_calendar() -> datetime_helpers.BusinessCalendar:
+    return datetime_helpers.BusinessCalendar(holidays=UK_HOLIDAYS_2021, start_year=2020, end_year=2022)
+
+
+def _naive_is_business_day(dt: datetime.date) -> bool:
+    return dt.weekday() < 5 and dt not in UK_HOLIDAYS_2021
+
+
+class BusinessCalendarTestCase:
+    pass
+
+
+class TestBusinessCalendarInit(BusinessCalendarTestCase):
+    # check that an invalid weekend is rejected
+    @pytest.mark.parametrize(argnames="weekend", argvalues=[(7,), (-1,), tuple(range(7))])
+    def test_invalid_weekend(self, weekend: Tuple[int, ...]) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.BusinessCalendar(weekend=weekend)
+
+    # check that an inverted year range is rejected
+    def test_invalid_year_range(self) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.BusinessCalendar(start_year=2022, end_year=2021)
+
+    # check the repr
+    def test_repr(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        assert repr(business_calendar) == "BusinessCalendar(holidays=<8 dates>, weekend=[5, 6], start_year=2020, end_year=2022)"
+
+
+class TestBusinessCalendarIsBusinessDay(BusinessCalendarTestCase):
+    # check is_business_day for every day of 2021
+    def test_is_business_day(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        dt = datetime.date(2021, 1, 1)
+        while dt.year == 2021:
+            assert business_calendar.is_business_day(dt=dt) is _naive_is_business_day(dt=dt)
+            dt += datetime.timedelta(days=1)
+
+    # check a custom weekend (friday/saturday)
+    def test_custom_weekend(self) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(weekend=(4, 5), start_year=2021, end_year=2021)
+        assert business_calendar.is_business_day(dt=datetime.date(2021, 2, 5)) is False  # friday
+        assert business_calendar.is_business_day(dt=datetime.date(2021, 2, 7)) is True  # sunday
+        assert business_calendar.next_business_day(dt=datetime.date(2021, 2, 4)) == datetime.date(2021, 2, 7)
+
+    # check that dates outside of the range are rejected
+    @pytest.mark.parametrize(argnames="dt", argvalues=[datetime.date(2019, 12, 31), datetime.date(2023, 1, 1)])
+    def test_out_of_range(self, business_calendar: datetime_helpers.BusinessCalendar, dt: datetime.date) -> None:
+        with pytest.raises(BadRequestException):
+            business_calendar.is_business_day(dt=dt)
+
+
+class TestBusinessCalendarAddBusinessDays(BusinessCalendarTestCase):
+    # check add_business_days against day by day stepping
+    @pytest.mark.parametrize(argnames="n", argvalues=[-6, -2, -1, 0, 1, 2, 6])
+    def test_add_business_days(self, business_calendar: datetime_helpers.BusinessCalendar, n: int) -> None:  # pylint: disable=invalid-name
+        dt = datetime.date(2021, 1, 1)
+        while dt.year == 2021:
+            expected = dt
+            for _ in range(abs(n)):
+                expected += datetime.timedelta(days=1 if n > 0 else -1)
+                while not _naive_is_business_day(dt=expected):
+                    expected += datetime.timedelta(days=1 if n > 0 else -1)
+            assert business_calendar.add_business_days(dt=dt, n=n) == expected
+            dt += datetime.timedelta(days=1)
+
+    # check that datetimes keep their time of day
+    def test_add_business_days_datetime(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        dt = datetime.datetime(2021, 4, 1, 13, 30)
+        assert business_calendar.add_business_days(dt=dt, n=1) == datetime.datetime(2021, 4, 6, 13, 30)
+
+    # check the previous and next business day around easter
+    def test_previous_and_next_business_day(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        assert business_calendar.next_business_day(dt=datetime.date(2021, 4, 1)) == datetime.date(2021, 4, 6)
+        assert business_calendar.previous_business_day(dt=datetime.date(2021, 4, 6)) == datetime.date(2021, 4, 1)
+
+    # check that stepping beyond the range is rejected
+    def test_beyond_range(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        with pytest.raises(BadRequestException):
+            business_calendar.add_business_days(dt=datetime.date(2022, 12, 30), n=1)
+
+
+class TestBusinessCalendarBusinessDaysBetween(BusinessCalendarTestCase):
+    # check business_days_between
+    def test_business_days_between(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        assert business_calendar.business_days_between(start=datetime.date(2021, 1, 1), end=datetime.date(2022, 1, 1)) == 261 - 8
+        assert business_calendar.business_days_between(start=datetime.date(2021, 4, 6), end=datetime.date(2021, 4, 1)) == -1
+        assert business_calendar.business_days_between(start=datetime.date(2022, 12, 30), end=datetime.date(2023, 1, 1)) == 1
+
+
+class TestBusinessCalendarNthBusinessDayOfMonth(BusinessCalendarTestCase):
+    # check nth_business_day_of_month
+    @pytest.mark.parametrize(
+        argnames="year,month,n,nth_business_day_of_month",
+        argvalues=[
+            (2021, 1, 1, datetime.date(2021, 1, 4)),
+            (2021, 4, 2, datetime.date(2021, 4, 6)),
+            (2021, 5, 1, datetime.date(2021, 5, 4)),
+            (2021, 5, 19, datetime.date(2021, 5, 28)),
+        ],
+    )
+    def test_nth_business_day_of_month(
+        self, business_calendar: datetime_helpers.BusinessCalendar, year: int, month: int, n: int, nth_business_day_of_month: datetime.date  # pylint: disable=invalid-name
+    ) -> None:
+        assert business_calendar.nth_business_day_of_month(year=year, month=month, n=n) == nth_business_day_of_month
+
+    # check that an exception is raised if n is out of bounds
+    @pytest.mark.parametrize(argnames="year,month,n", argvalues=[(2021, 5, 0), (2021, 5, 20), (2022, 12, 30), (2021, 4, 261), (2020, 4, 250)])
+    def test_nth_business_day_of_month_out_of_bounds(self, business_calendar: datetime_helpers.BusinessCalendar, year: int, month: int, n: int) -> None:  # pylint: disable=invalid-name
+        with pytest.raises(BadRequestException):
+            business_calendar.nth_business_day_of_month(year=year, month=month, n=n)
+        with pytest.raises(BadRequestException):
+            datetime_helpers.nth_business_day_of_month(year=year, month=month, n=n, calendar=business_calendar)
+
+
+class TestBusinessCalendarIterBusinessDays(BusinessCalendarTestCase):
+    # check iter_business_days and business_day_ordinals against a day by day scan
+    def test_iter_business_days(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        start = datetime.date(2021, 1, 1)
+        end = datetime.date(2022, 1, 1)
+        expected = [start + datetime.timedelta(days=i) for i in range((end - start).days) if _naive_is_business_day(start + datetime.timedelta(days=i))]
+        assert list(business_calendar.iter_business_days(start=start, end=end)) == expected
+        assert list(business_calendar.business_day_ordinals(start=start, end=end)) == [dt.toordinal() for dt in expected]
+        assert not list(business_calendar.iter_business_days(start=end, end=start))
+
+    # check that an exception is raised outside of the calendar range
+    def test_iter_business_days_out_of_range(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        with pytest.raises(BadRequestException):
+            business_calendar.iter_business_days(start=datetime.date(2021, 1, 1), end=datetime.date(2023, 1, 2))
+
+    # check business_days_in_month
+    @pytest.mark.parametrize(
+        argnames="year,month,days",
+        argvalues=[
+            (2021, 4, [1, 6, 7, 8, 9, 12, 13, 14, 15, 16, 19, 20, 21, 22, 23, 26, 27, 28, 29, 30]),
+            (2021, 12, [1, 2, 3, 6, 7, 8, 9, 10, 13, 14, 15, 16, 17, 20, 21, 22, 23, 24, 29, 30, 31]),
+            (2022, 12, [1, 2, 5, 6, 7, 8, 9, 12, 13, 14, 15, 16, 19, 20, 21, 22, 23, 26, 27, 28, 29, 30]),
+        ],
+    )
+    def test_business_days_in_month(self, business_calendar: datetime_helpers.BusinessCalendar, year: int, month: int, days: List[int]) -> None:
+        assert list(business_calendar.business_days_in_month(year=year, month=month)) == days
+
+
+class TestUtilsWithCalendar(BusinessCalendarTestCase):
+    # check that the utils functions route through the calendar
+    def test_utils_with_calendar(self, business_calendar: datetime_helpers.BusinessCalendar) -> None:
+        assert datetime_helpers.get_next_business_day(dt=datetime.date(2021, 4, 1), calendar=business_calendar) == datetime.date(2021, 4, 6)
+        assert datetime_helpers.get_previous_business_day(dt=datetime.date(2021, 4, 6), calendar=business_calendar) == datetime.date(2021, 4, 1)
+        assert datetime_helpers.get_first_business_day_of_month(dt=datetime.date(2021, 5, 20), calendar=business_calendar) == datetime.date(2021, 5, 4)
+        assert datetime_helpers.get_nth_business_day_of_month(n=2, dt=datetime.date(2021, 5, 20), calendar=business_calendar) == datetime.date(2021, 5, 5)
+        with pytest.raises(BadRequestException):
+            datetime_helpers.get_nth_business_day_of_month(n=261, dt=datetime.date(2021, 4, 20), calendar=business_calendar)
+        assert datetime_helpers.business_days_between(start=datetime.date(2021, 4, 1), end=datetime.date(2021, 4, 7), calendar=business_calendar) == 2
+        assert list(datetime_helpers.iter_business_days(start=datetime.date(2021, 4, 1), end=datetime.date(2021, 4, 7), calendar=business_calendar)) == [
+            datetime.date(2021, 4, 1),
+            datetime.date(2021, 4, 6),
+        ]
+        assert datetime_helpers.business_days_in_month(year=2021, month=5, calendar=business_calendar)[0] == 4
+        assert [days[0] for days in datetime_helpers.month_business_day_table(year=2021, calendar=business_calendar)] == [4, 1, 1, 1, 4, 1, 1, 2, 1, 1, 1, 1]
+
+
+class TestBusinessCalendarPersistence(BusinessCalendarTestCase):
+    # check that a loaded calendar answers like the one that was saved
+    def test_save_and_load(self, tmp_path: pathlib.Path) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(holidays=UK_HOLIDAYS_2021 + [datetime.date(1999, 1, 1)], weekend=(4, 5), start_year=2020, end_year=2022)
+        path = tmp_path / "calendar.bin"
+        business_calendar.save(path=path)
+        loaded = datetime_helpers.BusinessCalendar.load(path=str(path))
+        assert repr(loaded) == repr(business_calendar)
+        assert (loaded.holidays, loaded.weekend, loaded.start_year, loaded.end_year) == (business_calendar.holidays, business_calendar.weekend, 2020, 2022)
+        start = datetime.date(2020, 1, 1)
+        end = datetime.date(2023, 1, 1)
+        days = [start + datetime.timedelta(days=i) for i in range((end - start).days)]
+        assert [loaded.is_business_day(dt=dt) for dt in days] == [business_calendar.is_business_day(dt=dt) for dt in days]
+        assert [loaded.add_business_days(dt=dt, n=7) for dt in days[:900]] == [business_calendar.add_business_days(dt=dt, n=7) for dt in days[:900]]
+        assert loaded.business_days_between(start=start, end=end) == business_calendar.business_days_between(start=start, end=end)
+        assert loaded.business_day_ordinals(start=start, end=end) == business_calendar.business_day_ordinals(start=start, end=end)
+        assert list(loaded.iter_business_days(start=end, end=start)) == []
+        assert loaded.business_days_in_month(year=2021, month=4) == business_calendar.business_days_in_month(year=2021, month=4)
+        assert loaded.nth_business_day_of_month(year=2021, month=4, n=3) == business_calendar.nth_business_day_of_month(year=2021, month=4, n=3)
+        assert loaded.last_business_day_of_month(year=2021, month=12) == business_calendar.last_business_day_of_month(year=2021, month=12)
+        assert datetime_helpers.DateArray(days[:30]).next_business_day(calendar=loaded) == datetime_helpers.DateArray(days[:30]).next_business_day(calendar=business_calendar)
+        assert [path.name for path in tmp_path.iterdir()] == ["calendar.bin"]
+
+    # check that a missing file is not mistaken for a stale one
+    def test_load_missing(self, tmp_path: pathlib.Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            datetime_helpers.BusinessCalendar.load(path=tmp_path / "calendar.bin")
+
+    # check that stale and corrupt files are detected
+    @pytest.mark.parametrize(
+        argnames="offset,data,message",
+        argvalues=[
+            (0, b"NOTACAL\0", "not a business calendar file"),
+            (8, struct.pack("<H", 99), "format version 99, expected 2"),
+            (10, b"\x07", "other byte order"),
+            (12, struct.pack("<ii", 2004, 2005), "days do not match the years"),
+            (12, struct.pack("<ii", 2022, 2021), "days do not match the years"),
+            (12, struct.pack("<ii", 0, 0), "days do not match the years"),
+            (20, struct.pack("<i", 366), "days do not match the years"),
+            (11, b"\x41", "checksum mismatch"),
+            (24, struct.pack("<i", 1), "truncated tables"),
+            (100, b"\xff\xff", "checksum mismatch"),
+        ],
+    )
+    def test_load_stale(self, tmp_path: pathlib.Path, offset: int, data: bytes, message: str) -> None:
+        path = tmp_path / "calendar.bin"
+        datetime_helpers.BusinessCalendar(holidays=UK_HOLIDAYS_2021, start_year=2021, end_year=2021).save(path=path)
+        content = bytearray(path.read_bytes())
+        end = offset + len(data)
+        content[offset:end] = data
+        path.write_bytes(bytes(content))
+        with pytest.raises(BadRequestException, match=message):
+            datetime_helpers.BusinessCalendar.load(path=path)
+
+    # check that header fields consistent with each other are still covered by the checksum
+    def test_load_header_checksum(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "calendar.bin"
+        datetime_helpers.BusinessCalendar(start_year=2021, end_year=2021).save(path=path)
+        content = bytearray(path.read_bytes())
+        content[11] = 0b1000001  # Monday and Sunday
+        content[12:20] = struct.pack("<ii", 2005, 2005)
+        path.write_bytes(bytes(content))
+        with pytest.raises(BadRequestException, match="checksum mismatch"):
+            datetime_helpers.BusinessCalendar.load(path=path)
+
+    # check that truncated files are detected
+    @pytest.mark.parametrize(argnames="size", argvalues=[0, 39, 40, 1000])
+    def test_load_truncated(self, tmp_path: pathlib.Path, size: int) -> None:
+        path = tmp_path / "calendar.bin"
+        datetime_helpers.BusinessCalendar(start_year=2021, end_year=2021).save(path=path)
+        path.write_bytes(path.read_bytes()[:size])
+        with pytest.raises(BadRequestException, match="truncated"):
+            datetime_helpers.BusinessCalendar.load(path=path)
+
+    # check that the file is only rebuilt when it is missing, stale or holds another calendar
+    def test_load_or_build(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "calendar.bin"
+
+        def load_or_build(holidays: List[datetime.date]) -> datetime_helpers.BusinessCalendar:
+            return datetime_helpers.BusinessCalendar.load_or_build(path=path, holidays=holidays, start_year=2020, end_year=2022)
+
+        business_calendar = load_or_build(holidays=UK_HOLIDAYS_2021)
+        assert not business_calendar.is_business_day(dt=datetime.date(2021, 4, 2))
+        content = path.read_bytes()
+        path.write_bytes(content[:-4] + b"\0\0\0\1")  # same calendar, corrupt tables
+        assert load_or_build(holidays=UK_HOLIDAYS_2021).is_business_day(dt=datetime.date(2021, 5, 4))
+        assert path.read_bytes() == content
+        modified = path.stat().st_mtime_ns
+        assert load_or_build(holidays=UK_HOLIDAYS_2021).holidays == frozenset(UK_HOLIDAYS_2021)
+        assert path.stat().st_mtime_ns == modified
+        assert load_or_build(holidays=UK_HOLIDAYS_2021[1:]).is_business_day(dt=datetime.date(2021, 1, 1))
+        assert path.read_bytes() != content
+
+    # check that the built calendar is returned when another process replaces the file with a different one right after saving it
+    def test_load_or_build_replaced(self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path = tmp_path / "calendar.bin"
+        other = datetime_helpers.BusinessCalendar(start_year=2021, end_year=2021)
+        save = datetime_helpers.BusinessCalendar.save
+        monkeypatch.setattr(datetime_helpers.BusinessCalendar, "save", lambda self, path: save(other, path=path))
+        business_calendar = datetime_helpers.BusinessCalendar.load_or_build(path=path, holidays=UK_HOLIDAYS_2021, start_year=2021, end_year=2021)
+        assert business_calendar.holidays == frozenset(UK_HOLIDAYS_2021)
+        assert not business_calendar.is_business_day(dt=datetime.date(2021, 4, 2))
+        assert datetime_helpers.BusinessCalendar.load(path=path).holidays == frozenset()
+
+    # check that a failed save leaves no temporary file behind
+    def test_save_failure(self, tmp_path: pathlib.Path) -> None:
+        with pytest.raises(OSError):
+            datetime_helpers.BusinessCalendar(start_year=2021, end_year=2021).save(path=tmp_path / "missing" / "calendar.bin")
+        (tmp_path / "calendar.bin").mkdir()
+        with pytest.raises(OSError):
+            datetime_helpers.BusinessCalendar(start_year=2021, end_year=2021).save(path=tmp_path / "calendar.bin")
+        assert [path.name for path in tmp_path.iterdir()] == ["calendar.bin"]
+
+    # check that threads saving and loading the same file concurrently never fail or see a partial file
+    def test_threads(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "calendar.bin"
+        errors: List[BaseException] = []
+
+        def save_and_load(index: int) -> None:
+            try:
+                for i in range(20):
+                    holidays = UK_HOLIDAYS_2021[1:] if (index + i) % 2 else UK_HOLIDAYS_2021
+                    datetime_helpers.BusinessCalendar(holidays=holidays, start_year=2021, end_year=2021).save(path=path)
+                    assert datetime_helpers.BusinessCalendar.load(path=path).holidays in (frozenset(UK_HOLIDAYS_2021), frozenset(UK_HOLIDAYS_2021[1:]))
+                    assert datetime_helpers.BusinessCalendar.load_or_build(path=path, holidays=holidays, start_year=2021, end_year=2021).holidays == frozenset(holidays)
+            except BaseException as exception:  # pylint: disable=broad-except
+                errors.append(exception)
+
+        threads = [threading.Thread(target=save_and_load, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert [path.name for path in tmp_path.iterdir()] == ["calendar.bin"]
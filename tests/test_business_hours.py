@@ -0,0 +1,151 @@
+# pylint: disable=no-self-use
+import datetime
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+HOLIDAYS = [datetime.date(2021, 4, 2), datetime.date(2021, 4, 5)]
+LUNCH_WINDOWS = [(datetime.time(8), datetime.time(12)), (datetime.time(13), datetime.time(17, 30))]
+MINUTE = datetime.timedelta(minutes=1)
+
+
+@pytest.fixture(name="business_hours", scope="module")
+def fixture_business_hours() -> datetime_helpers.BusinessHours:
+    calendar = datetime_helpers.BusinessCalendar(holidays=HOLIDAYS, start_year=2020, end_year=2022)
+    return datetime_helpers.BusinessHours(windows=LUNCH_WINDOWS, calendar=calendar)
+
+
+def _naive_is_business_time(dt: datetime.datetime) -> bool:
+    if dt.weekday() >= 5 or dt.date() in HOLIDAYS:
+        return False
+    return any(start <= dt.time() < end for start, end in LUNCH_WINDOWS)
+
+
+class BusinessHoursTestCase:
+    pass
+
+
+class TestBusinessHoursInit(BusinessHoursTestCase):
+    # check that invalid windows are rejected
+    @pytest.mark.parametrize(
+        argnames="windows",
+        argvalues=[
+            [],
+            [(datetime.time(17), datetime.time(9))],
+            [(datetime.time(9), datetime.time(9))],
+            [(datetime.time(9), datetime.time(13)), (datetime.time(12), datetime.time(17))],
+            [(datetime.time(13), datetime.time(17)), (datetime.time(9), datetime.time(12))],
+            [(datetime.time(9, tzinfo=datetime.timezone.utc), datetime.time(17))],
+        ],
+    )
+    def test_invalid_windows(self, windows: List[Tuple[datetime.time, datetime.time]]) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.BusinessHours(windows=windows)
+
+    # check the repr
+    def test_repr(self) -> None:
+        assert repr(datetime_helpers.BusinessHours()) == "BusinessHours(windows=['09:00:00-17:00:00'], calendar=None)"
+
+
+class TestIsBusinessTime(BusinessHoursTestCase):
+    # check against a brute force over every minute of the Easter weekend weeks
+    def test_is_business_time(self, business_hours: datetime_helpers.BusinessHours) -> None:
+        dt = datetime.datetime(2021, 3, 29)
+        while dt < datetime.datetime(2021, 4, 12):
+            assert business_hours.is_business_time(dt=dt) == _naive_is_business_time(dt=dt), dt
+            dt += MINUTE
+
+
+class TestBusinessTimeBetween(BusinessHoursTestCase):
+    # check against a brute force count of the business minutes, both ways around
+    def test_business_time_between(self, business_hours: datetime_helpers.BusinessHours) -> None:
+        start = datetime.datetime(2021, 3, 31, 10, 17)
+        minutes = 0
+        end = start
+        while end < datetime.datetime(2021, 4, 8):
+            assert business_hours.business_time_between(start=start, end=end) == minutes * MINUTE, end
+            assert business_hours.business_time_between(start=end, end=start) == -minutes * MINUTE, end
+            minutes += _naive_is_business_time(dt=end)
+            end += 7 * MINUTE
+            minutes += sum(_naive_is_business_time(dt=end - i * MINUTE) for i in range(1, 7))
+
+    # check that dates are taken as their midnight and that the default hours are 09:00-17:00, Monday-Friday
+    def test_defaults(self) -> None:
+        assert datetime_helpers.business_time_between(start=datetime.date(2021, 4, 2), end=datetime.date(2021, 4, 6)) == datetime.timedelta(hours=16)
+        assert datetime_helpers.business_time_between(start=datetime.datetime(2021, 4, 2, 16), end=datetime.datetime(2021, 4, 5, 10)) == datetime.timedelta(hours=2)
+
+    # check the batch form
+    def test_many(self, business_hours: datetime_helpers.BusinessHours) -> None:
+        starts = [datetime.datetime(2021, 4, 1, 11), datetime.datetime(2021, 4, 6, 18)]
+        ends = [datetime.datetime(2021, 4, 6, 9), datetime.datetime(2021, 4, 6, 8)]
+        assert datetime_helpers.business_time_between_many(starts=starts, ends=ends, business_hours=business_hours) == [
+            datetime.timedelta(hours=6, minutes=30),
+            -datetime.timedelta(hours=8, minutes=30),
+        ]
+
+
+class TestAddBusinessTime(BusinessHoursTestCase):
+    # check deadlines across lunch, the end of the day, a weekend and holidays
+    @pytest.mark.parametrize(
+        argnames="dt,delta,expected",
+        argvalues=[
+            (datetime.datetime(2021, 4, 1, 10), datetime.timedelta(hours=1), datetime.datetime(2021, 4, 1, 11)),
+            (datetime.datetime(2021, 4, 1, 11), datetime.timedelta(hours=2), datetime.datetime(2021, 4, 1, 14)),
+            (datetime.datetime(2021, 4, 1, 16), datetime.timedelta(hours=4), datetime.datetime(2021, 4, 6, 10, 30)),
+            (datetime.datetime(2021, 4, 3, 3), datetime.timedelta(minutes=1), datetime.datetime(2021, 4, 6, 8, 1)),
+            (datetime.datetime(2021, 4, 6, 10, 30), -datetime.timedelta(hours=4), datetime.datetime(2021, 4, 1, 16)),
+            (datetime.datetime(2021, 4, 6, 8, 1), -datetime.timedelta(minutes=1), datetime.datetime(2021, 4, 6, 8)),
+            # landing on the end of a window stays there moving forward, on the start of the next one moving backward
+            (datetime.datetime(2021, 4, 1, 9), datetime.timedelta(hours=3), datetime.datetime(2021, 4, 1, 12)),
+            (datetime.datetime(2021, 4, 1, 14), -datetime.timedelta(hours=1), datetime.datetime(2021, 4, 1, 13)),
+            (datetime.datetime(2021, 4, 1, 16, 30), datetime.timedelta(hours=1), datetime.datetime(2021, 4, 1, 17, 30)),
+            (datetime.datetime(2021, 4, 6, 9), -datetime.timedelta(hours=1), datetime.datetime(2021, 4, 6, 8)),
+            (datetime.date(2021, 4, 1), datetime.timedelta(hours=9, minutes=30), datetime.datetime(2021, 4, 6, 9)),
+        ],
+    )
+    def test_add_business_time(self, business_hours: datetime_helpers.BusinessHours, dt: datetime.date, delta: datetime.timedelta, expected: datetime.datetime) -> None:
+        assert business_hours.add_business_time(dt=dt, delta=delta) == expected
+
+    # check that adding and measuring business time round trip
+    @pytest.mark.parametrize(argnames="minutes", argvalues=[1, 59, 240, 510, 511, 2000, -1, -240, -510, -2000])
+    def test_round_trip(self, business_hours: datetime_helpers.BusinessHours, minutes: int) -> None:
+        dt = datetime.datetime(2021, 3, 29, 7)
+        while dt < datetime.datetime(2021, 4, 12):
+            result = business_hours.add_business_time(dt=dt, delta=minutes * MINUTE)
+            assert business_hours.business_time_between(start=dt, end=result) == minutes * MINUTE, dt
+            assert business_hours.is_business_time(dt=result) or business_hours.is_business_time(dt=result - MINUTE), dt
+            dt += 17 * MINUTE
+
+    # check that a zero delta returns dt as a datetime and that the tzinfo is kept
+    @pytest.mark.parametrize(argnames="tzinfo", argvalues=[None, datetime.timezone(datetime.timedelta(hours=2))])
+    def test_zero_delta_and_tzinfo(self, tzinfo: Optional[datetime.tzinfo]) -> None:
+        dt = datetime.datetime(2021, 4, 3, 3, tzinfo=tzinfo)
+        assert datetime_helpers.add_business_time(dt=dt, delta=datetime.timedelta(0)) is dt
+        assert datetime_helpers.add_business_time(dt=datetime.date(2021, 4, 3), delta=datetime.timedelta(0)) == datetime.datetime(2021, 4, 3)
+        assert datetime_helpers.add_business_time(dt=dt, delta=datetime.timedelta(hours=1)) == datetime.datetime(2021, 4, 5, 10, tzinfo=tzinfo)
+
+    # check a window ending at midnight
+    def test_whole_day(self) -> None:
+        business_hours = datetime_helpers.BusinessHours(windows=[(datetime.time(0), datetime.time(0))])
+        assert business_hours.add_business_time(dt=datetime.datetime(2021, 4, 2, 12), delta=datetime.timedelta(hours=12)) == datetime.datetime(2021, 4, 3)
+        assert business_hours.add_business_time(dt=datetime.datetime(2021, 4, 2, 12), delta=datetime.timedelta(hours=13)) == datetime.datetime(2021, 4, 5, 1)
+        assert business_hours.business_time_between(start=datetime.date(2021, 4, 1), end=datetime.date(2021, 4, 8)) == datetime.timedelta(days=5)
+
+    # check that business time outside of the supported dates raises
+    def test_out_of_range(self, business_hours: datetime_helpers.BusinessHours) -> None:
+        with pytest.raises(BadRequestException):
+            business_hours.add_business_time(dt=datetime.datetime(2022, 12, 30, 12), delta=datetime.timedelta(days=1))
+        with pytest.raises(BadRequestException):
+            business_hours.add_business_time(dt=datetime.datetime(2019, 12, 31, 12), delta=datetime.timedelta(hours=1))
+        with pytest.raises(BadRequestException):
+            datetime_helpers.add_business_time(dt=datetime.datetime(1, 1, 1, 10), delta=-datetime.timedelta(hours=2))
+
+    # check the batch form
+    def test_many(self) -> None:
+        dts = [datetime.datetime(2021, 4, 2, 16), datetime.date(2021, 4, 3)]
+        assert datetime_helpers.add_business_time_many(dts=dts, delta=datetime.timedelta(hours=2)) == [datetime.datetime(2021, 4, 5, 10), datetime.datetime(2021, 4, 5, 11)]
@@ -0,0 +1,154 @@
+# pylint: disable=no-self-use
+import datetime
+import threading
+from typing import Callable
+from typing import Iterator
+from typing import List
+
+import pytest
+from freezegun import freeze_time  # type: ignore[import]
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+from datetime_helpers.caching import LRUCache
+from datetime_helpers.caching import ShardedCounters
+
+
+@pytest.fixture(name="cache_enabled")
+def fixture_cache_enabled() -> Iterator[None]:
+    datetime_helpers.enable_cache(maxsize=2)
+    yield
+    datetime_helpers.disable_cache()
+
+
+class CachingTestCase:
+    pass
+
+
+def _run_threads(target: Callable[[], None], count: int = 4) -> None:
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestShardedCounters(CachingTestCase):
+    # check that the shards add up, including the ones of finished threads folded in when a new thread starts counting
+    def test_totals(self) -> None:
+        counters = ShardedCounters(size=2)
+
+        def add() -> None:
+            for _ in range(1000):
+                counters.add(index=0)
+            counters.add(index=1, amount=5)
+
+        _run_threads(target=add)
+        assert counters.totals() == [4000, 20]
+        counters.add(index=0)
+        assert counters.totals() == [4001, 20]
+        assert len(counters._shards) == 1  # pylint: disable=protected-access
+        counters.reset()
+        assert counters.totals() == [0, 0]
+        counters.shard()[1] += 2
+        assert counters.totals() == [0, 2]
+
+
+class TestLRUCache(CachingTestCase):
+    # check hits, misses and evictions
+    def test_lru_cache(self) -> None:
+        cache = LRUCache(maxsize=2)
+        assert cache.get_or_compute(key="a", compute=lambda: 1) == 1
+        assert cache.get_or_compute(key="b", compute=lambda: 2) == 2
+        assert cache.get_or_compute(key="a", compute=lambda: 0) == 1
+        assert cache.get_or_compute(key="c", compute=lambda: 3) == 3  # evicts b, the least recently used
+        assert cache.get_or_compute(key="b", compute=lambda: 4) == 4
+        assert cache.info() == datetime_helpers.CacheInfo(hits=1, misses=4, evictions=2, maxsize=2, currsize=2)
+        cache.clear()
+        assert cache.info() == datetime_helpers.CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+
+    # check that referenced entries get a second chance before the oldest unreferenced one is evicted
+    def test_second_chance(self) -> None:
+        cache = LRUCache(maxsize=3)
+        for key in "abc":
+            cache.get_or_compute(key=key, compute=lambda: 0)
+        cache.get_or_compute(key="a", compute=lambda: 1)
+        cache.get_or_compute(key="b", compute=lambda: 1)
+        cache.get_or_compute(key="d", compute=lambda: 0)  # evicts c
+        assert [cache.get_or_compute(key=key, compute=lambda: 1) for key in "abdc"] == [0, 0, 0, 1]
+
+    # check that a new value is kept when every other entry has been hit since it was inserted
+    def test_new_value_is_kept(self) -> None:
+        cache = LRUCache(maxsize=2)
+        for key in "abab":
+            cache.get_or_compute(key=key, compute=lambda: 0)
+        cache.get_or_compute(key="c", compute=lambda: 0)
+        assert cache.get_or_compute(key="c", compute=lambda: 1) == 0
+        assert cache.info() == datetime_helpers.CacheInfo(hits=3, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    # check values and counters when the cache is shared between threads, hits do not take the lock
+    def test_threads(self) -> None:
+        cache = LRUCache(maxsize=8)
+        mismatches: List[int] = []
+
+        def get() -> None:
+            for i in range(2000):
+                key = i % 10
+                if cache.get_or_compute(key=key, compute=lambda: key * key) != key * key:  # pylint: disable=cell-var-from-loop
+                    mismatches.append(key)
+
+        _run_threads(target=get)
+        info = cache.info()
+        assert not mismatches
+        assert info.hits + info.misses == 8000
+        assert info.currsize <= 8
+        assert info.evictions <= info.misses - info.currsize
+
+    # check that an invalid maxsize is rejected
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(BadRequestException):
+            LRUCache(maxsize=0)
+
+
+class TestMonthCache(CachingTestCase):
+    # check that the cache is disabled by default
+    def test_disabled(self) -> None:
+        datetime_helpers.get_nth_business_day_of_month(n=2, dt=datetime.date(2021, 2, 5))
+        datetime_helpers.cache_clear()
+        assert datetime_helpers.cache_info() == datetime_helpers.CacheInfo(hits=0, misses=0, evictions=0, maxsize=0, currsize=0)
+
+    # check that month-level results are memoized
+    @pytest.mark.usefixtures("cache_enabled")
+    def test_enabled(self) -> None:
+        assert datetime_helpers.get_nth_business_day_of_month(n=2, dt=datetime.date(2021, 2, 5)) == datetime.date(2021, 2, 2)
+        assert datetime_helpers.get_nth_business_day_of_month(n=2, dt=datetime.date(2021, 2, 20)) == datetime.date(2021, 2, 2)
+        assert datetime_helpers.get_first_business_day_of_month(dt=datetime.date(2021, 5, 20)) == datetime.date(2021, 5, 3)
+        assert datetime_helpers.nth_business_day_of_month(year=2021, month=5, n=1) == datetime.date(2021, 5, 3)
+        assert datetime_helpers.get_first_business_day_of_month(dt=datetime.date(2021, 8, 20)) == datetime.date(2021, 8, 2)
+        assert datetime_helpers.cache_info() == datetime_helpers.CacheInfo(hits=2, misses=3, evictions=1, maxsize=2, currsize=2)
+        datetime_helpers.cache_clear()
+        assert datetime_helpers.cache_info().currsize == 0
+
+    # check that errors are raised and not cached
+    @pytest.mark.usefixtures("cache_enabled")
+    def test_errors_not_cached(self) -> None:
+        for _ in range(2):
+            with pytest.raises(BadRequestException):
+                datetime_helpers.nth_business_day_of_month(year=2021, month=2, n=21)
+        assert datetime_helpers.cache_info().currsize == 0
+
+    # check that the implicit today is resolved before the cache lookup
+    @pytest.mark.usefixtures("cache_enabled")
+    def test_today_default(self) -> None:
+        with freeze_time(time_to_freeze="2021-05-20"):
+            assert datetime_helpers.get_first_business_day_of_month() == datetime.date(2021, 5, 3)
+        with freeze_time(time_to_freeze="2021-08-20"):
+            assert datetime_helpers.get_first_business_day_of_month() == datetime.date(2021, 8, 2)
+        assert datetime_helpers.cache_info().misses == 2
+
+    # check that results for different calendars are kept apart
+    @pytest.mark.usefixtures("cache_enabled")
+    def test_calendar_in_key(self) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(holidays=[datetime.date(2021, 5, 3)], start_year=2021, end_year=2021)
+        assert datetime_helpers.nth_business_day_of_month(year=2021, month=5, n=1) == datetime.date(2021, 5, 3)
+        assert datetime_helpers.nth_business_day_of_month(year=2021, month=5, n=1, calendar=business_calendar) == datetime.date(2021, 5, 4)
@@ -0,0 +1,52 @@
+# pylint: disable=no-self-use
+import datetime
+
+import pytest
+
+import datetime_helpers
+
+
+class FormattingTestCase:
+    pass
+
+
+class TestCompiledFormat(FormattingTestCase):
+    # check that compiled formats agree with strftime
+    @pytest.mark.parametrize(
+        argnames="fmt",
+        argvalues=[
+            datetime_helpers.JSON_DATE_FORMAT,
+            datetime_helpers.DATE_FORMAT,
+            "%d/%m/%Y %H:%M",
+            "%Y",
+            "100%% %Y",
+            "no directives",
+            "",
+            "%A %d %B %Y",
+            "%Y-%m-%dT%H:%M:%S%z",
+            "trailing %",
+        ],
+    )
+    @pytest.mark.parametrize(
+        argnames="dt",
+        argvalues=[
+            datetime.datetime(2016, 4, 17, 3, 12, 34, 5678),
+            datetime.datetime(999, 1, 2, 3, 4, 5, 6),
+            datetime.datetime(1, 1, 1),
+            datetime.datetime(2016, 4, 17, 3, 12, 34, tzinfo=datetime.timezone.utc),
+            datetime.date(2016, 4, 17),
+        ],
+    )
+    def test_format_matches_strftime(self, fmt: str, dt: datetime.date) -> None:
+        assert datetime_helpers.compile_format(fmt=fmt).format(dt=dt) == dt.strftime(fmt)
+
+    # check the repr
+    def test_repr(self) -> None:
+        assert repr(datetime_helpers.compile_format(fmt="%Y")) == "CompiledFormat('%Y')"
+
+
+class TestCompileFormat(FormattingTestCase):
+    # check that compiled formats are cached by format string
+    def test_compile_format_is_cached(self) -> None:
+        assert datetime_helpers.compile_format("%Y-%m") is datetime_helpers.compile_format("%Y-%m")
+        assert datetime_helpers.compile_format.cache_info().maxsize == 128
@@ -0,0 +1,64 @@
+# pylint: disable=no-self-use
+import ast
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import datetime_helpers
+
+# cumulative microseconds `python -X importtime` may report for `import datetime_helpers`
+IMPORT_TIME_BUDGET_US = 20_000
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], check=True, capture_output=True, text=True).stderr
+
+
+class ImportTestCase:
+    pass
+
+
+class TestLazyImport(ImportTestCase):
+    # check that importing the package stays within the import time budget
+    def test_import_time_budget(self) -> None:
+        # the first run warms the bytecode cache, the fastest of a few runs filters out scheduler noise
+        timings = []
+        for _ in range(4):
+            line = next(line for line in _run(code="import datetime_helpers").splitlines() if line.endswith("| datetime_helpers"))
+            timings.append(int(line.split("|")[1]))
+        assert min(timings[1:]) < IMPORT_TIME_BUDGET_US
+
+    # check that the slow dependencies are only imported when needed
+    @pytest.mark.parametrize(argnames="module", argvalues=["http_exceptions", "importlib.metadata", "asyncio", "concurrent.futures", "datetime_helpers.utils"])
+    def test_import_is_lazy(self, module: str) -> None:
+        assert f" {module}\n" not in _run(code="import datetime_helpers") + "\n"
+
+    # check that http_exceptions is not imported until an error is raised
+    def test_exceptions_are_lazy(self) -> None:
+        assert " http_exceptions" not in _run(code="import datetime_helpers; datetime_helpers.create_date(year=2021, month=1, day=1)")
+        assert " http_exceptions" in _run(code="import datetime_helpers\ntry:\n    datetime_helpers.create_date(year=2021, month=13, day=1)\nexcept Exception:\n    pass")
+
+    # check that __version__ is resolved on first access
+    def test_version(self) -> None:
+        assert isinstance(datetime_helpers.__version__, str)
+
+    # check that every lazy export and submodule resolves
+    def test_exports(self) -> None:
+        for name in datetime_helpers.__all__:
+            assert getattr(datetime_helpers, name) is not None
+            assert name in dir(datetime_helpers)
+        assert datetime_helpers.utils.is_weekday is datetime_helpers.is_weekday
+
+    # check that unknown attributes still raise AttributeError
+    def test_unknown_attribute(self) -> None:
+        with pytest.raises(AttributeError):
+            datetime_helpers.does_not_exist  # type: ignore[attr-defined] # pylint: disable=pointless-statement
+
+    # check that the imports for type checkers match the lazy exports
+    def test_type_checking_imports_match_exports(self) -> None:
+        module = ast.parse(pathlib.Path(datetime_helpers.__file__).read_text())
+        type_checking = next(node for node in module.body if isinstance(node, ast.If) and isinstance(node.test, ast.Name) and node.test.id == "TYPE_CHECKING")
+        imported = {alias.name: node.module for node in type_checking.body if isinstance(node, ast.ImportFrom) and node.level == 1 for alias in node.names}
+        assert imported == datetime_helpers._EXPORTS  # pylint: disable=protected-access
@@ -0,0 +1,116 @@
+# pylint: disable=no-self-use
+import asyncio
+import datetime
+import threading
+from typing import Iterator
+from typing import List
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+from datetime_helpers import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def _restore() -> Iterator[None]:
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+class InstrumentationTestCase:
+    pass
+
+
+class TestInstrumentation(InstrumentationTestCase):
+    # check that calls and errors are counted per function
+    def test_snapshot(self) -> None:
+        instrumentation.enable()
+        assert instrumentation.is_enabled()
+        datetime_helpers.is_weekday(dt=datetime.date(2021, 2, 5))
+        datetime_helpers.is_weekday(dt=datetime.date(2021, 2, 6))
+        with pytest.raises(ValueError):
+            datetime_helpers.datetime_from_string(text="nope")
+        data = instrumentation.snapshot()
+        assert data["is_weekday"]["calls"] == 2
+        assert data["is_weekday"]["errors"] == 0
+        assert data["datetime_from_string"]["calls"] == 1
+        assert data["datetime_from_string"]["errors"] == 1
+        assert "is_weekend" not in data
+        buckets = data["is_weekday"]["buckets"]
+        assert list(buckets) == list(instrumentation.BUCKETS) + [float("inf")]
+        assert buckets[float("inf")] == 2
+        assert list(buckets.values()) == sorted(buckets.values())
+        assert data["is_weekday"]["total_seconds"] > 0
+        instrumentation.reset()
+        assert not instrumentation.snapshot()
+
+    # check that disable puts the originals back in the module and in the package, keeping the data
+    def test_disable(self) -> None:
+        original = datetime_helpers.is_weekday
+        instrumentation.enable(functions=["is_weekday"])
+        assert datetime_helpers.is_weekday is not original
+        assert datetime_helpers.utils.is_weekday is datetime_helpers.is_weekday
+        assert datetime_helpers.is_weekday.__wrapped__ is original  # type: ignore[attr-defined]
+        instrumentation.enable(functions=["is_weekday"])
+        assert datetime_helpers.is_weekday.__wrapped__ is original  # type: ignore[attr-defined]
+        datetime_helpers.is_weekday(dt=datetime.date(2021, 2, 5))
+        instrumentation.disable()
+        assert not instrumentation.is_enabled()
+        assert datetime_helpers.is_weekday is original
+        assert datetime_helpers.utils.is_weekday is original
+        datetime_helpers.is_weekday(dt=datetime.date(2021, 2, 5))
+        assert instrumentation.snapshot()["is_weekday"]["calls"] == 1
+
+    # check that only exported functions can be instrumented
+    @pytest.mark.parametrize(argnames="functions", argvalues=[["nope"], ["is_weekday", "BusinessCalendar"], ["DATE_FORMAT"]])
+    def test_unknown_functions(self, functions: List[str]) -> None:
+        with pytest.raises(BadRequestException):
+            instrumentation.enable(functions=functions)
+        assert not instrumentation.is_enabled()
+
+    # check that coroutine functions are awaited before the call is recorded
+    def test_async(self) -> None:
+        async def sleep(fail: bool) -> None:
+            await asyncio.sleep(0.01)
+            if fail:
+                raise ValueError("nope")
+
+        wrapper = instrumentation._wrap(name="sleep", function=sleep)  # pylint: disable=protected-access
+        asyncio.run(wrapper(fail=False))
+        with pytest.raises(ValueError):
+            asyncio.run(wrapper(fail=True))
+        data = instrumentation.snapshot()["sleep"]
+        assert (data["calls"], data["errors"]) == (2, 1)
+        assert data["total_seconds"] >= 0.02
+        assert data["buckets"][instrumentation.BUCKETS[0]] == 0
+
+    # check that the counts add up when called from several threads
+    def test_threads(self) -> None:
+        instrumentation.enable(functions=["is_weekend"])
+
+        def call() -> None:
+            for _ in range(1000):
+                datetime_helpers.is_weekend(dt=datetime.date(2021, 2, 5))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert instrumentation.snapshot()["is_weekend"]["calls"] == 4000
+
+    # check the Prometheus text exposition format
+    def test_prometheus_text(self) -> None:
+        instrumentation.enable(functions=["is_weekend"])
+        datetime_helpers.is_weekend(dt=datetime.date(2021, 2, 5))
+        lines = instrumentation.prometheus_text().splitlines()
+        assert "# TYPE datetime_helpers_calls_total counter" in lines
+        assert 'datetime_helpers_calls_total{function="is_weekend"} 1' in lines
+        assert 'datetime_helpers_errors_total{function="is_weekend"} 0' in lines
+        assert "# TYPE datetime_helpers_call_duration_seconds histogram" in lines
+        assert 'datetime_helpers_call_duration_seconds_bucket{function="is_weekend",le="+Inf"} 1' in lines
+        assert any(line.startswith('datetime_helpers_call_duration_seconds_bucket{function="is_weekend",le="1.28e-07"} ') for line in lines)
+        assert 'datetime_helpers_call_duration_seconds_count{function="is_weekend"} 1' in lines
+        assert any(line.startswith('datetime_helpers_call_duration_seconds_sum{function="is_weekend"} ') for line in lines)
@@ -0,0 +1,132 @@
+# pylint: disable=no-self-use
+import datetime
+import threading
+from typing import List
+from typing import Union
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+DT = datetime.datetime(2016, 4, 17, 3, 12, 34, 567000)
+
+
+class ParsingTestCase:
+    pass
+
+
+class TestParseAny(ParsingTestCase):
+    # check that each of the default formats is recognised
+    @pytest.mark.parametrize(
+        argnames="value,dt",
+        argvalues=[
+            ("2016-04-17T03:12:34.567000Z", DT),
+            ("2016-04-17", datetime.datetime(2016, 4, 17)),
+            (1460862754567, DT),
+            ("1460862754567", DT),
+            (-1, datetime.datetime(1969, 12, 31, 23, 59, 59, 999000)),
+            (0, datetime.datetime(1970, 1, 1)),
+            (131053363545670000, DT),
+            ("131053363545670000", DT),
+            (131053363545670005, DT),
+            # strptime is looser than the layouts the values are sniffed by
+            ("2016-4-17", datetime.datetime(2016, 4, 17)),
+            ("2016-04-17T03:12:34.567Z", DT),
+        ],
+    )
+    def test_parse_any(self, value: Union[str, int], dt: datetime.datetime) -> None:
+        assert datetime_helpers.parse_any(value=value) == dt
+
+    # check custom strptime formats alongside the pseudo formats
+    def test_custom_formats(self) -> None:
+        formats = ["%d/%m/%Y", "%d %B %Y", datetime_helpers.EPOCH_MILLIS]
+        assert datetime_helpers.parse_any(value="17/04/2016", formats=formats) == datetime.datetime(2016, 4, 17)
+        assert datetime_helpers.parse_any(value="17   april 2016", formats=formats) == datetime.datetime(2016, 4, 17)
+        assert datetime_helpers.parse_any(value=1460862754567, formats=formats) == DT
+
+    # check that a value matching none of the formats raises like datetime_from_string
+    @pytest.mark.parametrize(argnames="value", argvalues=["2016-04-31", "17/04/2016", "", "12345678901234567890123", True, 1.5, None, "１４６０８６２７５４５６７"])
+    def test_no_match(self, value: Union[str, int]) -> None:
+        with pytest.raises(ValueError):
+            datetime_helpers.parse_any(value=value)
+
+    # check that pseudo formats left out are not used
+    def test_formats_are_respected(self) -> None:
+        with pytest.raises(ValueError):
+            datetime_helpers.parse_any(value=131053363545670000, formats=[datetime_helpers.EPOCH_MILLIS])
+        with pytest.raises(ValueError):
+            datetime_helpers.parse_any(value="2016-04-17", formats=[datetime_helpers.JSON_DATE_FORMAT])
+
+    # check that an exception is raised without formats
+    def test_empty_formats(self) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.parse_any(value="2016-04-17", formats=[])
+
+
+class TestFormatDetector(ParsingTestCase):
+    # check the hit and miss counters
+    def test_counters(self) -> None:
+        detector = datetime_helpers.FormatDetector()
+        values: List[Union[str, int]] = ["2016-04-17T03:12:34.567000Z", "2016-04-17", "2016-04-18", 1460862754567, "1460862754567", 131053363545670000]
+        assert detector.parse_many(values=values) == [DT, datetime.datetime(2016, 4, 17), datetime.datetime(2016, 4, 18), DT, DT, DT]
+        with pytest.raises(ValueError):
+            detector.parse(value="nope")
+        assert detector.hits == {datetime_helpers.JSON_DATE_FORMAT: 1, datetime_helpers.DATE_FORMAT: 2, datetime_helpers.EPOCH_MILLIS: 2, datetime_helpers.WINDOWS_FILETIME: 1}
+        assert detector.misses == 1
+        detector.reset()
+        assert set(detector.hits.values()) == {0}
+        assert detector.misses == 0
+
+    # check that the formats move up the order as they match more often than the ones before them
+    def test_adaptive_order(self) -> None:
+        detector = datetime_helpers.FormatDetector(formats=["%Y-%m-%dT%H:%M", "%Y/%m/%d", "%d.%m.%Y"])
+        assert repr(detector) == "FormatDetector(formats=['%Y-%m-%dT%H:%M', '%Y/%m/%d', '%d.%m.%Y'])"
+        detector.parse(value="17.04.2016")
+        assert detector.formats == ["%Y-%m-%dT%H:%M", "%d.%m.%Y", "%Y/%m/%d"]
+        detector.parse(value="18.04.2016")
+        assert detector.formats == ["%d.%m.%Y", "%Y-%m-%dT%H:%M", "%Y/%m/%d"]
+        detector.parse(value="2016-04-17T03:12")
+        assert detector.formats == ["%d.%m.%Y", "%Y-%m-%dT%H:%M", "%Y/%m/%d"]
+        detector.reset()
+        assert detector.formats == ["%Y-%m-%dT%H:%M", "%Y/%m/%d", "%d.%m.%Y"]
+
+    # check that the literals of a format are matched case-insensitively like strptime does
+    def test_literals_are_case_insensitive(self) -> None:
+        detector = datetime_helpers.FormatDetector(formats=["%Y-%m-%dT%H:%M", "%Y%%%m"])
+        assert detector.parse(value="2016-04-17t03:12") == datetime.datetime(2016, 4, 17, 3, 12)
+        assert detector.parse(value="2016%04") == datetime.datetime(2016, 4, 1)
+
+    # check that hits which leave the order as it is do not take the lock
+    def test_hits_do_not_lock(self) -> None:
+        detector = datetime_helpers.FormatDetector(formats=["%Y-%m-%dT%H:%M", "%Y/%m/%d"])
+        for _ in range(3):
+            detector.parse(value="2016-04-17T03:12")
+        detector._lock = None  # type: ignore[assignment]  # pylint: disable=protected-access
+        for _ in range(3):
+            assert detector.parse(value="2016/04/17") == datetime.datetime(2016, 4, 17)
+        assert detector.formats == ["%Y-%m-%dT%H:%M", "%Y/%m/%d"]
+        detector._lock = threading.Lock()  # pylint: disable=protected-access
+        detector.parse(value="2016/04/17")
+        assert detector.formats == ["%Y/%m/%d", "%Y-%m-%dT%H:%M"]
+
+    # check that the counters add up when the detector is shared between threads
+    def test_threads(self) -> None:
+        detector = datetime_helpers.FormatDetector()
+        values: List[Union[str, int]] = ["2016-04-17", "04/17/2016", 1460862754567] * 200
+
+        def parse() -> None:
+            for value in values:
+                try:
+                    detector.parse(value=value)
+                except ValueError:
+                    pass
+
+        threads = [threading.Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert detector.hits[datetime_helpers.DATE_FORMAT] == 800
+        assert detector.hits[datetime_helpers.EPOCH_MILLIS] == 800
+        assert detector.misses == 800
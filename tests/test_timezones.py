@@ -0,0 +1,108 @@
+# pylint: disable=no-self-use
+import datetime
+import importlib
+import sys
+
+import pytest
+from http_exceptions.client_exceptions import BadRequestException
+
+import datetime_helpers
+
+UTC = datetime.timezone.utc
+
+
+def _has_zoneinfo() -> bool:
+    for name in ("zoneinfo", "backports.zoneinfo"):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        return True
+    return False
+
+
+requires_zoneinfo = pytest.mark.skipif(not _has_zoneinfo(), reason="zone names require zoneinfo, or backports.zoneinfo before Python 3.9")
+
+
+class TimezonesTestCase:
+    pass
+
+
+@requires_zoneinfo
+class TestGetZone(TimezonesTestCase):
+    # check that zones are resolved by name once and tzinfo objects are passed through
+    def test_get_zone(self) -> None:
+        london = datetime_helpers.get_zone(zone="Europe/London")
+        assert london is datetime_helpers.get_zone(zone="Europe/London")
+        assert datetime_helpers.get_zone(zone=london) is london
+        assert datetime_helpers.get_zone(zone="UTC") is UTC
+
+    # check that unknown zones are rejected
+    @pytest.mark.parametrize(argnames="zone", argvalues=["Mars/Olympus_Mons", "../etc/passwd"])
+    def test_unknown_zone(self, zone: str) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.get_zone(zone=zone)
+
+
+@requires_zoneinfo
+class TestToEpoch(TimezonesTestCase):
+    # check to_epoch for naive, aware and date inputs
+    @pytest.mark.parametrize(
+        argnames="dt,default_zone,seconds",
+        argvalues=[
+            (datetime.datetime(2016, 4, 17), "UTC", 1460851200),
+            (datetime.date(2016, 4, 17), "UTC", 1460851200),
+            (datetime.datetime(2016, 4, 17, 1), "Europe/London", 1460851200),  # BST
+            (datetime.datetime(2016, 1, 17), "Europe/London", 1452988800),  # GMT
+            (datetime.datetime(2016, 4, 17, 2, tzinfo=datetime.timezone(datetime.timedelta(hours=2))), "Asia/Tokyo", 1460851200),
+        ],
+    )
+    def test_to_epoch(self, dt: datetime.date, default_zone: str, seconds: float) -> None:
+        assert datetime_helpers.to_epoch(dt=dt, default_zone=default_zone) == seconds
+        assert datetime_helpers.to_epoch_many(dts=[dt, dt], default_zone=default_zone) == [seconds, seconds]
+
+    # check that the default zone matches datetime_to_seconds
+    def test_to_epoch_matches_datetime_to_seconds(self) -> None:
+        dt = datetime.datetime(1923, 9, 17, 3, 12, 34, 567891)
+        assert datetime_helpers.to_epoch(dt=dt) == datetime_helpers.datetime_to_seconds(dt=dt)
+
+
+@requires_zoneinfo
+class TestFromEpoch(TimezonesTestCase):
+    # check from_epoch across a daylight saving transition
+    def test_from_epoch(self) -> None:
+        before, after = datetime_helpers.from_epoch_many(seconds=[1459040399, 1459040400], zone="Europe/London")  # 2016-03-27 01:00 UTC
+        assert (before.hour, before.utcoffset()) == (0, datetime.timedelta(0))
+        assert (after.hour, after.utcoffset()) == (2, datetime.timedelta(hours=1))
+        assert datetime_helpers.from_epoch(seconds=1460851200) == datetime.datetime(2016, 4, 17, tzinfo=UTC)
+
+    # check the round trip through a zone
+    def test_round_trip(self) -> None:
+        seconds = list(range(1459000000, 1459100000, 997))
+        dts = datetime_helpers.from_epoch_many(seconds=seconds, zone="America/New_York")
+        assert datetime_helpers.to_epoch_many(dts=dts) == seconds
+
+
+@requires_zoneinfo
+class TestConvertZone(TimezonesTestCase):
+    # check convert_zone for naive and aware inputs
+    def test_convert_zone(self) -> None:
+        tokyo = datetime_helpers.convert_zone(dt=datetime.datetime(2016, 4, 17), zone="Asia/Tokyo")
+        assert tokyo.replace(tzinfo=None) == datetime.datetime(2016, 4, 17, 9)
+        new_york = datetime_helpers.convert_zone(dt=tokyo, zone="America/New_York", default_zone="Europe/London")
+        assert new_york.replace(tzinfo=None) == datetime.datetime(2016, 4, 16, 20)
+        assert new_york == tokyo
+        london = datetime_helpers.convert_zone_many(dts=[datetime.datetime(2016, 4, 17)], zone="Europe/London", default_zone="Asia/Tokyo")
+        assert london[0].replace(tzinfo=None) == datetime.datetime(2016, 4, 16, 16)
+
+
+class TestMissingZoneinfo(TimezonesTestCase):
+    # check that zone names raise a clear error without zoneinfo while UTC and tzinfo objects keep working
+    def test_missing_zoneinfo(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for name in ("zoneinfo", "backports", "backports.zoneinfo"):
+            monkeypatch.setitem(sys.modules, name, None)
+        datetime_helpers.timezones._get_zone_by_name.cache_clear()  # pylint: disable=protected-access
+        with pytest.raises(ImportError, match="pip install backports.zoneinfo"):
+            datetime_helpers.get_zone(zone="Europe/Paris")
+        assert datetime_helpers.get_zone(zone="UTC") is UTC
+        assert datetime_helpers.to_epoch(dt=datetime.datetime(1970, 1, 1, 2), default_zone=datetime.timezone(datetime.timedelta(hours=2))) == 0
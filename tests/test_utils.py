@@ -1,6 +1,12 @@
 # pylint: disable=no-self-use
+import calendar
 import datetime
+import random
+from array import array
+from typing import Any
+from typing import List
 from typing import Optional
+from typing import Tuple
 
 import pytest
 from freezegun import freeze_time  # type: ignore[import]
@@ -47,6 +53,85 @@ class TestCreateDatetime(DatetimeHelpersTestCase):
             datetime_helpers.create_datetime(year='a', month='a', day='a')  # type: ignore[arg-type]
 
 
+def _create_date_or_none(year: Any, month: Any, day: Any) -> Optional[datetime.date]:
+    try:
+        return datetime_helpers.create_date(year=year, month=month, day=day)
+    except BadRequestException:
+        return None
+
+
+# edge values for every field, including ones the date constructor rejects by type
+FIELD_VALUES: List[Any] = [-1, 0, 1, 2, 12, 13, 28, 29, 30, 31, 32, 1900, 2000, 2021, 9999, 10000, True, "1", 1.0, None]
+
+
+class TestTryCreateDate(DatetimeHelpersTestCase):
+    # check try_create_date against create_date for every combination of edge values
+    def test_try_create_date_matches_create_date(self) -> None:
+        for year in FIELD_VALUES:
+            for month in FIELD_VALUES:
+                for day in FIELD_VALUES:
+                    assert datetime_helpers.try_create_date(year=year, month=month, day=day) == _create_date_or_none(year=year, month=month, day=day)
+
+    # check that integer-like values are accepted like the date constructor does
+    def test_try_create_date_index(self) -> None:
+        assert datetime_helpers.try_create_date(year=2021, month=2, day=datetime_helpers.Weekday.SUNDAY) == datetime.date(2021, 2, 6)
+
+    # check try_create_datetime
+    @pytest.mark.parametrize(
+        argnames="fields,dt",
+        argvalues=[
+            ((2021, 2, 6), datetime.datetime(2021, 2, 6)),
+            ((2021, 2, 6, 23, 59, 59, 999999), datetime.datetime(2021, 2, 6, 23, 59, 59, 999999)),
+            ((2021, 2, 6, None, 3), datetime.datetime(2021, 2, 6, 0, 3)),
+            ((2021, 2, 6, True), datetime.datetime(2021, 2, 6, 1)),
+            ((2021, 2, 29), None),
+            ((2021, 2, 6, 24), None),
+            ((2021, 2, 6, 0, 60), None),
+            ((2021, 2, 6, 0, 0, -1), None),
+            ((2021, 2, 6, 0, 0, 0, 1000000), None),
+            ((2021, 2, 6, 1.0), None),
+        ],
+    )
+    def test_try_create_datetime(self, fields: Tuple[Any, ...], dt: Optional[datetime.datetime]) -> None:
+        assert datetime_helpers.try_create_datetime(*fields) == dt
+
+
+class TestValidateDates(DatetimeHelpersTestCase):
+    # check the dates, the error bitmap and the reason codes
+    def test_validate_dates(self) -> None:
+        rows: List[Any] = [(2020, 2, 29), (2021, 2, 29), (0, 1, 1), (2021, 13, 1), (2021, 4, 31), ("2021", 1, 1), (2021, 1), None, (2000, 2, 29), (9999, 12, 31)]
+        validation = datetime_helpers.validate_dates(rows=rows)
+        date_error = datetime_helpers.DateError
+        assert list(validation.reasons) == [
+            date_error.VALID,
+            date_error.DAY_OUT_OF_RANGE,
+            date_error.YEAR_OUT_OF_RANGE,
+            date_error.MONTH_OUT_OF_RANGE,
+            date_error.DAY_OUT_OF_RANGE,
+            date_error.INVALID_TYPE,
+            date_error.INVALID_TYPE,
+            date_error.INVALID_TYPE,
+            date_error.VALID,
+            date_error.VALID,
+        ]
+        assert validation.dates() == [datetime.date(2020, 2, 29), None, None, None, None, None, None, None, datetime.date(2000, 2, 29), datetime.date(9999, 12, 31)]
+        assert validation.invalid_rows() == [1, 2, 3, 4, 5, 6, 7]
+        assert validation.errors == bytearray([0b11111110, 0b00])
+        assert list(validation.ordinals)[:2] == [datetime.date(2020, 2, 29).toordinal(), 0]
+
+    # check validate_dates against create_date
+    def test_validate_dates_matches_create_date(self) -> None:
+        rows = [(year, month, day) for year in FIELD_VALUES for month in FIELD_VALUES[:12] for day in FIELD_VALUES[:12]]
+        validation = datetime_helpers.validate_dates(rows=rows)
+        assert validation.dates() == [_create_date_or_none(year=year, month=month, day=day) for year, month, day in rows]
+        for row, date in enumerate(validation.dates()):
+            assert bool(validation.errors[row >> 3] & 1 << (row & 7)) == (date is None)
+
+    # check that no rows give empty results
+    def test_validate_dates_empty(self) -> None:
+        assert datetime_helpers.validate_dates(rows=[]) == datetime_helpers.DateValidation(ordinals=array("i"), errors=bytearray(), reasons=array("B"))
+
+
 class TestGetPreviousBusinessDay(DatetimeHelpersTestCase):
     # check that we get the previous business day for default today
     @freeze_time(time_to_freeze="2012-01-14")
@@ -157,6 +242,51 @@ class TestDatetimeFromString(DatetimeHelpersTestCase):
         assert datetime_helpers.datetime_from_string(text=text, **kwargs) == dt
 
 
+class TestDatetimeFromStringFastPath(DatetimeHelpersTestCase):
+    # check that the fast path agrees with strptime, including on input strptime rejects or parses leniently
+    @pytest.mark.parametrize(
+        argnames="text,datetime_format",
+        argvalues=[
+            ("2016-04-17T03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-02-30T03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.5678Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17 03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.56789aZ", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.567891", datetime_helpers.JSON_DATE_FORMAT),
+            ("0000-04-17T03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            # fromisoformat reads these as UTC offsets or lenient fractions
+            ("2016-04-17T03:12:34.567+08Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.56789ZZ", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.5-0891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.567-08:Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:34.123+0000Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("２０１６-04-17T03:12:34.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T03:12:60.567891Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17T24:00:00.000000Z", datetime_helpers.JSON_DATE_FORMAT),
+            ("2016-04-17", datetime_helpers.DATE_FORMAT),
+            ("2016-4-17", datetime_helpers.DATE_FORMAT),
+            ("2016-04-1a", datetime_helpers.DATE_FORMAT),
+            ("２０１６-04-17", datetime_helpers.DATE_FORMAT),
+            ("2016-04-1 ", datetime_helpers.DATE_FORMAT),
+            ("2016-13-17", datetime_helpers.DATE_FORMAT),
+            ("20160417", datetime_helpers.DATE_FORMAT),
+            ("2016-04-17T00:00", datetime_helpers.DATE_FORMAT),
+            ("", datetime_helpers.DATE_FORMAT),
+            (None, datetime_helpers.DATE_FORMAT),
+            (b"2016-04-17", datetime_helpers.DATE_FORMAT),
+        ],
+    )
+    def test_datetime_from_string_matches_strptime(self, text: str, datetime_format: str) -> None:
+        try:
+            expected = datetime.datetime.strptime(text, datetime_format)
+        except (ValueError, TypeError) as exception:
+            with pytest.raises(type(exception)) as exc_info:
+                datetime_helpers.datetime_from_string(text=text, datetime_format=datetime_format)
+            assert str(exc_info.value) == str(exception)
+        else:
+            assert datetime_helpers.datetime_from_string(text=text, datetime_format=datetime_format) == expected
+
+
 class TestGetDayOfWeek(DatetimeHelpersTestCase):
     # check get_day_of_week
     @pytest.mark.parametrize(
@@ -175,6 +305,31 @@ class TestGetDayOfWeek(DatetimeHelpersTestCase):
         assert datetime_helpers.get_day_of_week(dt=dt) == day_of_week
 
 
+class TestGetWeekday(DatetimeHelpersTestCase):
+    # check get_weekday
+    @pytest.mark.parametrize(
+        argnames="dt,weekday",
+        argvalues=[
+            (datetime.date(2021, 2, 1), datetime_helpers.Weekday.MONDAY),
+            (datetime.date(2021, 2, 5), datetime_helpers.Weekday.FRIDAY),
+            (datetime.date(2021, 2, 7), datetime_helpers.Weekday.SUNDAY),
+        ],
+    )
+    def test_get_weekday(self, dt: datetime.date, weekday: datetime_helpers.Weekday) -> None:
+        assert datetime_helpers.get_weekday(dt=dt) is weekday
+        assert datetime_helpers.get_weekday(dt=dt) == dt.weekday()
+
+    # check that Weekday and DayOfWeek line up
+    def test_weekday_matches_day_of_week(self) -> None:
+        for weekday in datetime_helpers.Weekday:
+            assert getattr(datetime_helpers.DayOfWeek, weekday.name) == weekday.name.capitalize()
+
+    # check that the day names do not depend on the process locale
+    def test_get_day_of_week_ignores_locale(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(calendar, "day_name", ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"])
+        assert datetime_helpers.get_day_of_week(dt=datetime.date(2021, 2, 1)) == datetime_helpers.DayOfWeek.MONDAY
+
+
 # see https://www.timeanddate.com/calendar/?year=2021&country=9
 class TestIsWeekday(DatetimeHelpersTestCase):
     # check is_weekday
@@ -274,6 +429,254 @@ class TestGetNthBusinessDayOfMonth(DatetimeHelpersTestCase):
             datetime_helpers.get_nth_business_day_of_month(dt=datetime.date(2021, 2, 5), n=21)
 
 
+def _naive_add_business_days(dt: datetime.date, n: int) -> datetime.date:  # pylint: disable=invalid-name
+    step = datetime.timedelta(days=1 if n > 0 else -1)
+    for _ in range(abs(n)):
+        dt += step
+        while dt.weekday() > 4:
+            dt += step
+    return dt
+
+
+class TestAddBusinessDays(DatetimeHelpersTestCase):
+    # check add_business_days against day by day stepping for every weekday
+    @pytest.mark.parametrize(argnames="n", argvalues=[-12, -6, -5, -4, -1, 0, 1, 2, 4, 5, 6, 12, 261])
+    def test_add_business_days(self, n: int) -> None:  # pylint: disable=invalid-name
+        for offset in range(14):
+            dt = datetime.date(2021, 2, 1) + datetime.timedelta(days=offset)
+            assert datetime_helpers.add_business_days(dt=dt, n=n) == _naive_add_business_days(dt=dt, n=n)
+
+    # check a T+2 settlement over a weekend
+    def test_add_business_days_settlement(self) -> None:
+        assert datetime_helpers.add_business_days(dt=datetime.date(2021, 2, 4), n=2) == datetime.date(2021, 2, 8)
+
+
+class TestBusinessDaysBetween(DatetimeHelpersTestCase):
+    # check business_days_between against a day by day count
+    def test_business_days_between(self) -> None:
+        start = datetime.date(2021, 2, 1)
+        for start_offset in range(7):
+            for length in range(-15, 15):
+                a = start + datetime.timedelta(days=start_offset)
+                b = a + datetime.timedelta(days=length)
+                expected = sum(1 for i in range(abs(length)) if (min(a, b) + datetime.timedelta(days=i)).weekday() < 5)
+                assert datetime_helpers.business_days_between(start=a, end=b) == (expected if length >= 0 else -expected)
+
+    # check the number of business days in 2021
+    def test_business_days_between_year(self) -> None:
+        assert datetime_helpers.business_days_between(start=datetime.date(2021, 1, 1), end=datetime.date(2022, 1, 1)) == 261
+
+
+class TestNthBusinessDayOfMonth(DatetimeHelpersTestCase):
+    # check nth_business_day_of_month
+    @pytest.mark.parametrize(
+        argnames="year,month,n,nth_business_day_of_month",
+        argvalues=[
+            (2021, 5, 1, datetime.date(2021, 5, 3)),
+            (2021, 5, 21, datetime.date(2021, 5, 31)),
+            (2021, 8, 1, datetime.date(2021, 8, 2)),
+            (2021, 2, 20, datetime.date(2021, 2, 26)),
+        ],
+    )
+    def test_nth_business_day_of_month(self, year: int, month: int, n: int, nth_business_day_of_month: datetime.date) -> None:  # pylint: disable=invalid-name
+        assert datetime_helpers.nth_business_day_of_month(year=year, month=month, n=n) == nth_business_day_of_month
+
+    # check that an exception is raised if the nth business day exceeds the month
+    def test_nth_business_day_exceeds_month(self) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.nth_business_day_of_month(year=2021, month=2, n=21)
+
+    # check that an exception is raised for an invalid month
+    def test_nth_business_day_invalid_month(self) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.nth_business_day_of_month(year=2021, month=13, n=1)
+
+
+class TestIterBusinessDays(DatetimeHelpersTestCase):
+    # check iter_business_days against a day by day scan starting on every weekday
+    def test_iter_business_days(self) -> None:
+        start = datetime.date(2021, 2, 1)
+        for start_offset in range(7):
+            for length in range(-3, 22):
+                a = start + datetime.timedelta(days=start_offset)
+                b = a + datetime.timedelta(days=length)
+                expected = [a + datetime.timedelta(days=i) for i in range(max(length, 0)) if (a + datetime.timedelta(days=i)).weekday() < 5]
+                assert list(datetime_helpers.iter_business_days(start=a, end=b)) == expected
+
+    # check that the dates are produced lazily
+    def test_iter_business_days_is_lazy(self) -> None:
+        business_days = datetime_helpers.iter_business_days(start=datetime.date(1, 1, 1), end=datetime.date(9999, 12, 31))
+        assert next(business_days) == datetime.date(1, 1, 1)
+        assert next(business_days) == datetime.date(1, 1, 2)
+
+
+class TestBusinessDaysInMonth(DatetimeHelpersTestCase):
+    # check business_days_in_month
+    @pytest.mark.parametrize(
+        argnames="year,month,days",
+        argvalues=[
+            (2021, 2, [1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19, 22, 23, 24, 25, 26]),
+            (2020, 2, [3, 4, 5, 6, 7, 10, 11, 12, 13, 14, 17, 18, 19, 20, 21, 24, 25, 26, 27, 28]),
+            (2016, 2, [1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19, 22, 23, 24, 25, 26, 29]),
+            (9999, 12, [1, 2, 3, 6, 7, 8, 9, 10, 13, 14, 15, 16, 17, 20, 21, 22, 23, 24, 27, 28, 29, 30, 31]),
+        ],
+    )
+    def test_business_days_in_month(self, year: int, month: int, days: List[int]) -> None:
+        business_days = datetime_helpers.business_days_in_month(year=year, month=month)
+        assert business_days.typecode == "H"
+        assert list(business_days) == days
+
+    # check that an exception is raised for an invalid month
+    def test_business_days_in_month_invalid_month(self) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.business_days_in_month(year=2021, month=13)
+
+    # check month_business_day_table against nth_business_day_of_month
+    @pytest.mark.parametrize(argnames="year", argvalues=[1900, 2000, 2021, 2024])
+    def test_month_business_day_table(self, year: int) -> None:
+        table = datetime_helpers.month_business_day_table(year=year)
+        assert len(table) == 12
+        assert sum(len(days) for days in table) == datetime_helpers.business_days_between(start=datetime.date(year, 1, 1), end=datetime.date(year + 1, 1, 1))
+        for month, days in enumerate(table, start=1):
+            assert [datetime_helpers.nth_business_day_of_month(year=year, month=month, n=n).day for n in range(1, len(days) + 1)] == list(days)
+
+
+def _month_days(year: int, month: int) -> List[datetime.date]:
+    return [datetime.date(year, month, day) for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+
+
+# years inside and outside of the default month table, around the ends of both
+MONTH_TABLE_YEARS = [1, 4, 1600, 1899, 1900, 1901, 2000, 2021, 2100, 2199, 2200, 9999]
+
+
+class TestMonthTable(DatetimeHelpersTestCase):
+    # check every business day of month lookup against a day by day scan, inside and outside of the table
+    @pytest.mark.parametrize(argnames="year", argvalues=MONTH_TABLE_YEARS)
+    def test_business_days_of_month(self, year: int) -> None:
+        for month in range(1, 13):
+            business_days = [dt for dt in _month_days(year=year, month=month) if dt.weekday() < 5]
+            assert list(datetime_helpers.business_days_in_month(year=year, month=month)) == [dt.day for dt in business_days]
+            assert datetime_helpers.last_business_day_of_month(year=year, month=month) == business_days[-1]
+            for n, dt in enumerate(business_days, start=1):  # pylint: disable=invalid-name
+                assert datetime_helpers.nth_business_day_of_month(year=year, month=month, n=n) == dt
+            for n in (-30, 0, len(business_days) + 1, 40):  # pylint: disable=invalid-name
+                with pytest.raises(BadRequestException):
+                    datetime_helpers.nth_business_day_of_month(year=year, month=month, n=n)
+
+    # check that changing the range of the table keeps the results
+    def test_set_month_table_range(self) -> None:
+        try:
+            datetime_helpers.set_month_table_range(start_year=2021, end_year=2021)
+            for year in (2020, 2021, 2022):
+                assert [datetime_helpers.month_end(dt=datetime.date(year, month, 1)) for month in range(1, 13)] == [_month_days(year=year, month=month)[-1] for month in range(1, 13)]
+            datetime_helpers.set_month_table_range(start_year=1, end_year=9999)
+            assert datetime_helpers.last_business_day_of_month(year=9999, month=12) == datetime.date(9999, 12, 31)
+        finally:
+            datetime_helpers.set_month_table_range(start_year=datetime_helpers.utils.MONTH_TABLE_START_YEAR, end_year=datetime_helpers.utils.MONTH_TABLE_END_YEAR)
+
+    # check that an exception is raised for an invalid range
+    @pytest.mark.parametrize(argnames="start_year,end_year", argvalues=[(2022, 2021), (0, 2021), (2021, 10000)])
+    def test_set_month_table_range_invalid(self, start_year: int, end_year: int) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.set_month_table_range(start_year=start_year, end_year=end_year)
+        assert datetime_helpers.month_end(dt=datetime.date(2021, 2, 1)) == datetime.date(2021, 2, 28)
+
+    # check that an exception is raised for an invalid month
+    @pytest.mark.parametrize(argnames="year,month", argvalues=[(2021, 0), (2021, 13), (0, 1), (10000, 1)])
+    def test_invalid_month(self, year: int, month: int) -> None:
+        with pytest.raises(BadRequestException):
+            datetime_helpers.last_business_day_of_month(year=year, month=month)
+
+
+class TestGetLastBusinessDayOfMonth(DatetimeHelpersTestCase):
+    # check that we get the last business day of the current month for default today
+    @freeze_time(time_to_freeze="2021-07-14")
+    def test_defaults(self) -> None:
+        assert datetime_helpers.get_last_business_day_of_month() == datetime.date(2021, 7, 30)
+
+    # check get_last_business_day_of_month for months ending on each day of the week
+    @pytest.mark.parametrize(
+        argnames="dt,last_business_day_of_month",
+        argvalues=[
+            (datetime.date(2021, 2, 1), datetime.date(2021, 2, 26)),  # ends on a Sunday
+            (datetime.date(2021, 3, 31), datetime.date(2021, 3, 31)),  # ends on a Wednesday
+            (datetime.datetime(2021, 7, 1, 12), datetime.date(2021, 7, 30)),  # ends on a Saturday
+            (datetime.date(2021, 4, 15), datetime.date(2021, 4, 30)),  # ends on a Friday
+            (datetime.date(2020, 2, 29), datetime.date(2020, 2, 28)),  # ends on a Saturday, leap year
+        ],
+    )
+    def test_get_last_business_day_of_month(self, dt: datetime.date, last_business_day_of_month: datetime.date) -> None:
+        assert datetime_helpers.get_last_business_day_of_month(dt=dt) == last_business_day_of_month
+
+    # check the last business day with a holiday-aware calendar
+    def test_calendar(self) -> None:
+        business_calendar = datetime_helpers.BusinessCalendar(holidays=[datetime.date(2021, 12, 31), datetime.date(2021, 12, 30)], start_year=2021, end_year=2021)
+        assert datetime_helpers.get_last_business_day_of_month(dt=datetime.date(2021, 12, 1), calendar=business_calendar) == datetime.date(2021, 12, 29)
+        assert datetime_helpers.last_business_day_of_month(year=2021, month=2, calendar=business_calendar) == datetime.date(2021, 2, 26)
+        holidays = _month_days(year=2021, month=2)
+        with pytest.raises(BadRequestException):
+            datetime_helpers.BusinessCalendar(holidays=holidays, start_year=2021, end_year=2021).last_business_day_of_month(year=2021, month=2)
+
+
+class TestPeriodBoundaries(DatetimeHelpersTestCase):
+    # check month_start, month_end, quarter_start and quarter_end against the days of each month
+    @pytest.mark.parametrize(argnames="year", argvalues=MONTH_TABLE_YEARS)
+    def test_period_boundaries(self, year: int) -> None:
+        for month in range(1, 13):
+            first_month_of_quarter = month - (month - 1) % 3
+            for dt in _month_days(year=year, month=month)[::9] + [datetime.datetime(year, month, 1, 23, 59)]:
+                assert datetime_helpers.month_start(dt=dt) == datetime.date(year, month, 1)
+                assert datetime_helpers.month_end(dt=dt) == _month_days(year=year, month=month)[-1]
+                assert datetime_helpers.quarter_start(dt=dt) == datetime.date(year, first_month_of_quarter, 1)
+                assert datetime_helpers.quarter_end(dt=dt) == _month_days(year=year, month=first_month_of_quarter + 2)[-1]
+
+    # check that the periods default to today
+    @freeze_time(time_to_freeze="2020-02-14")
+    def test_defaults(self) -> None:
+        assert datetime_helpers.month_start() == datetime.date(2020, 2, 1)
+        assert datetime_helpers.month_end() == datetime.date(2020, 2, 29)
+        assert datetime_helpers.quarter_start() == datetime.date(2020, 1, 1)
+        assert datetime_helpers.quarter_end() == datetime.date(2020, 3, 31)
+
+
+class TestAddMonths(DatetimeHelpersTestCase):
+    # check add_months
+    @pytest.mark.parametrize(
+        argnames="dt,n,end_of_month,expected_dt",
+        argvalues=[
+            (datetime.date(2021, 1, 15), 1, False, datetime.date(2021, 2, 15)),
+            (datetime.date(2021, 1, 31), 1, False, datetime.date(2021, 2, 28)),
+            (datetime.date(2020, 1, 31), 1, False, datetime.date(2020, 2, 29)),
+            (datetime.date(2021, 2, 28), 1, False, datetime.date(2021, 3, 28)),
+            (datetime.date(2021, 2, 28), 1, True, datetime.date(2021, 3, 31)),
+            (datetime.date(2020, 2, 28), 1, True, datetime.date(2020, 3, 28)),
+            (datetime.date(2021, 4, 30), -2, True, datetime.date(2021, 2, 28)),
+            (datetime.date(2021, 11, 30), 3, True, datetime.date(2022, 2, 28)),
+            (datetime.date(2021, 3, 31), -13, False, datetime.date(2020, 2, 29)),
+            (datetime.date(2021, 3, 31), 0, False, datetime.date(2021, 3, 31)),
+            (datetime.date(2021, 12, 15), 1, False, datetime.date(2022, 1, 15)),
+            (datetime.date(2021, 1, 15), -1, False, datetime.date(2020, 12, 15)),
+            (datetime.date(1, 1, 31), 119987, False, datetime.date(9999, 12, 31)),
+            (datetime.datetime(2021, 1, 31, 9, 30), 1, False, datetime.datetime(2021, 2, 28, 9, 30)),
+        ],
+    )
+    def test_add_months(self, dt: datetime.date, n: int, end_of_month: bool, expected_dt: datetime.date) -> None:  # pylint: disable=invalid-name
+        result = datetime_helpers.add_months(dt=dt, n=n, end_of_month=end_of_month)
+        assert result == expected_dt
+        assert type(result) is type(dt)  # pylint: disable=unidiomatic-typecheck
+
+    # check that aware datetimes keep their tzinfo
+    def test_add_months_aware(self) -> None:
+        dt = datetime.datetime(2021, 1, 31, 9, 30, tzinfo=datetime.timezone.utc)
+        assert datetime_helpers.add_months(dt=dt, n=1) == datetime.datetime(2021, 2, 28, 9, 30, tzinfo=datetime.timezone.utc)
+
+    # check that an exception is raised outside of the supported years
+    @pytest.mark.parametrize(argnames="dt,n", argvalues=[(datetime.date(9999, 12, 1), 1), (datetime.date(1, 1, 1), -1)])
+    def test_add_months_out_of_range(self, dt: datetime.date, n: int) -> None:  # pylint: disable=invalid-name
+        with pytest.raises(BadRequestException):
+            datetime_helpers.add_months(dt=dt, n=n)
+
+
 class TestDatetimeFromWindowsFiletime(DatetimeHelpersTestCase):
     # check datetime_from_windows_filetime
     @pytest.mark.parametrize(
@@ -319,6 +722,14 @@ class TestDatetimeToSeconds(DatetimeHelpersTestCase):
         assert datetime_helpers.datetime_to_seconds(dt=dt) == seconds
 
 
+class TestDatetimeToSecondsAware(DatetimeHelpersTestCase):
+    # check that aware datetimes are converted using their offset
+    def test_datetime_to_seconds_aware(self) -> None:
+        dt = datetime.datetime(2016, 4, 17, 2, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        assert datetime_helpers.datetime_to_seconds(dt=dt) == 1460851200
+        assert datetime_helpers.datetime_to_millis(dt=dt) == 1460851200000
+
+
 class TestDatetimeToAndFromSecondsRoundTrip(DatetimeHelpersTestCase):
     # check datetime_to_seconds, datetime_from_seconds round trip
     @pytest.mark.parametrize(
@@ -406,6 +817,75 @@ class TestDatetimeToAndFromMillisRoundTrip(DatetimeHelpersTestCase):
         assert datetime_helpers.datetime_to_millis(dt=datetime_helpers.datetime_from_millis(millis=millis)) == millis
 
 
+def _random_datetimes(count: int, seed: int) -> List[datetime.datetime]:
+    # property style inputs spread over the whole datetime range, seeded so failures reproduce
+    rng = random.Random(seed)
+    span = datetime.datetime.max - datetime.datetime.min
+    span_micros = (span.days * 86_400 + span.seconds) * 1_000_000 + span.microseconds
+    return [datetime.datetime.min + datetime.timedelta(microseconds=rng.randrange(span_micros)) for _ in range(count)]
+
+
+class TestDatetimeToAndFromMicros(DatetimeHelpersTestCase):
+    # check datetime_to_micros against exact timedelta arithmetic
+    @pytest.mark.parametrize(
+        argnames="dt,micros",
+        argvalues=[
+            (datetime.datetime(1970, 1, 1), 0),
+            (datetime.datetime(1969, 12, 31, 23, 59, 59, 999999), -1),
+            (datetime.datetime(2016, 4, 17, 3, 12, 34, 567891), 1460862754567891),
+            (datetime.date(2016, 4, 17), 1460851200000000),
+            (datetime.datetime(9999, 12, 31, 23, 59, 59, 999999), 253402300799999999),
+            (datetime.datetime(1, 1, 1), -62135596800000000),
+            (datetime.datetime(2016, 4, 17, 5, 12, 34, 567891, tzinfo=datetime.timezone(datetime.timedelta(hours=2))), 1460862754567891),
+        ],
+    )
+    def test_datetime_to_micros(self, dt: datetime.date, micros: int) -> None:
+        assert datetime_helpers.datetime_to_micros(dt=dt) == micros
+        assert datetime_helpers.datetime_to_nanos(dt=dt) == micros * 1000
+        assert datetime_helpers.datetime_from_micros(micros=micros) == datetime_helpers.datetime_from_date(dt=dt).replace(tzinfo=None) - (
+            datetime_helpers.datetime_from_date(dt=dt).utcoffset() or datetime.timedelta()
+        )
+
+    # check the round trips over the whole datetime range
+    def test_round_trips(self) -> None:
+        for dt in _random_datetimes(count=2000, seed=13):
+            micros = datetime_helpers.datetime_to_micros(dt=dt)
+            assert micros == (dt - datetime.datetime(1970, 1, 1)) // datetime.timedelta(microseconds=1)
+            assert datetime_helpers.datetime_from_micros(micros=micros) == dt
+            assert datetime_helpers.datetime_from_nanos(nanos=datetime_helpers.datetime_to_nanos(dt=dt)) == dt
+            assert datetime_helpers.datetime_from_nanos(nanos=datetime_helpers.datetime_to_nanos(dt=dt) + 999) == dt
+            if dt.year >= 1601:
+                assert datetime_helpers.datetime_from_windows_filetime(windows_filetime=datetime_helpers.datetime_to_windows_filetime(dt=dt)) == dt
+
+    # check that millis are exact and truncated towards zero
+    def test_datetime_to_millis_exact(self) -> None:
+        assert datetime_helpers.datetime_to_millis(dt=datetime.datetime(9999, 12, 31, 23, 59, 59, 999999)) == 253402300799999
+        assert datetime_helpers.datetime_to_millis(dt=datetime.datetime(1969, 12, 31, 23, 59, 59, 999500)) == 0
+        for dt in _random_datetimes(count=2000, seed=17):
+            micros = datetime_helpers.datetime_to_micros(dt=dt)
+            expected = abs(micros) // 1000
+            assert datetime_helpers.datetime_to_millis(dt=dt) == (expected if micros >= 0 else -expected)
+
+
+class TestDatetimeToWindowsFiletime(DatetimeHelpersTestCase):
+    # check datetime_to_windows_filetime
+    @pytest.mark.parametrize(
+        argnames="dt,windows_filetime",
+        argvalues=[
+            (datetime.datetime(1601, 1, 1), 0),
+            (datetime.datetime(1970, 1, 1, 0, 0), 116444736000000000),
+            (datetime.datetime(2009, 7, 25, 23, 0, 0, 100), 128930364000001000),
+        ],
+    )
+    def test_datetime_to_windows_filetime(self, dt: datetime.datetime, windows_filetime: int) -> None:
+        assert datetime_helpers.datetime_to_windows_filetime(dt=dt) == windows_filetime
+
+    # check that sub-microsecond ticks round to the nearest microsecond, half to even
+    @pytest.mark.parametrize(argnames="ticks,microsecond", argvalues=[(4, 0), (5, 0), (6, 1), (14, 1), (15, 2), (25, 2)])
+    def test_datetime_from_windows_filetime_rounding(self, ticks: int, microsecond: int) -> None:
+        assert datetime_helpers.datetime_from_windows_filetime(windows_filetime=116444736000000000 + ticks) == datetime.datetime(1970, 1, 1, 0, 0, 0, microsecond)
+
+
 class TestDatetimeFromDate(DatetimeHelpersTestCase):
     # check datetime_from_date
     @pytest.mark.parametrize(
@@ -0,0 +1,110 @@
+# pylint: disable=no-self-use
+import datetime
+import random
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+import datetime_helpers
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("datetime_helpers.vectorized")
+
+DATETIMES = [
+    datetime.datetime(1923, 9, 17),
+    datetime.datetime(1969, 12, 31, 23, 59, 59, 999500),
+    datetime.datetime(1970, 1, 1),
+    datetime.datetime(1970, 1, 1, 0, 0, 1),
+    datetime.datetime(2016, 4, 17, 3, 12, 34, 567891),
+]
+
+
+# the seconds of datetime.min and datetime.max from the epoch
+MIN_SECONDS = -62135596800.0
+MAX_SECONDS = 253402300799.0
+
+
+def _random_datetimes(count: int, seed: int) -> List[datetime.datetime]:
+    # spread over the whole datetime range, seeded so failures reproduce
+    rng = random.Random(seed)
+    return [datetime.datetime.min + datetime.timedelta(microseconds=rng.randrange(315537897600000000)) for _ in range(count)]
+
+
+def _random_seconds(count: int, seed: int) -> List[float]:
+    # half over the whole datetime range, half within about a century of the epoch
+    rng = random.Random(seed)
+    return [rng.uniform(MIN_SECONDS, MAX_SECONDS) if i % 2 else rng.uniform(-3e9, 3e9) for i in range(count)]
+
+
+class VectorizedTestCase:
+    pass
+
+
+class TestImport(VectorizedTestCase):
+    # check that importing the base package does not import numpy
+    def test_base_package_does_not_import_numpy(self) -> None:
+        code = "import sys, datetime_helpers; sys.exit('numpy' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
+class TestDatetimesToSeconds(VectorizedTestCase):
+    # check datetimes_to_seconds matches datetime_to_seconds
+    def test_datetimes_to_seconds(self) -> None:
+        expected = [datetime_helpers.datetime_to_seconds(dt=dt) for dt in DATETIMES]
+        assert vectorized.datetimes_to_seconds(dts=DATETIMES).tolist() == expected
+
+    # check against datetime_to_seconds over the whole datetime range, where the microseconds exceed 2**53
+    def test_datetimes_to_seconds_random(self) -> None:
+        dts = _random_datetimes(count=20_000, seed=3)
+        assert vectorized.datetimes_to_seconds(dts=dts).tolist() == [datetime_helpers.datetime_to_seconds(dt=dt) for dt in dts]
+
+    # check that dates and datetime64 arrays are accepted
+    def test_datetimes_to_seconds_inputs(self) -> None:
+        assert vectorized.datetimes_to_seconds(dts=[datetime.date(2016, 4, 17)]).tolist() == [1460851200.0]
+        assert vectorized.datetimes_to_seconds(dts=np.array(["2016-04-17"], dtype="datetime64[D]")).tolist() == [1460851200.0]
+
+
+class TestDatetimesToMillis(VectorizedTestCase):
+    # check datetimes_to_millis matches datetime_to_millis
+    def test_datetimes_to_millis(self) -> None:
+        millis = vectorized.datetimes_to_millis(dts=DATETIMES)
+        assert millis.dtype == np.int64
+        assert millis.tolist() == [datetime_helpers.datetime_to_millis(dt=dt) for dt in DATETIMES]
+
+
+class TestDatetimesFromSeconds(VectorizedTestCase):
+    # check datetimes_from_seconds matches datetime_from_seconds for integers
+    def test_datetimes_from_seconds_integers(self) -> None:
+        seconds = [-1460851200, 0, 1, 1460851200]
+        expected = [datetime_helpers.datetime_from_seconds(seconds=s) for s in seconds]
+        assert vectorized.datetimes_from_seconds(seconds=seconds).astype(object).tolist() == expected
+
+    # check datetimes_from_seconds matches datetime_from_seconds for random floats, including the microsecond rounding
+    def test_datetimes_from_seconds_random(self) -> None:
+        seconds = _random_seconds(count=20_000, seed=5) + [-1600909425.9224606, -1460851200.5, 1.25, 1460851200.000001]
+        expected = [datetime_helpers.datetime_from_seconds(seconds=s) for s in seconds]
+        assert vectorized.datetimes_from_seconds(seconds=seconds).astype(object).tolist() == expected
+        assert vectorized.datetimes_from_seconds(seconds=np.array(seconds[:100], dtype=np.float32)).astype(object).tolist() == [
+            datetime_helpers.datetime_from_seconds(seconds=float(s)) for s in np.array(seconds[:100], dtype=np.float32)
+        ]
+
+
+class TestDatetimesFromMillis(VectorizedTestCase):
+    # check that integer millis are converted exactly
+    def test_datetimes_from_millis_integers(self) -> None:
+        millis = [-1460851200000, 0, 1000, 1460851200000, 253402300799999]
+        expected = [datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=m) for m in millis]
+        assert vectorized.datetimes_from_millis(millis=millis).astype(object).tolist() == expected
+
+    # check datetimes_from_millis matches datetime_from_millis for random floats
+    def test_datetimes_from_millis_random(self) -> None:
+        millis = [s * 1000 for s in _random_seconds(count=20_000, seed=7) if MIN_SECONDS + 1 < s < MAX_SECONDS - 1] + [-1460851200000.5, 0.0, 1.25]
+        expected = [datetime_helpers.datetime_from_millis(millis=m) for m in millis]
+        assert vectorized.datetimes_from_millis(millis=millis).astype(object).tolist() == expected
+
+    # check the round trip
+    def test_round_trip(self) -> None:
+        millis = np.arange(-10_000_000, 10_000_000, 7_919, dtype=np.int64)
+        assert (vectorized.datetimes_to_millis(dts=vectorized.datetimes_from_millis(millis=millis)) == millis).all()